@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Persistent archive of finished Gomoku games.
+Games are appended to a JSONL log, one compact record per line (bots,
+winner, moves as cell indexes, per-move latency). A sidecar index file
+holds each record's byte offset and metadata, so games can be queried by
+bot, result and date, and any one game replayed from a memory-mapped view
+of the log without reading the rest of it.
+
+Query an archive from the command line:
+    python archive.py games.jsonl --bot "Python Bot (X)" --winner X
+    python archive.py games.jsonl --game 12 --ply 20
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_ARCHIVE_PATH = 'games.jsonl'
+INDEX_SUFFIX = '.idx'
+
+# Metadata kept per game in the index (and in memory)
+INDEX_FIELDS = ('id', 'offset', 'length', 'finishedAt', 'X', 'O', 'winner', 'moves')
+
+
+def parse_time(value):
+    """Seconds since the epoch from a number or an ISO date/datetime string"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+class GameArchive:
+    """Append-only game log with an index by bot, result and date.
+
+    Records are appended in the order games finish, so their finishedAt
+    times are (clock changes aside) sorted and date ranges are found by
+    bisection. The index is rebuilt from the log for any records it is
+    missing, e.g. after a crash between the two writes, and entries that
+    point past the end of the log (a truncated or replaced log) are dropped.
+    """
+
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.lock = threading.Lock()
+        self.entries = []  # Index entries by game ID
+        self.by_bot = {}  # Bot name -> game IDs
+        self.by_winner = {}  # 'X' / 'O' / 'Tie' -> game IDs
+        self.finished_at = []  # finishedAt by game ID, for date ranges
+        self._map = None
+        self._map_size = 0
+        self._load_index()
+        self._log = open(self.path, 'ab')
+        self._index = open(self.index_path, 'a')
+
+    def _load_index(self):
+        """Read the index file, then index any log records it does not cover"""
+        if not os.path.exists(self.path):
+            open(self.path, 'ab').close()
+        size = os.path.getsize(self.path)
+        offset = 0
+        stale = False
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Partly written last line
+                    if entry['offset'] + entry['length'] > size:
+                        stale = True  # The log is shorter than the index says
+                        break
+                    self._add_entry(entry)
+                    offset = entry['offset'] + entry['length']
+        if stale or size > offset:
+            with open(self.index_path, 'w') as index, open(self.path, 'rb') as log:
+                for entry in self.entries:
+                    index.write(json.dumps(entry) + '\n')
+                log.seek(offset)
+                for line in log:
+                    if not line.endswith(b'\n'):
+                        break  # Partly written last record
+                    entry = self._index_entry(json.loads(line), offset, len(line))
+                    self._add_entry(entry)
+                    index.write(json.dumps(entry) + '\n')
+                    offset += len(line)
+            # Drop a partial record so the next append starts on a new line
+            with open(self.path, 'r+b') as log:
+                log.truncate(offset)
+
+    @staticmethod
+    def _index_entry(record, offset, length):
+        entry = {field: record.get(field) for field in INDEX_FIELDS}
+        entry.update(id=record['id'], offset=offset, length=length, moves=len(record['moves']))
+        return entry
+
+    def _add_entry(self, entry):
+        game_id = entry['id'] = len(self.entries)
+        self.entries.append(entry)
+        self.finished_at.append(entry['finishedAt'])
+        for name in {entry['X'], entry['O']}:
+            self.by_bot.setdefault(name, []).append(game_id)
+        self.by_winner.setdefault(entry['winner'], []).append(game_id)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def append(self, x, o, winner, move_history, board_size=15, latencies=None, **metadata):
+        """Archive a finished game and return its ID.
+
+        x and o are the bots' names, move_history the game's (row, col,
+        player) moves and latencies the seconds each move took (None for
+        moves that were not timed). Extra keyword arguments, such as the
+        match ID or time control, are stored with the record.
+        """
+        with self.lock:
+            game_id = len(self.entries)
+            record = {
+                'id': game_id,
+                'finishedAt': round(time.time(), 3),
+                'X': x,
+                'O': o,
+                'winner': winner,
+                'boardSize': board_size,
+                'moves': [row * board_size + col for row, col, _ in move_history],
+                'latencyMs': [None if t is None else round(t * 1000, 1) for t in latencies]
+                             if latencies is not None else None,
+            }
+            record.update(metadata)
+            line = (json.dumps(record, separators=(',', ':')) + '\n').encode()
+            offset = self._log.tell()
+            self._log.write(line)
+            self._log.flush()
+            entry = self._index_entry(record, offset, len(line))
+            self._index.write(json.dumps(entry) + '\n')
+            self._index.flush()
+            self._add_entry(entry)
+            return game_id
+
+    def _view(self, end):
+        """Memory map of the log covering bytes up to end"""
+        if end > self._map_size:
+            if self._map is not None:
+                self._map.close()
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map_size = len(self._map)
+        return self._map
+
+    def get(self, game_id):
+        """The full record of a game, read from its offset in the log"""
+        if not 0 <= game_id < len(self.entries):
+            raise KeyError(game_id)
+        entry = self.entries[game_id]
+        with self.lock:
+            data = self._view(entry['offset'] + entry['length'])
+            line = data[entry['offset']:entry['offset'] + entry['length']]
+        return json.loads(line)
+
+    def position(self, game_id, ply=None):
+        """The board of a game after ply moves (default: the final position).
+
+        Returns a game-state dictionary like the server's: board,
+        currentPlayer, moveHistory, gameOver and winner (only set at the
+        last ply).
+        """
+        record = self.get(game_id)
+        n = record['boardSize']
+        moves = record['moves']
+        ply = len(moves) if ply is None else ply
+        if not 0 <= ply <= len(moves):
+            raise ValueError(f"ply must be between 0 and {len(moves)}")
+        board = [[' '] * n for _ in range(n)]
+        history = []
+        for i, cell in enumerate(moves[:ply]):
+            player = 'XO'[i % 2]
+            row, col = divmod(cell, n)
+            board[row][col] = player
+            history.append((row, col, player))
+        finished = ply == len(moves)
+        return {
+            'gameId': game_id,
+            'ply': ply,
+            'board': board,
+            'currentPlayer': 'XO'[ply % 2],
+            'moveHistory': history,
+            'gameOver': finished,
+            'winner': record['winner'] if finished else None,
+        }
+
+    def query(self, bot=None, winner=None, since=None, until=None, offset=0, limit=100):
+        """Index entries matching every given filter, oldest first.
+
+        bot matches either color; winner is 'X', 'O' or 'Tie'; since and
+        until bound finishedAt (epoch seconds or ISO date strings).
+        """
+        since, until = parse_time(since), parse_time(until)
+        with self.lock:
+            lo = 0 if since is None else bisect.bisect_left(self.finished_at, since)
+            hi = len(self.entries) if until is None else bisect.bisect_right(self.finished_at, until)
+            ids = range(lo, hi)
+            # ID lists are sorted, so the date range is a slice of each
+            for key, table in ((bot, self.by_bot), (winner, self.by_winner)):
+                if key is None:
+                    continue
+                matching = table.get(key, [])
+                matching = matching[bisect.bisect_left(matching, lo):bisect.bisect_left(matching, hi)]
+                if isinstance(ids, range):
+                    ids = matching
+                else:
+                    keep = set(matching)
+                    ids = [game_id for game_id in ids if game_id in keep]
+            return [dict(self.entries[game_id]) for game_id in ids[offset:offset + limit]]
+
+    def close(self):
+        """Close the log, the index and the memory map (safe to call twice)"""
+        with self.lock:
+            self._log.close()
+            self._index.close()
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+                self._map_size = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or replay archived Gomoku games")
+    parser.add_argument('path', nargs='?', default=DEFAULT_ARCHIVE_PATH,
+                        help=f"archive file (default: {DEFAULT_ARCHIVE_PATH})")
+    parser.add_argument('--bot', help="games this bot played")
+    parser.add_argument('--winner', choices=['X', 'O', 'Tie'], help="games with this result")
+    parser.add_argument('--since', help="games finished at or after this date")
+    parser.add_argument('--until', help="games finished at or before this date")
+    parser.add_argument('--limit', type=int, default=20, help="how many games to list (default: 20)")
+    parser.add_argument('--game', type=int, help="show the board of this game")
+    parser.add_argument('--ply', type=int, help="after this many moves (default: the end)")
+    args = parser.parse_args()
+
+    archive = GameArchive(args.path)
+    try:
+        if args.game is not None:
+            position = archive.position(args.game, args.ply)
+            n = len(position['board'])
+            print(f"Game {args.game} after {position['ply']} moves:")
+            print("   " + " ".join(f"{i:x}" for i in range(n)))
+            for i, row in enumerate(position['board']):
+                print(f"{i:2d} {' '.join(cell if cell != ' ' else '.' for cell in row)}")
+        else:
+            games = archive.query(bot=args.bot, winner=args.winner, since=args.since,
+                                  until=args.until, limit=args.limit)
+            print(f"📚 {len(archive)} games archived, showing {len(games)}")
+            for entry in games:
+                finished = datetime.fromtimestamp(entry['finishedAt']).strftime('%Y-%m-%d %H:%M')
+                print(f"{entry['id']:6d}  {finished}  {entry['X']} vs {entry['O']}: "
+                      f"{entry['winner']} in {entry['moves']} moves")
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
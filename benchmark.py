@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Gomoku server and the Python bot.
+Three suites, each writing machine-readable results:
+- engine: per-call time of make_move, check_win, is_board_full,
+  get_game_state and an undo_move/redo_move pair for every board engine
+- server: throughput and latency of GET /api/game-state with N concurrent
+  keep-alive clients against an in-process server
+- bot: time per GomokuBot.get_move over a corpus of positions, from a game
+  archive or from seeded self-play
+
+Run everything and save the results, then compare two runs:
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json
+    python benchmark.py --compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from server import GAME_ENGINES, GameServer, create_http_server, random_valid_move
+
+SUITES = ('engine', 'server', 'bot')
+FORMAT_VERSION = 1
+
+
+def summarize(samples, scale=1.0, digits=3):
+    """count/mean/p50/p95/p99/max of samples, multiplied by scale"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {'count': 0}
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    return {
+        'count': len(ordered),
+        'mean': round(statistics.fmean(ordered) * scale, digits),
+        'p50': round(percentile(50) * scale, digits),
+        'p95': round(percentile(95) * scale, digits),
+        'p99': round(percentile(99) * scale, digits),
+        'max': round(ordered[-1] * scale, digits),
+    }
+
+
+def random_game_moves(num_moves, board_size=15, seed=1):
+    """A fixed sequence of up to num_moves random moves that ends no game"""
+    rng = random.Random(seed)
+    game = GAME_ENGINES['list'](board_size)
+    moves = []
+    while len(moves) < num_moves:
+        row, col = random_valid_move(game, rng)
+        player = game.current_player
+        if not game.make_move(row, col, player):
+            continue
+        if game.game_over:
+            return moves  # Stop one move short of the end
+        moves.append((row, col, player))
+    return moves
+
+
+def time_per_call(func, number, repeat):
+    """Per-call seconds of func() over repeat runs of number calls"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        runs.append((time.perf_counter() - start) / number)
+    return runs
+
+
+def bench_engine(engines=None, moves=60, number=2000, repeat=7):
+    """Micro-benchmarks of the game engine methods, in ns per call.
+
+    make_move replays a fixed random game of `moves` moves onto fresh
+    boards; the other methods run on the position it reaches.
+    """
+    sequence = random_game_moves(moves)
+    results = {}
+    for name in engines or sorted(GAME_ENGINES):
+        game_class = GAME_ENGINES[name]
+        make_move_runs = []
+        for _ in range(repeat):
+            games = [game_class() for _ in range(max(1, number // len(sequence)))]
+            start = time.perf_counter()
+            for game in games:
+                for row, col, player in sequence:
+                    game.make_move(row, col, player)
+            make_move_runs.append((time.perf_counter() - start) / (len(games) * len(sequence)))
+        game = games[-1]
+        row, col, player = sequence[-1]
+        results[name] = {
+            'make_move': summarize(make_move_runs, scale=1e9, digits=1),
+            'check_win': summarize(time_per_call(lambda: game.check_win(row, col, player), number, repeat),
+                                   scale=1e9, digits=1),
+            'is_board_full': summarize(time_per_call(game.is_board_full, number, repeat), scale=1e9, digits=1),
+            'get_game_state': summarize(time_per_call(game.get_game_state, number, repeat),
+                                        scale=1e9, digits=1),
+            'undo_redo': summarize(time_per_call(lambda: (game.undo_move(), game.redo_move()), number, repeat),
+                                   scale=1e9, digits=1),
+        }
+    return {'moves': len(sequence), 'unit': 'ns', 'engines': results}
+
+
+def bench_server(clients=(1, 4, 16), duration=2.0, path='/api/game-state', moves=60):
+    """Requests per second and latency (ms) of path for each client count.
+
+    Each client is a thread with its own keep-alive session sending
+    requests back to back for `duration` seconds. The server runs in this
+    process with its usual worker pool, on a board `moves` moves in.
+    """
+    game_server = GameServer()
+    for row, col, player in random_game_moves(moves):
+        game_server.game.make_move(row, col, player)
+    httpd = create_http_server(game_server, port=0, host='127.0.0.1', log_requests=False)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}{path}"
+
+    results = []
+    try:
+        for count in clients:
+            latencies = [[] for _ in range(count)]
+            errors = [0] * count
+            deadline = time.perf_counter() + duration
+
+            def client(i):
+                session = requests.Session()
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        response = session.get(url, timeout=10)
+                        response.content
+                        if response.status_code != 200:
+                            errors[i] += 1
+                    except requests.RequestException:
+                        errors[i] += 1
+                    latencies[i].append(time.perf_counter() - start)
+                session.close()
+
+            threads = [threading.Thread(target=client, args=(i,)) for i in range(count)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            samples = [latency for client_latencies in latencies for latency in client_latencies]
+            results.append({
+                'path': path,
+                'clients': count,
+                'requests': len(samples),
+                'errors': sum(errors),
+                'seconds': round(elapsed, 3),
+                'rps': round(len(samples) / elapsed, 1),
+                'latencyMs': summarize(samples, scale=1000),
+            })
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        game_server.close()
+    return results
+
+
+def archive_corpus(path, limit, every=5):
+    """Positions every `every` plies of the newest games in a game archive"""
+    from archive import GameArchive
+
+    archive = GameArchive(path)
+    positions = []
+    try:
+        for game_id in reversed(range(len(archive))):
+            record = archive.get(game_id)
+            for ply in range(every, len(record['moves']), every):
+                position = archive.position(game_id, ply)
+                positions.append((position['board'], position['currentPlayer']))
+                if len(positions) >= limit:
+                    return positions
+    finally:
+        archive.close()
+    return positions
+
+
+def self_play_corpus(limit, seed=1, opening_moves=4):
+    """Positions from heuristic self-play after a few random opening moves"""
+    from client_python import GomokuBot
+
+    bot = GomokuBot('localhost', opening_book=None)
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < limit:
+        game = GAME_ENGINES['bitboard']()
+        while not game.game_over and len(positions) < limit:
+            player = game.current_player
+            if len(game.move_history) < opening_moves:
+                row, col = random_valid_move(game, rng)
+            else:
+                positions.append(([row[:] for row in game.board], player))
+                row, col = bot.get_move([row[:] for row in game.board], player)
+            if not game.make_move(row, col, player):
+                row, col = random_valid_move(game, rng)
+                game.make_move(row, col, player)
+    return positions
+
+
+def bench_bot(positions, strategies=('heuristic',), time_limit=0.5):
+    """Milliseconds per GomokuBot.get_move for each strategy over positions"""
+    from client_python import GomokuBot
+
+    results = []
+    for strategy in strategies:
+        bot = GomokuBot('localhost', strategy=strategy, time_limit=time_limit, opening_book=None)
+        samples = []
+        for board, player in positions:
+            board = [row[:] for row in board]
+            start = time.perf_counter()
+            bot.get_move(board, player)
+            samples.append(time.perf_counter() - start)
+        results.append({'strategy': strategy, 'positions': len(positions),
+                        'moveMs': summarize(samples, scale=1000)})
+    return results
+
+
+def environment():
+    """Where and on what the benchmarks ran"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {
+        'formatVersion': FORMAT_VERSION,
+        'createdAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run(suites=SUITES, clients=(1, 4, 16), duration=2.0, corpus=None, positions=40,
+        strategies=('heuristic',), time_limit=0.5, number=2000, repeat=7):
+    """Run the chosen suites and return the results as a dictionary"""
+    results = environment()
+    if 'engine' in suites:
+        results['engine'] = bench_engine(number=number, repeat=repeat)
+    if 'server' in suites:
+        results['server'] = bench_server(clients=clients, duration=duration)
+    if 'bot' in suites:
+        corpus_positions = archive_corpus(corpus, positions) if corpus else self_play_corpus(positions)
+        results['bot'] = bench_bot(corpus_positions, strategies=strategies, time_limit=time_limit)
+    return results
+
+
+def key_metrics(results):
+    """Flatten results to {metric name: value} for the numbers worth comparing"""
+    metrics = {}
+    for engine, methods in results.get('engine', {}).get('engines', {}).items():
+        for method, stats in methods.items():
+            metrics[f'engine.{engine}.{method} p50 ns'] = stats['p50']
+    for entry in results.get('server', []):
+        name = f"server.{entry['path']} x{entry['clients']}"
+        metrics[f'{name} rps'] = entry['rps']
+        metrics[f'{name} p95 ms'] = entry['latencyMs'].get('p95')
+    for entry in results.get('bot', []):
+        metrics[f"bot.{entry['strategy']} mean ms"] = entry['moveMs'].get('mean')
+    return metrics
+
+
+def compare(before, after):
+    """Rows of (metric, before, after, after/before) for metrics in both"""
+    old, new = key_metrics(before), key_metrics(after)
+    return [(name, old[name], new[name], new[name] / old[name] if old[name] else None)
+            for name in old if name in new]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Gomoku engine, server and bot")
+    parser.add_argument('--suite', action='append', choices=SUITES,
+                        help="suite to run, may be repeated (default: all)")
+    parser.add_argument('--output', help="write the results as JSON to this file (default: stdout)")
+    parser.add_argument('--clients', default='1,4,16',
+                        help="concurrent clients for the server suite (default: 1,4,16)")
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help="seconds per client count in the server suite (default: 2)")
+    parser.add_argument('--corpus', metavar='ARCHIVE',
+                        help="take bot positions from this game archive (default: seeded self-play)")
+    parser.add_argument('--positions', type=int, default=40, help="positions in the bot suite (default: 40)")
+    parser.add_argument('--strategy', action='append', dest='strategies',
+                        help="bot strategy to time, may be repeated (default: heuristic)")
+    parser.add_argument('--time-limit', type=float, default=0.5,
+                        help="seconds per move for the search strategy (default: 0.5)")
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'),
+                        help="compare two result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            before = json.load(f)
+        with open(args.compare[1]) as f:
+            after = json.load(f)
+        print(f"{'metric':48s} {'before':>12s} {'after':>12s} {'ratio':>8s}")
+        for name, old, new, ratio in compare(before, after):
+            print(f"{name:48s} {old:12g} {new:12g} {ratio:8.2f}" if ratio is not None else
+                  f"{name:48s} {old:12g} {new:12g} {'-':>8s}")
+        return
+
+    results = run(suites=args.suite or SUITES,
+                  clients=[int(count) for count in args.clients.split(',')],
+                  duration=args.duration, corpus=args.corpus, positions=args.positions,
+                  strategies=args.strategies or ('heuristic',), time_limit=args.time_limit)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"💾 Results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,782 @@
+#!/usr/bin/env python3
+"""
+Gomoku search engine for the Python bot.
+Iterative deepening negamax with alpha-beta pruning, a per-move time budget
+and candidate moves limited to cells near existing stones.
+Uses only standard Python libraries.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from zobrist import get_hasher
+
+EMPTY, X, O = 0, 1, 2
+PLAYER_CODES = {'X': X, 'O': O}
+
+WIN_SCORE = 10_000_000
+
+# Unit steps along a row, a column and both diagonals
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out"""
+
+
+# Scores this close to WIN_SCORE are "win in N plies" and depend on the ply
+MATE_THRESHOLD = WIN_SCORE - 1000
+
+
+class TranspositionTable:
+    """Fixed-size cache of search results keyed by Zobrist hash.
+
+    Each slot has two entries: a depth-preferred one, replaced only by a
+    deeper (or equally deep) result or by anything once it is from an older
+    search, and an always-replace one that keeps the most recent result that
+    lost out. Entries are (key, depth, score, flag, best_move, age) tuples.
+    """
+
+    EXACT, LOWER, UPPER = 0, 1, 2
+
+    def __init__(self, size_bits=18):
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        self.clear()
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self):
+        """Mark existing entries as belonging to an older search"""
+        self.age += 1
+
+    def probe(self, key):
+        """Get the entry for key, or None"""
+        slot = key & self.mask
+        entry = self.deep[slot]
+        if entry is None or entry[0] != key:
+            entry = self.recent[slot]
+            if entry is None or entry[0] != key:
+                self.misses += 1
+                return None
+        self.hits += 1
+        return entry
+
+    def store(self, key, depth, score, flag, best_move):
+        """Save a search result, keeping the deeper one when slots collide"""
+        slot = key & self.mask
+        entry = (key, depth, score, flag, best_move, self.age)
+        self.stores += 1
+        current = self.deep[slot]
+        if current is None or current[0] == key or depth >= current[1] or current[5] != self.age:
+            if current is not None and current[0] != key:
+                self.replacements += 1
+                self.recent[slot] = current
+            self.deep[slot] = entry
+        else:
+            if self.recent[slot] is not None:
+                self.replacements += 1
+            self.recent[slot] = entry
+
+    def stats(self):
+        """Get the hit/miss counters as a dictionary"""
+        probes = self.hits + self.misses
+        return {
+            'size': self.size * 2,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': self.hits / probes if probes else 0.0,
+            'stores': self.stores,
+            'replacements': self.replacements,
+        }
+
+
+# Score of a 5-cell window holding k stones of one player and none of the
+# other (index k); overlapping windows make open shapes count several times
+WINDOW_WEIGHTS = [0, 1, 10, 100, 1_000, WIN_SCORE]
+
+# Value to a player of the empty cells in such a window: playing there
+# turns k stones into k + 1 (k == 4 is an immediate win)
+POTENTIAL_WEIGHTS = [1, 10, 100, 1_000, WIN_SCORE]
+
+# Bonus per open shape (_XXXX_, _XXX_ with room on one side, __XX__ ...)
+OPEN_WEIGHTS = {4: 50_000, 3: 1_000, 2: 50}
+
+
+def _build_open_table():
+    """Classify every 6-cell window code (base 3, cell i worth 3**i).
+
+    Returns a list of (open_fours_x, open_threes_x, open_twos_x, open_fours_o,
+    open_threes_o, open_twos_o) tuples; a window is open for a player when
+    both end cells are empty and the middle four hold only their stones.
+    """
+    zero = (0, 0, 0, 0, 0, 0)
+    table = []
+    for code in range(3 ** 6):
+        cells = [(code // 3 ** i) % 3 for i in range(6)]
+        counts = [0] * 6
+        if cells[0] == EMPTY and cells[5] == EMPTY:
+            middle = cells[1:5]
+            for player, offset in ((X, 0), (O, 3)):
+                if 3 - player not in middle:
+                    stones = middle.count(player)
+                    if stones >= 2:
+                        counts[offset + 4 - stones] = 1
+        table.append(tuple(counts) if any(counts) else zero)
+    return table
+
+
+OPEN_TABLE = _build_open_table()
+
+
+class ThreatIndex:
+    """Pattern counts for both players, updated in O(1) per stone.
+
+    Every 5-cell window of every line keeps its count of X and O stones. A
+    window with k stones of one player and none of the other is a k-threat
+    for that player (a four if k == 4, whether open or closed). Every 6-cell
+    window keeps a base-3 code that OPEN_TABLE maps to open fours, threes
+    and twos. Placing or removing a stone touches at most 20 five-windows
+    and 24 six-windows, whatever the board size.
+
+    Derived, also kept incrementally:
+    - win_cells[p]: empty cells that complete five for p, with multiplicity
+    - potential[p][cell]: how much playing an empty cell advances p's windows
+    - score[p]: WINDOW_WEIGHTS and OPEN_WEIGHTS summed over p's patterns
+    """
+
+    def __init__(self, board_size, cells):
+        n = board_size
+        self.cells = cells  # Shared with the engine, which places the stones
+
+        self.windows = []  # Cell indexes of each 5-window
+        self.cell_windows = [[] for _ in range(n * n)]
+        self.open_windows = 0
+        self.cell_open_windows = [[] for _ in range(n * n)]  # (window, 3 ** position)
+        for dr, dc in DIRECTIONS:
+            for row in range(n):
+                for col in range(n):
+                    for length in (5, 6):
+                        end_r, end_c = row + dr * (length - 1), col + dc * (length - 1)
+                        if not (0 <= end_r < n and 0 <= end_c < n):
+                            continue
+                        window = [(row + dr * k) * n + col + dc * k for k in range(length)]
+                        if length == 5:
+                            for idx in window:
+                                self.cell_windows[idx].append(len(self.windows))
+                            self.windows.append(window)
+                        else:
+                            for position, idx in enumerate(window):
+                                self.cell_open_windows[idx].append((self.open_windows, 3 ** position))
+                            self.open_windows += 1
+
+        self.count_x = [0] * len(self.windows)
+        self.count_o = [0] * len(self.windows)
+        self.codes = [0] * self.open_windows
+        # counts[p][k]: windows holding k stones of p and none of the opponent
+        self.counts = [None, [0] * 6, [0] * 6]
+        # open_counts[p][k]: open shapes of k stones (k = 2, 3, 4)
+        self.open_counts = [None, [0] * 5, [0] * 5]
+        self.win_cells = [None, {}, {}]
+        base = POTENTIAL_WEIGHTS[0]
+        self.potential = [None, [0] * (n * n), [0] * (n * n)]
+        for idx, windows in enumerate(self.cell_windows):
+            self.potential[X][idx] = self.potential[O][idx] = base * len(windows)
+        self.score = [0, 0, 0]
+
+    def place(self, idx, player):
+        """Account for a stone the engine just placed at idx"""
+        self._update(idx, player, 1)
+
+    def remove(self, idx, player):
+        """Account for player's stone the engine just removed from idx"""
+        self._update(idx, player, -1)
+
+    def _update(self, idx, player, delta):
+        cells = self.cells
+        windows = self.windows
+        counts = self.counts
+        score = self.score
+        count_x, count_o = self.count_x, self.count_o
+        for w in self.cell_windows[idx]:
+            old_x, old_o = count_x[w], count_o[w]
+            if player == X:
+                new_x, new_o = old_x + delta, old_o
+                count_x[w] = new_x
+            else:
+                new_x, new_o = old_x, old_o + delta
+                count_o[w] = new_o
+            for p, old_k, new_k, other_old, other_new in ((X, old_x, new_x, old_o, new_o),
+                                                          (O, old_o, new_o, old_x, new_x)):
+                # k stones of p and none of the opponent, else None
+                before = old_k if other_old == 0 else None
+                after = new_k if other_new == 0 else None
+                if before == after:
+                    continue
+                p_counts = counts[p]
+                if before is not None:
+                    p_counts[before] -= 1
+                    score[p] -= WINDOW_WEIGHTS[before]
+                if after is not None:
+                    p_counts[after] += 1
+                    score[p] += WINDOW_WEIGHTS[after]
+
+                gain = ((POTENTIAL_WEIGHTS[after] if after is not None and after < 5 else 0) -
+                        (POTENTIAL_WEIGHTS[before] if before is not None and before < 5 else 0))
+                if gain:
+                    potential = self.potential[p]
+                    for cell in windows[w]:
+                        potential[cell] += gain
+
+                if before == 4:
+                    # The window's one empty cell: idx itself when a stone was
+                    # just placed, the other empty cell when one was removed
+                    self._drop_win_cell(p, idx if delta > 0 else next(
+                        cell for cell in windows[w] if cell != idx and not cells[cell]))
+                if after == 4:
+                    self._add_win_cell(p, next(cell for cell in windows[w] if not cells[cell]))
+
+        codes = self.codes
+        open_counts = self.open_counts
+        step = player * delta
+        for w, weight in self.cell_open_windows[idx]:
+            old = OPEN_TABLE[codes[w]]
+            codes[w] += step * weight
+            new = OPEN_TABLE[codes[w]]
+            if old is not new:
+                for p, offset in ((X, 0), (O, 3)):
+                    for k in (4, 3, 2):
+                        change = new[offset + 4 - k] - old[offset + 4 - k]
+                        if change:
+                            open_counts[p][k] += change
+                            score[p] += change * OPEN_WEIGHTS[k]
+
+    def _add_win_cell(self, player, cell):
+        win_cells = self.win_cells[player]
+        win_cells[cell] = win_cells.get(cell, 0) + 1
+
+    def _drop_win_cell(self, player, cell):
+        win_cells = self.win_cells[player]
+        if win_cells[cell] == 1:
+            del win_cells[cell]
+        else:
+            win_cells[cell] -= 1
+
+    def has_five(self, player):
+        """Check if player has five in a row"""
+        return self.counts[player][5] > 0
+
+    def pattern_counts(self, player):
+        """Get player's threat counts as a dictionary.
+
+        'four', 'three' and 'two' count 5-cell windows holding that many of
+        the player's stones and none of the opponent's, whether open or
+        closed. The 'open_*' entries count 6-cell shapes with both ends
+        empty. 'closed_four' counts fours that can be completed in only one
+        cell.
+        """
+        counts = self.counts[player]
+        open_counts = self.open_counts[player]
+        return {
+            'five': counts[5],
+            'four': counts[4],
+            'open_four': open_counts[4],
+            'closed_four': max(0, counts[4] - 2 * open_counts[4]),
+            'three': counts[3],
+            'open_three': open_counts[3],
+            'two': counts[2],
+            'open_two': open_counts[2],
+            'win_cells': len(self.win_cells[player]),
+        }
+
+
+class SearchEngine:
+    """Alpha-beta searcher that keeps its own flat copy of the board.
+
+    Cells are indexed row * board_size + col and hold EMPTY, X or O. A
+    ThreatIndex follows every play/undo, so win detection, move ordering
+    and the static evaluation are lookups rather than board scans.
+    """
+
+    def __init__(self, board_size=15, time_limit=2.0, max_depth=12, max_candidates=12,
+                 tt_size_bits=18):
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.max_candidates = max_candidates
+        # Kept between moves: the next search revisits many of the same positions
+        self.tt = TranspositionTable(tt_size_bits)
+        self.nodes = 0
+        self.depth_reached = 0
+        self.best_score = 0
+        self.deadline = 0.0
+        # Principal variation of the last search and the stone count it
+        # started from; the next search tries its continuation first
+        self.pv = []
+        self.pv_stones = 0
+        self.resize(board_size)
+
+    def resize(self, board_size):
+        """Set up an empty board of the given size and its threat index"""
+        if getattr(self, 'board_size', board_size) != board_size:
+            self.tt.clear()  # Cell indexes mean something else now
+        n = board_size
+        self.board_size = n
+        self.cells = [EMPTY] * (n * n)
+        # Stones within 2 cells of each cell; only empty cells with a
+        # neighbor are considered as moves, and play/undo keep that set
+        self.near = [0] * (n * n)
+        self.frontier = set()
+        self.stones = 0
+        self.zobrist = get_hasher(n)
+        self.hash = 0  # Zobrist hash of the stones on the board
+        # Moves as (idx, player) when the position came from sync_moves,
+        # None when it was loaded from a board
+        self.history = []
+
+        self.index = ThreatIndex(n, self.cells)
+
+        self.neighborhoods = []
+        for idx in range(n * n):
+            r, c = divmod(idx, n)
+            self.neighborhoods.append([
+                rr * n + cc
+                for rr in range(max(0, r - 2), min(n, r + 3))
+                for cc in range(max(0, c - 2), min(n, c + 3))
+                if (rr, cc) != (r, c)
+            ])
+
+    def clear(self, board_size=None):
+        """Remove every stone (resizing if board_size differs)"""
+        if board_size is not None and board_size != self.board_size:
+            self.resize(board_size)
+            return
+        for idx, value in enumerate(self.cells):
+            if value:
+                self.undo(idx)
+        self.history = []
+
+    def set_position(self, board):
+        """Load a list-of-lists board of 'X' / 'O' / ' ' strings"""
+        self.clear(len(board))
+        n = self.board_size
+        for r, row in enumerate(board):
+            for c, cell in enumerate(row):
+                if cell in PLAYER_CODES:
+                    self.play(r * n + c, PLAYER_CODES[cell])
+        self.history = None
+
+    def sync_moves(self, moves, board_size=15):
+        """Bring the board up to date with a game's move list.
+
+        moves is a list of (row, col, player) as in the server's moveHistory.
+        If the engine's position came from an earlier prefix of the same
+        list, only the new moves are played; anything else (a new game, a
+        reset, a different board) rebuilds from scratch. Returns the number
+        of moves played.
+        """
+        line = [(row * board_size + col, PLAYER_CODES[player]) for row, col, player in moves]
+        history = self.history
+        if (board_size != self.board_size or history is None or
+                len(history) > len(line) or line[:len(history)] != history):
+            self.clear(board_size)
+            history = self.history
+        new_moves = line[len(history):]
+        for idx, player in new_moves:
+            self.play(idx, player)
+        history.extend(new_moves)
+        return len(new_moves)
+
+    # ------------------------------------------------------------------
+    # Making and unmaking moves
+    # ------------------------------------------------------------------
+
+    def play(self, idx, player):
+        """Place a stone (no legality checks)"""
+        self.cells[idx] = player
+        self.stones += 1
+        self.hash ^= self.zobrist.keys[player][idx]
+        near, cells, frontier = self.near, self.cells, self.frontier
+        frontier.discard(idx)
+        for neighbor in self.neighborhoods[idx]:
+            near[neighbor] += 1
+            if near[neighbor] == 1 and not cells[neighbor]:
+                frontier.add(neighbor)
+        self.index.place(idx, player)
+
+    def undo(self, idx):
+        """Remove the stone at idx"""
+        player = self.cells[idx]
+        self.hash ^= self.zobrist.keys[player][idx]
+        self.cells[idx] = EMPTY
+        self.stones -= 1
+        near, frontier = self.near, self.frontier
+        for neighbor in self.neighborhoods[idx]:
+            near[neighbor] -= 1
+            if not near[neighbor]:
+                frontier.discard(neighbor)
+        if near[idx]:
+            frontier.add(idx)
+        self.index.remove(idx, player)
+
+    # ------------------------------------------------------------------
+    # Move generation and evaluation
+    # ------------------------------------------------------------------
+
+    def is_win(self, idx, player):
+        """Check if player has five in a row (call right after playing idx)"""
+        return self.index.has_five(player)
+
+    def candidates(self):
+        """Empty cells within two cells of a stone"""
+        return list(self.frontier)
+
+    def ordered_moves(self, player, limit=None):
+        """Candidate moves, best first, pruned to forced moves when there are any.
+
+        An immediate win is returned alone; if the opponent threatens to win,
+        only the blocking cells are returned.
+        """
+        index = self.index
+        wins = index.win_cells[player]
+        if wins:
+            return [next(iter(wins))]
+        opponent = 3 - player
+        blocks = index.win_cells[opponent]
+        if blocks:
+            return list(blocks)
+        attack, defense = index.potential[player], index.potential[opponent]
+        scored = sorted(((attack[idx] + defense[idx] * 0.9, idx) for idx in self.candidates()),
+                        reverse=True)
+        limit = limit or self.max_candidates
+        return [idx for _, idx in scored[:limit]]
+
+    def evaluate(self, player):
+        """Static score from player's point of view"""
+        index = self.index
+        opponent = 3 - player
+        if index.win_cells[player]:
+            return WIN_SCORE // 2  # We complete five next move
+        if len(index.win_cells[opponent]) >= 2:
+            return -WIN_SCORE // 2  # Open four (or two fours): cannot block both
+        score = index.score[player] - index.score[opponent]
+        if index.open_counts[player][3] and not index.win_cells[opponent]:
+            score += OPEN_WEIGHTS[4]  # Our open three becomes an open four first
+        return score
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, board, current_player, time_limit=None):
+        """Pick a move for current_player ('X' or 'O'); returns (row, col)"""
+        self.set_position(board)
+        idx = self.search_position(PLAYER_CODES[current_player], time_limit)
+        return divmod(idx, self.board_size)
+
+    def search_moves(self, moves, current_player, board_size=15, time_limit=None):
+        """Like search, but from a move list, reusing the previous position"""
+        self.sync_moves(moves, board_size)
+        idx = self.search_position(PLAYER_CODES[current_player], time_limit)
+        return divmod(idx, self.board_size)
+
+    def search_position(self, player, time_limit=None, root_moves=None):
+        """Iterative deepening search on the engine's current board.
+
+        root_moves restricts the search to those moves (each is searched,
+        even if there is only one). The score of the returned move is left
+        in best_score.
+        """
+        n = self.board_size
+        self.best_score = 0
+        if self.stones == 0 and root_moves is None:
+            return (n // 2) * n + n // 2
+
+        start = time.perf_counter()
+        budget = self.time_limit if time_limit is None else time_limit
+        self.deadline = start + budget
+        self.nodes = 0
+        self.depth_reached = 0
+        self.tt.new_search()
+
+        if root_moves is None:
+            root_moves = self.ordered_moves(player)
+            if not root_moves:
+                # Only possible on a board with no empty cell next to a stone
+                return next(i for i, value in enumerate(self.cells) if value == EMPTY)
+            if len(root_moves) == 1:
+                return root_moves[0]
+        else:
+            root_moves = list(root_moves)
+        best_move = root_moves[0]
+        hint = self._pv_move(player)
+        if hint in root_moves:
+            root_moves.remove(hint)
+            root_moves.insert(0, hint)
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._search_root(root_moves, depth, player)
+            except SearchTimeout:
+                break
+            best_move = move
+            self.best_score = score
+            self.depth_reached = depth
+            # Try the best move first at the next depth
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if abs(score) >= WIN_SCORE // 2:
+                break  # Forced win or loss found
+            # The next iteration takes several times longer; don't start it late
+            if time.perf_counter() - start > budget / 3:
+                break
+        self.pv = self._principal_variation(best_move, player)
+        self.pv_stones = self.stones
+        return best_move
+
+    def _principal_variation(self, first_move, player):
+        """Follow the transposition table's best moves from first_move"""
+        line = []
+        idx = first_move
+        while idx is not None and not self.cells[idx] and len(line) <= self.depth_reached:
+            self.play(idx, player)
+            line.append(idx)
+            if self.is_win(idx, player):
+                break
+            player = 3 - player
+            key = self.hash ^ self.zobrist.side_key if player == O else self.hash
+            entry = self.tt.probe(key)
+            idx = entry[4] if entry is not None else None
+        for idx in reversed(line):
+            self.undo(idx)
+        return line
+
+    def _pv_move(self, player):
+        """Next move of the last principal variation, if the game followed it"""
+        played = self.stones - self.pv_stones
+        if played <= 0 or played % 2 or played >= len(self.pv):
+            return None
+        # The PV starts with our previous move, so stone i was played by
+        # player if i is even and by the opponent if it is odd
+        for i, idx in enumerate(self.pv[:played]):
+            if self.cells[idx] != (player if i % 2 == 0 else 3 - player):
+                return None
+        return self.pv[played]
+
+    def _search_root(self, moves, depth, player):
+        alpha, beta = -WIN_SCORE * 2, WIN_SCORE * 2
+        best_score, best_move = -WIN_SCORE * 2, moves[0]
+        for idx in moves:
+            self.play(idx, player)
+            try:
+                if self.is_win(idx, player):
+                    score = WIN_SCORE
+                else:
+                    score = -self._negamax(depth - 1, -beta, -alpha, 3 - player, 1)
+            finally:
+                self.undo(idx)
+            if score > best_score:
+                best_score, best_move = score, idx
+            alpha = max(alpha, score)
+        return best_score, best_move
+
+    def _negamax(self, depth, alpha, beta, player, ply):
+        self.nodes += 1
+        if not self.nodes & 63 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if depth == 0:
+            return self.evaluate(player)
+
+        key = self.hash ^ self.zobrist.side_key if player == O else self.hash
+        entry = self.tt.probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                score = self._score_from_tt(entry[2], ply)
+                flag = entry[3]
+                if flag == TranspositionTable.EXACT:
+                    return score
+                if flag == TranspositionTable.LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        moves = self.ordered_moves(player)
+        if not moves:
+            return 0  # Board full: tie
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        alpha_orig = alpha
+        best = -WIN_SCORE * 2
+        best_move = moves[0]
+        for idx in moves:
+            self.play(idx, player)
+            try:
+                if self.is_win(idx, player):
+                    # Prefer quicker wins and slower losses
+                    score = WIN_SCORE - ply
+                else:
+                    score = -self._negamax(depth - 1, -beta, -alpha, 3 - player, ply + 1)
+            finally:
+                self.undo(idx)
+            if score > best:
+                best = score
+                best_move = idx
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best <= alpha_orig:
+            flag = TranspositionTable.UPPER
+        elif best >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        self.tt.store(key, depth, self._score_to_tt(best, ply), flag, best_move)
+        return best
+
+    @staticmethod
+    def _score_to_tt(score, ply):
+        """Store win/loss scores relative to this node rather than the root"""
+        if score >= MATE_THRESHOLD:
+            return score + ply
+        if score <= -MATE_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_tt(score, ply):
+        if score >= MATE_THRESHOLD:
+            return score - ply
+        if score <= -MATE_THRESHOLD:
+            return score + ply
+        return score
+
+
+# ----------------------------------------------------------------------
+# Parallel root search
+# ----------------------------------------------------------------------
+
+_worker_engine = None  # One SearchEngine per pool process, kept between moves
+
+
+def _init_worker(board_size, tt_size_bits):
+    global _worker_engine
+    _worker_engine = SearchEngine(board_size, tt_size_bits=tt_size_bits)
+
+
+def _warm_up():
+    """Pool task that does nothing; waiting for it means the worker is up"""
+    return os.getpid()
+
+
+def _search_root_moves(position, player, root_moves, time_limit, max_depth, max_candidates):
+    """Pool task: search a subset of the root moves in this worker's engine"""
+    engine = _worker_engine
+    engine.max_depth = max_depth
+    engine.max_candidates = max_candidates
+    kind, data, board_size = position
+    if kind == 'moves':
+        engine.sync_moves(data, board_size)
+    else:
+        engine.set_position(data)
+    move = engine.search_position(player, time_limit, root_moves)
+    return engine.best_score, engine.depth_reached, move, engine.nodes
+
+
+class ParallelSearch:
+    """Root-split search across a pool of worker processes.
+
+    The root moves are dealt round-robin (best first) to the workers; each
+    runs its own iterative deepening over its share within the time budget,
+    and the best-scoring move wins. Every worker keeps its engine, and so
+    its transposition table and position, between moves. Has the same
+    search/search_moves interface as SearchEngine.
+    """
+
+    def __init__(self, workers=None, board_size=15, time_limit=2.0, max_depth=12,
+                 max_candidates=12, tt_size_bits=18):
+        self.workers = workers or os.cpu_count() or 1
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.max_candidates = max_candidates
+        self.tt_size_bits = tt_size_bits
+        # Local engine: picks the root moves and answers forced positions
+        self.engine = SearchEngine(board_size, time_limit, max_depth, max_candidates, tt_size_bits)
+        self.pool = None
+        self.nodes = 0
+        self.depth_reached = 0
+
+    def start(self):
+        """Start the worker processes (done on first use if not called).
+
+        The pool only forks a process when a task is submitted, so one
+        no-op task per worker is run here and waited for: every worker is
+        up, with its engine built, before the first move is searched.
+        """
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                            initargs=(self.engine.board_size, self.tt_size_bits))
+            for future in [self.pool.submit(_warm_up) for _ in range(self.workers)]:
+                future.result()
+
+    def close(self):
+        """Stop the worker processes"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def search(self, board, current_player, time_limit=None):
+        """Pick a move for current_player ('X' or 'O'); returns (row, col)"""
+        self.engine.set_position(board)
+        return self._search(('board', board, len(board)), current_player, time_limit)
+
+    def search_moves(self, moves, current_player, board_size=15, time_limit=None):
+        """Like search, but from a move list, reusing the previous position"""
+        self.engine.sync_moves(moves, board_size)
+        return self._search(('moves', moves, board_size), current_player, time_limit)
+
+    def _search(self, position, current_player, time_limit):
+        engine = self.engine
+        player = PLAYER_CODES[current_player]
+        budget = self.time_limit if time_limit is None else time_limit
+        start = time.perf_counter()
+        self.nodes = 0
+        self.depth_reached = 0
+
+        root_moves = engine.ordered_moves(player, limit=max(self.max_candidates, self.workers))
+        if engine.stones == 0 or len(root_moves) <= 1 or self.workers == 1:
+            # Nothing to split
+            engine.max_depth = self.max_depth
+            idx = engine.search_position(player, budget)
+            self.nodes, self.depth_reached = engine.nodes, engine.depth_reached
+            return divmod(idx, engine.board_size)
+
+        self.start()
+        shares = min(self.workers, len(root_moves))
+        remaining = budget - (time.perf_counter() - start)
+        futures = [self.pool.submit(_search_root_moves, position, player, root_moves[i::shares],
+                                    remaining, self.max_depth, self.max_candidates)
+                   for i in range(shares)]
+        results = [future.result() for future in futures]
+        self.nodes = sum(result[3] for result in results)
+        self.depth_reached = min(result[1] for result in results)
+        # A share that did not finish depth 1 has no score to compare
+        results = [result for result in results if result[1]] or results
+        # Highest score wins; between equal scores, trust the deeper search
+        best = max(results, key=lambda result: (result[0], result[1]))
+        return divmod(best[2], engine.board_size)
@@ -1,9 +1,13 @@
 /*
  * Gomoku Bot Client - C Version
  * Compile: gcc -o client_c client_c.c
- * Run: ./client_c <server_ip>
+ * Run: ./client_c <server_ip> <player> [bot_port]
+ *
+ * Registers with the server as a bot speaking the compact binary protocol
+ * (see protocol.py) and answers POST /get_move requests on bot_port.
  */
 
+#define _GNU_SOURCE  // memmem, strcasestr
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
@@ -12,11 +16,16 @@
 #include <netinet/in.h>
 #include <arpa/inet.h>
 #include <time.h>
+#include <signal.h>
 
 #define BOARD_SIZE 15
 #define BUFFER_SIZE 4096
 #define MAX_MOVES 225
 
+// Binary move request: 20-byte header, 2-bit packed board, then the moves
+#define HEADER_SIZE 20
+#define MAX_REQUEST (BUFFER_SIZE + HEADER_SIZE + (BOARD_SIZE * BOARD_SIZE + 3) / 4 + MAX_MOVES * 2)
+
 typedef struct {
     char board[BOARD_SIZE][BOARD_SIZE];
     char current_player;
@@ -103,6 +112,7 @@ int send_http_request(const char* host, int port, const char* method, const char
         snprintf(request, BUFFER_SIZE,
                 "%s %s HTTP/1.1\r\n"
                 "Host: %s\r\n"
+                "Connection: close\r\n"
                 "Content-Type: application/json\r\n"
                 "Content-Length: %zu\r\n"
                 "\r\n"
@@ -112,6 +122,7 @@ int send_http_request(const char* host, int port, const char* method, const char
         snprintf(request, BUFFER_SIZE,
                 "%s %s HTTP/1.1\r\n"
                 "Host: %s\r\n"
+                "Connection: close\r\n"
                 "\r\n",
                 method, path, host);
     }
@@ -122,65 +133,218 @@ int send_http_request(const char* host, int port, const char* method, const char
         return -1;
     }
     
-    // Receive response
-    int bytes_received = recv(sock, response, response_size - 1, 0);
-    if (bytes_received > 0) {
-        response[bytes_received] = '\0';
+    // Receive response (the server closes the connection after it)
+    int bytes_received = 0;
+    int received;
+    while (bytes_received < response_size - 1 &&
+           (received = recv(sock, response + bytes_received, response_size - 1 - bytes_received, 0)) > 0) {
+        bytes_received += received;
     }
+    response[bytes_received] = '\0';
     
     close(sock);
     return bytes_received;
 }
 
-int parse_json_board(const char* json_str, char board[BOARD_SIZE][BOARD_SIZE]) {
-    // Simple JSON parsing for the board
-    // This is a simplified parser - in a real implementation you'd use a proper JSON library
-    
-    const char* board_start = strstr(json_str, "\"board\":");
-    if (!board_start) return 0;
-    
-    // Find the board array
-    const char* array_start = strchr(board_start, '[');
-    if (!array_start) return 0;
-    
-    int row = 0, col = 0;
-    const char* p = array_start + 1;
-    
-    while (row < BOARD_SIZE && *p) {
-        if (*p == '[') {
-            col = 0;
-            p++;
-            while (col < BOARD_SIZE && *p && *p != ']') {
-                if (*p == '"') {
-                    p++;
-                    if (*p == 'X' || *p == 'O' || *p == ' ') {
-                        board[row][col] = *p;
-                    } else {
-                        board[row][col] = ' ';
-                    }
-                    col++;
-                    p++;
-                }
-                p++;
+int decode_binary_request(const unsigned char* data, int length, GameState* state) {
+    // Layout: "GM", version, board size, player (1 X / 2 O), flags (bit 0:
+    // game over), move count u16, move time u32, X and O clocks i32, then the
+    // board at 2 bits per cell (cell i in bits 2*(i%4) of byte i/4)
+    static const char cells[] = {' ', 'X', 'O', ' '};
+    
+    if (length < HEADER_SIZE || data[0] != 'G' || data[1] != 'M' || data[2] != 1) return 0;
+    if (data[3] != BOARD_SIZE) return 0;
+    if (length < HEADER_SIZE + (BOARD_SIZE * BOARD_SIZE + 3) / 4) return 0;
+    
+    state->current_player = data[4] == 2 ? 'O' : 'X';
+    state->game_over = data[5] & 1;
+    state->winner = ' ';
+    
+    const unsigned char* board = data + HEADER_SIZE;
+    for (int i = 0; i < BOARD_SIZE * BOARD_SIZE; i++) {
+        state->board[i / BOARD_SIZE][i % BOARD_SIZE] = cells[(board[i / 4] >> ((i % 4) * 2)) & 3];
+    }
+    
+    return 1;
+}
+
+int get_local_ip(const char* server_ip, char* ip, int ip_size) {
+    // The address of the interface that routes to the server
+    int sock = socket(AF_INET, SOCK_DGRAM, 0);
+    if (sock < 0) return 0;
+    
+    struct sockaddr_in server_addr;
+    memset(&server_addr, 0, sizeof(server_addr));
+    server_addr.sin_family = AF_INET;
+    server_addr.sin_port = htons(8080);
+    inet_pton(AF_INET, server_ip, &server_addr.sin_addr);
+    
+    struct sockaddr_in local_addr;
+    socklen_t addr_len = sizeof(local_addr);
+    int ok = connect(sock, (struct sockaddr*)&server_addr, sizeof(server_addr)) == 0 &&
+             getsockname(sock, (struct sockaddr*)&local_addr, &addr_len) == 0 &&
+             inet_ntop(AF_INET, &local_addr.sin_addr, ip, ip_size) != NULL;
+    close(sock);
+    return ok;
+}
+
+int register_with_server(const char* server_ip, char player, int bot_port) {
+    char local_ip[INET_ADDRSTRLEN];
+    if (!get_local_ip(server_ip, local_ip, sizeof(local_ip))) {
+        strcpy(local_ip, "127.0.0.1");
+    }
+    
+    char data[512];
+    snprintf(data, sizeof(data),
+             "{\"player\":\"%c\",\"bot_info\":{\"host\":\"%s\",\"port\":%d,"
+             "\"name\":\"C Bot (%c)\",\"protocol\":\"binary\"}}",
+             player, local_ip, bot_port, player);
+    
+    char response[BUFFER_SIZE];
+    if (send_http_request(server_ip, 8080, "POST", "/api/register-bot",
+                          data, response, BUFFER_SIZE) <= 0) {
+        return 0;
+    }
+    if (!strstr(response, "\"success\"")) {
+        printf("❌ Failed to register: %s\n", response);
+        return 0;
+    }
+    if (!strstr(response, "\"protocol\": \"binary\"") && !strstr(response, "\"protocol\":\"binary\"")) {
+        printf("❌ Server did not accept the binary protocol\n");
+        return 0;
+    }
+    return 1;
+}
+
+int send_all(int sock, const void* data, int length) {
+    const char* p = data;
+    while (length > 0) {
+        int sent = send(sock, p, length, 0);
+        if (sent <= 0) return 0;
+        p += sent;
+        length -= sent;
+    }
+    return 1;
+}
+
+void handle_connection(int client) {
+    // Keep-alive: the server sends every move of a game over one connection
+    static unsigned char buffer[MAX_REQUEST];
+    int used = 0;
+    
+    while (1) {
+        // Read up to the end of the headers
+        char* header_end = NULL;
+        while (!(header_end = memmem(buffer, used, "\r\n\r\n", 4))) {
+            if (used == MAX_REQUEST) return;
+            int received = recv(client, buffer + used, MAX_REQUEST - used, 0);
+            if (received <= 0) return;
+            used += received;
+        }
+        int header_length = header_end + 4 - (char*)buffer;
+        *header_end = '\0';
+        
+        int content_length = 0;
+        const char* length_header = strcasestr((char*)buffer, "\r\nContent-Length:");
+        if (length_header) {
+            content_length = atoi(length_header + 17);
+        }
+        if (content_length < 0 || header_length + content_length > MAX_REQUEST) return;
+        
+        // Read the body
+        while (used < header_length + content_length) {
+            int received = recv(client, buffer + used, MAX_REQUEST - used, 0);
+            if (received <= 0) return;
+            used += received;
+        }
+        
+        GameState state;
+        const char* status = "404 Not Found";
+        unsigned char reply[2];
+        int reply_length = 0;
+        
+        if (strncmp((char*)buffer, "POST /get_move ", 15) == 0) {
+            status = "400 Bad Request";
+            if (decode_binary_request(buffer + header_length, content_length, &state)) {
+                Move move = get_move(state.board, state.current_player);
+                printf("🎯 Making move: (%d, %d)\n", move.row, move.col);
+                fflush(stdout);
+                reply[0] = (unsigned char)move.row;
+                reply[1] = (unsigned char)move.col;
+                reply_length = 2;
+                status = "200 OK";
             }
-            row++;
         }
-        p++;
+        
+        char headers[256];
+        int headers_length = snprintf(headers, sizeof(headers),
+                                      "HTTP/1.1 %s\r\n"
+                                      "Content-Type: application/octet-stream\r\n"
+                                      "Content-Length: %d\r\n"
+                                      "\r\n",
+                                      status, reply_length);
+        if (!send_all(client, headers, headers_length) ||
+            (reply_length && !send_all(client, reply, reply_length))) {
+            return;
+        }
+        
+        // Keep any bytes of the next request
+        used -= header_length + content_length;
+        memmove(buffer, buffer + header_length + content_length, used);
     }
+}
+
+int run_bot_server(int bot_port) {
+    int server = socket(AF_INET, SOCK_STREAM, 0);
+    if (server < 0) return 0;
     
-    return 1;
+    int reuse = 1;
+    setsockopt(server, SOL_SOCKET, SO_REUSEADDR, &reuse, sizeof(reuse));
+    
+    struct sockaddr_in addr;
+    memset(&addr, 0, sizeof(addr));
+    addr.sin_family = AF_INET;
+    addr.sin_addr.s_addr = INADDR_ANY;
+    addr.sin_port = htons(bot_port);
+    
+    if (bind(server, (struct sockaddr*)&addr, sizeof(addr)) < 0 || listen(server, 16) < 0) {
+        close(server);
+        return 0;
+    }
+    
+    printf("🌐 Bot will accept move requests at http://0.0.0.0:%d/get_move\n", bot_port);
+    fflush(stdout);
+    
+    // One process per connection, so a stale keep-alive connection never
+    // blocks new ones; exited children are reaped automatically
+    signal(SIGCHLD, SIG_IGN);
+    while (1) {
+        int client = accept(server, NULL, NULL);
+        if (client < 0) continue;
+        pid_t pid = fork();
+        if (pid == 0) {
+            close(server);
+            srand(time(NULL) ^ getpid());
+            handle_connection(client);
+            close(client);
+            exit(0);
+        }
+        close(client);
+    }
 }
 
 int main(int argc, char* argv[]) {
-    if (argc != 2) {
-        printf("Usage: %s <server_ip>\n", argv[0]);
-        printf("Example: %s 192.168.1.100\n", argv[0]);
-        printf("\nNote: This client makes HTTP requests to the server.\n");
-        printf("Make sure the server is running and accessible.\n");
+    if (argc < 3 || argc > 4 || (argv[2][0] != 'X' && argv[2][0] != 'O') || argv[2][1] != '\0') {
+        printf("Usage: %s <server_ip> <player> [bot_port]\n", argv[0]);
+        printf("Example: %s 192.168.1.100 X 8081\n", argv[0]);
+        printf("\nNote: The bot registers with the server, which then sends it\n");
+        printf("move requests in the binary protocol on bot_port.\n");
         return 1;
     }
     
     char* server_ip = argv[1];
+    char player = argv[2][0];
+    int bot_port = argc > 3 ? atoi(argv[3]) : 8081;
     
     // Initialize random seed
     srand(time(NULL));
@@ -188,76 +352,23 @@ int main(int argc, char* argv[]) {
     printf("🎮 GOMOKU BOT CLIENT - C\n");
     printf("==================================================\n");
     printf("Connecting to server: %s\n", server_ip);
+    
+    if (!register_with_server(server_ip, player, bot_port)) {
+        printf("Failed to register with server. Exiting.\n");
+        return 1;
+    }
+    printf("✅ Successfully registered as player %c (binary protocol)\n", player);
+    
     printf("\n🤖 Bot is ready to play!\n");
     printf("📋 Available variables in get_move():\n");
     printf("   - board: 15x15 array ('X', 'O', or ' ')\n");
     printf("   - current_player: 'X' or 'O'\n");
     printf("\n💡 Edit the get_move() function to implement your strategy!\n\n");
     
-    char response[BUFFER_SIZE];
-    char board[BOARD_SIZE][BOARD_SIZE];
-    
-    while (1) {
-        // Get game state
-        if (send_http_request(server_ip, 8080, "GET", "/api/game-state", 
-                             NULL, response, BUFFER_SIZE) > 0) {
-            
-            // Parse the response
-            if (parse_json_board(response, board)) {
-                
-                // Extract current player (simplified)
-                char current_player = 'X';
-                const char* player_str = strstr(response, "\"currentPlayer\":\"");
-                if (player_str) {
-                    player_str += 16;
-                    if (*player_str == 'O') current_player = 'O';
-                }
-                
-                // Check if game is over
-                if (strstr(response, "\"gameOver\":true")) {
-                    printf("🏁 Game over!\n");
-                    break;
-                }
-                
-                // Get our move
-                Move move = get_move(board, current_player);
-                
-                // Validate move
-                if (move.row < 0 || move.row >= BOARD_SIZE || 
-                    move.col < 0 || move.col >= BOARD_SIZE) {
-                    printf("❌ Invalid move: (%d, %d)\n", move.row, move.col);
-                    sleep(2);
-                    continue;
-                }
-                
-                if (board[move.row][move.col] != ' ') {
-                    printf("❌ Position (%d, %d) is already occupied\n", move.row, move.col);
-                    sleep(2);
-                    continue;
-                }
-                
-                // Send move
-                char move_data[100];
-                snprintf(move_data, sizeof(move_data), "{\"row\":%d,\"col\":%d}", move.row, move.col);
-                
-                printf("🎯 Making move: (%d, %d)\n", move.row, move.col);
-                
-                if (send_http_request(server_ip, 8080, "POST", "/api/move", 
-                                     move_data, response, BUFFER_SIZE) > 0) {
-                    printf("✅ Move sent successfully\n");
-                } else {
-                    printf("❌ Failed to send move\n");
-                }
-                
-            } else {
-                printf("❌ Could not parse game state\n");
-            }
-        } else {
-            printf("❌ Could not get game state\n");
-        }
-        
-        sleep(1);
+    if (!run_bot_server(bot_port)) {
+        printf("❌ Could not listen on port %d\n", bot_port);
+        return 1;
     }
     
     return 0;
-} 
\ No newline at end of file
+}
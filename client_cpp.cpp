@@ -1,14 +1,18 @@
 /*
  * Gomoku Bot Client - C++ Version
- * Compile: g++ -o client_cpp client_cpp.cpp
- * Run: ./client_cpp <server_ip>
+ * Compile: g++ -pthread -o client_cpp client_cpp.cpp
+ * Run: ./client_cpp <server_ip> <player> [bot_port]
+ *
+ * Registers with the server as a bot speaking the compact binary protocol
+ * (see protocol.py) and answers POST /get_move requests on bot_port.
  */
 
 #include <iostream>
 #include <string>
 #include <vector>
 #include <random>
-#include <chrono>
+#include <cctype>
+#include <cstdlib>
 #include <thread>
 #include <sys/socket.h>
 #include <netinet/in.h>
@@ -19,6 +23,11 @@
 const int BOARD_SIZE = 15;
 const int BUFFER_SIZE = 4096;
 
+// Binary move request: 20-byte header, 2-bit packed board, then the moves
+const int HEADER_SIZE = 20;
+const int BOARD_BYTES = (BOARD_SIZE * BOARD_SIZE + 3) / 4;
+const size_t MAX_REQUEST = BUFFER_SIZE + HEADER_SIZE + BOARD_BYTES + BOARD_SIZE * BOARD_SIZE * 2;
+
 struct Move {
     int row;
     int col;
@@ -28,10 +37,11 @@ class GomokuBot {
 private:
     std::string server_ip;
     int server_port;
+    int bot_port;
     
 public:
-    GomokuBot(const std::string& ip, int port = 8080) 
-        : server_ip(ip), server_port(port) {}
+    GomokuBot(const std::string& ip, int port = 8080, int bot_port = 8081) 
+        : server_ip(ip), server_port(port), bot_port(bot_port) {}
     
     bool send_http_request(const std::string& method, const std::string& path, 
                           const std::string& data, std::string& response) {
@@ -59,12 +69,14 @@ public:
         if (!data.empty()) {
             request = method + " " + path + " HTTP/1.1\r\n"
                      "Host: " + server_ip + "\r\n"
+                     "Connection: close\r\n"
                      "Content-Type: application/json\r\n"
                      "Content-Length: " + std::to_string(data.length()) + "\r\n"
                      "\r\n" + data;
         } else {
             request = method + " " + path + " HTTP/1.1\r\n"
                      "Host: " + server_ip + "\r\n"
+                     "Connection: close\r\n"
                      "\r\n";
         }
         
@@ -74,66 +86,16 @@ public:
             return false;
         }
         
-        // Receive response
+        // Receive response (the server closes the connection after it)
         char buffer[BUFFER_SIZE];
-        int bytes_received = recv(sock, buffer, BUFFER_SIZE - 1, 0);
-        if (bytes_received > 0) {
-            buffer[bytes_received] = '\0';
-            response = std::string(buffer);
+        ssize_t bytes_received;
+        response.clear();
+        while ((bytes_received = recv(sock, buffer, BUFFER_SIZE, 0)) > 0) {
+            response.append(buffer, bytes_received);
         }
         
         close(sock);
-        return bytes_received > 0;
-    }
-    
-    bool parse_json_board(const std::string& json_str, std::vector<std::vector<char>>& board) {
-        // Simple JSON parsing for the board
-        // This is a simplified parser - in a real implementation you'd use a proper JSON library
-        
-        size_t board_start = json_str.find("\"board\":");
-        if (board_start == std::string::npos) return false;
-        
-        size_t array_start = json_str.find('[', board_start);
-        if (array_start == std::string::npos) return false;
-        
-        board.clear();
-        board.resize(BOARD_SIZE, std::vector<char>(BOARD_SIZE, ' '));
-        
-        size_t pos = array_start + 1;
-        int row = 0;
-        
-        while (row < BOARD_SIZE && pos < json_str.length()) {
-            size_t row_start = json_str.find('[', pos);
-            if (row_start == std::string::npos) break;
-            
-            size_t row_end = json_str.find(']', row_start);
-            if (row_end == std::string::npos) break;
-            
-            std::string row_str = json_str.substr(row_start + 1, row_end - row_start - 1);
-            
-            int col = 0;
-            size_t col_pos = 0;
-            while (col < BOARD_SIZE && col_pos < row_str.length()) {
-                size_t quote_start = row_str.find('"', col_pos);
-                if (quote_start == std::string::npos) break;
-                
-                size_t quote_end = row_str.find('"', quote_start + 1);
-                if (quote_end == std::string::npos) break;
-                
-                char cell = row_str[quote_start + 1];
-                if (cell == 'X' || cell == 'O' || cell == ' ') {
-                    board[row][col] = cell;
-                }
-                
-                col++;
-                col_pos = quote_end + 1;
-            }
-            
-            row++;
-            pos = row_end + 1;
-        }
-        
-        return true;
+        return !response.empty();
     }
     
     Move get_move(const std::vector<std::vector<char>>& board, char current_player) {
@@ -173,7 +135,156 @@ public:
         return {7, 7};  // Fallback to center
     }
     
-    void play_game() {
+    
+    bool decode_binary_request(const std::string& data, std::vector<std::vector<char>>& board,
+                               char& current_player) {
+        // Layout: "GM", version, board size, player (1 X / 2 O), flags (bit 0:
+        // game over), move count u16, move time u32, X and O clocks i32, then the
+        // board at 2 bits per cell (cell i in bits 2*(i%4) of byte i/4)
+        static const char cells[] = {' ', 'X', 'O', ' '};
+        
+        if (data.size() < size_t(HEADER_SIZE + BOARD_BYTES)) return false;
+        if (data.compare(0, 2, "GM") != 0 || data[2] != 1 || data[3] != BOARD_SIZE) return false;
+        
+        current_player = data[4] == 2 ? 'O' : 'X';
+        board.assign(BOARD_SIZE, std::vector<char>(BOARD_SIZE, ' '));
+        for (int i = 0; i < BOARD_SIZE * BOARD_SIZE; i++) {
+            unsigned char packed = data[HEADER_SIZE + i / 4];
+            board[i / BOARD_SIZE][i % BOARD_SIZE] = cells[(packed >> ((i % 4) * 2)) & 3];
+        }
+        
+        return true;
+    }
+    
+    std::string get_local_ip() {
+        // The address of the interface that routes to the server
+        std::string ip = "127.0.0.1";
+        int sock = socket(AF_INET, SOCK_DGRAM, 0);
+        if (sock < 0) return ip;
+        
+        struct sockaddr_in server_addr = {};
+        server_addr.sin_family = AF_INET;
+        server_addr.sin_port = htons(server_port);
+        inet_pton(AF_INET, server_ip.c_str(), &server_addr.sin_addr);
+        
+        struct sockaddr_in local_addr = {};
+        socklen_t addr_len = sizeof(local_addr);
+        char buffer[INET_ADDRSTRLEN];
+        if (connect(sock, (struct sockaddr*)&server_addr, sizeof(server_addr)) == 0 &&
+            getsockname(sock, (struct sockaddr*)&local_addr, &addr_len) == 0 &&
+            inet_ntop(AF_INET, &local_addr.sin_addr, buffer, sizeof(buffer))) {
+            ip = buffer;
+        }
+        close(sock);
+        return ip;
+    }
+    
+    bool register_with_server(char player) {
+        std::string p(1, player);
+        std::string data = "{\"player\":\"" + p + "\",\"bot_info\":{\"host\":\"" + get_local_ip() +
+                           "\",\"port\":" + std::to_string(bot_port) +
+                           ",\"name\":\"C++ Bot (" + p + ")\",\"protocol\":\"binary\"}}";
+        
+        std::string response;
+        if (!send_http_request("POST", "/api/register-bot", data, response)) {
+            return false;
+        }
+        if (response.find("\"success\"") == std::string::npos) {
+            std::cout << "❌ Failed to register: " << response << std::endl;
+            return false;
+        }
+        if (response.find("\"protocol\": \"binary\"") == std::string::npos &&
+            response.find("\"protocol\":\"binary\"") == std::string::npos) {
+            std::cout << "❌ Server did not accept the binary protocol" << std::endl;
+            return false;
+        }
+        std::cout << "✅ Successfully registered as player " << player << " (binary protocol)" << std::endl;
+        return true;
+    }
+    
+    static bool send_all(int sock, const std::string& data) {
+        size_t offset = 0;
+        while (offset < data.size()) {
+            ssize_t sent = send(sock, data.data() + offset, data.size() - offset, 0);
+            if (sent <= 0) return false;
+            offset += sent;
+        }
+        return true;
+    }
+    
+    void handle_connection(int client) {
+        // Keep-alive: the server sends every move of a game over one connection
+        std::string buffer;
+        char chunk[BUFFER_SIZE];
+        
+        while (true) {
+            // Read up to the end of the headers
+            size_t header_end;
+            while ((header_end = buffer.find("\r\n\r\n")) == std::string::npos) {
+                if (buffer.size() > MAX_REQUEST) return;
+                ssize_t received = recv(client, chunk, sizeof(chunk), 0);
+                if (received <= 0) return;
+                buffer.append(chunk, received);
+            }
+            size_t header_length = header_end + 4;
+            std::string headers = buffer.substr(0, header_end);
+            
+            size_t content_length = 0;
+            for (auto& c : headers) c = std::tolower(c);
+            size_t length_pos = headers.find("\r\ncontent-length:");
+            if (length_pos != std::string::npos) {
+                content_length = std::strtoul(headers.c_str() + length_pos + 17, nullptr, 10);
+            }
+            if (header_length + content_length > MAX_REQUEST) return;
+            
+            // Read the body
+            while (buffer.size() < header_length + content_length) {
+                ssize_t received = recv(client, chunk, sizeof(chunk), 0);
+                if (received <= 0) return;
+                buffer.append(chunk, received);
+            }
+            std::string body = buffer.substr(header_length, content_length);
+            buffer.erase(0, header_length + content_length);  // Keep the next request
+            
+            std::string status = "404 Not Found";
+            std::string reply;
+            if (headers.compare(0, 15, "post /get_move ") == 0) {
+                status = "400 Bad Request";
+                std::vector<std::vector<char>> board;
+                char current_player;
+                if (decode_binary_request(body, board, current_player)) {
+                    Move move = get_move(board, current_player);
+                    std::cout << "🎯 Making move: (" << move.row << ", " << move.col << ")" << std::endl;
+                    reply = {char(move.row), char(move.col)};
+                    status = "200 OK";
+                }
+            }
+            
+            std::string response = "HTTP/1.1 " + status + "\r\n"
+                                   "Content-Type: application/octet-stream\r\n"
+                                   "Content-Length: " + std::to_string(reply.size()) + "\r\n"
+                                   "\r\n" + reply;
+            if (!send_all(client, response)) return;
+        }
+    }
+    
+    bool run_bot_server() {
+        int server = socket(AF_INET, SOCK_STREAM, 0);
+        if (server < 0) return false;
+        
+        int reuse = 1;
+        setsockopt(server, SOL_SOCKET, SO_REUSEADDR, &reuse, sizeof(reuse));
+        
+        struct sockaddr_in addr = {};
+        addr.sin_family = AF_INET;
+        addr.sin_addr.s_addr = INADDR_ANY;
+        addr.sin_port = htons(bot_port);
+        
+        if (bind(server, (struct sockaddr*)&addr, sizeof(addr)) < 0 || listen(server, 16) < 0) {
+            close(server);
+            return false;
+        }
+        
         std::cout << "🤖 Bot is ready to play!" << std::endl;
         std::cout << "📋 Available variables in get_move():" << std::endl;
         std::cout << "   - board: 15x15 vector ('X', 'O', or ' ')" << std::endl;
@@ -181,95 +292,49 @@ public:
         std::cout << std::endl;
         std::cout << "💡 Edit the get_move() method to implement your strategy!" << std::endl;
         std::cout << std::endl;
+        std::cout << "🌐 Bot will accept move requests at http://0.0.0.0:" << bot_port << "/get_move" << std::endl;
         
+        // One thread per connection, so a stale keep-alive connection never
+        // blocks new ones
         while (true) {
-            try {
-                // Get game state
-                std::string response;
-                if (send_http_request("GET", "/api/game-state", "", response)) {
-                    
-                    std::vector<std::vector<char>> board;
-                    if (parse_json_board(response, board)) {
-                        
-                        // Extract current player
-                        char current_player = 'X';
-                        size_t player_pos = response.find("\"currentPlayer\":\"");
-                        if (player_pos != std::string::npos) {
-                            player_pos += 16;
-                            if (response[player_pos] == 'O') current_player = 'O';
-                        }
-                        
-                        // Check if game is over
-                        if (response.find("\"gameOver\":true") != std::string::npos) {
-                            std::cout << "🏁 Game over!" << std::endl;
-                            break;
-                        }
-                        
-                        // Get our move
-                        Move move = get_move(board, current_player);
-                        
-                        // Validate move
-                        if (move.row < 0 || move.row >= BOARD_SIZE || 
-                            move.col < 0 || move.col >= BOARD_SIZE) {
-                            std::cout << "❌ Invalid move: (" << move.row << ", " << move.col << ")" << std::endl;
-                            std::this_thread::sleep_for(std::chrono::seconds(2));
-                            continue;
-                        }
-                        
-                        if (board[move.row][move.col] != ' ') {
-                            std::cout << "❌ Position (" << move.row << ", " << move.col << ") is already occupied" << std::endl;
-                            std::this_thread::sleep_for(std::chrono::seconds(2));
-                            continue;
-                        }
-                        
-                        // Send move
-                        std::string move_data = "{\"row\":" + std::to_string(move.row) + 
-                                              ",\"col\":" + std::to_string(move.col) + "}";
-                        
-                        std::cout << "🎯 Making move: (" << move.row << ", " << move.col << ")" << std::endl;
-                        
-                        if (send_http_request("POST", "/api/move", move_data, response)) {
-                            std::cout << "✅ Move sent successfully" << std::endl;
-                        } else {
-                            std::cout << "❌ Failed to send move" << std::endl;
-                        }
-                        
-                    } else {
-                        std::cout << "❌ Could not parse game state" << std::endl;
-                    }
-                } else {
-                    std::cout << "❌ Could not get game state" << std::endl;
-                }
-                
-                std::this_thread::sleep_for(std::chrono::seconds(1));
-                
-            } catch (const std::exception& e) {
-                std::cout << "❌ Error in game loop: " << e.what() << std::endl;
-                std::this_thread::sleep_for(std::chrono::seconds(2));
-            }
+            int client = accept(server, nullptr, nullptr);
+            if (client < 0) continue;
+            std::thread([this, client]() {
+                handle_connection(client);
+                close(client);
+            }).detach();
         }
     }
 };
 
 int main(int argc, char* argv[]) {
-    if (argc != 2) {
-        std::cout << "Usage: " << argv[0] << " <server_ip>" << std::endl;
-        std::cout << "Example: " << argv[0] << " 192.168.1.100" << std::endl;
+    if (argc < 3 || argc > 4 || (std::string(argv[2]) != "X" && std::string(argv[2]) != "O")) {
+        std::cout << "Usage: " << argv[0] << " <server_ip> <player> [bot_port]" << std::endl;
+        std::cout << "Example: " << argv[0] << " 192.168.1.100 X 8081" << std::endl;
         std::cout << std::endl;
-        std::cout << "Note: This client makes HTTP requests to the server." << std::endl;
-        std::cout << "Make sure the server is running and accessible." << std::endl;
+        std::cout << "Note: The bot registers with the server, which then sends it" << std::endl;
+        std::cout << "move requests in the binary protocol on bot_port." << std::endl;
         return 1;
     }
     
     std::string server_ip = argv[1];
+    char player = argv[2][0];
+    int bot_port = argc > 3 ? std::stoi(argv[3]) : 8081;
     
     std::cout << "🎮 GOMOKU BOT CLIENT - C++" << std::endl;
     std::cout << "==================================================" << std::endl;
     std::cout << "Connecting to server: " << server_ip << std::endl;
     std::cout << std::endl;
     
-    GomokuBot bot(server_ip);
-    bot.play_game();
+    GomokuBot bot(server_ip, 8080, bot_port);
+    if (!bot.register_with_server(player)) {
+        std::cout << "Failed to register with server. Exiting." << std::endl;
+        return 1;
+    }
+    if (!bot.run_bot_server()) {
+        std::cout << "❌ Could not listen on port " << bot_port << std::endl;
+        return 1;
+    }
     
     return 0;
-} 
\ No newline at end of file
+}
@@ -5,16 +5,75 @@ This bot connects to the server and provides an HTTP API for getting moves.
 Uses only standard Python libraries - no Flask required.
 """
 
+import os
 import socket
 import json
 import time
 import sys
 import requests
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
 
+# Move selection strategies for GomokuBot:
+# - heuristic: the fixed priority list in get_move below
+# - search: iterative deepening alpha-beta search (bot_engine.SearchEngine)
+# - vector: best cell by NumPy window scoring, no search (needs numpy)
+STRATEGIES = ('heuristic', 'search', 'vector')
+# The heuristic strategy needs only this file: bot_engine, vector_eval,
+# opening_book and protocol are imported when a feature asks for them, so
+# a copy of client_python.py on its own still runs
+
+# Wire formats (PROTOCOLS) and the binary one's content type
+PROTOCOLS = ('json', 'binary')
+BINARY_CONTENT_TYPE = 'application/octet-stream'
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+# Strategies that use DEFAULT_BOOK_PATH unless told otherwise; the
+# heuristic reference bot plays without a book unless given one
+BOOK_STRATEGIES = ('search',)
+
+def load_opening_book(path=DEFAULT_BOOK_PATH):
+    """The opening book at path, or None without the file or opening_book.py"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        from opening_book import load_book
+    except ImportError:
+        return None
+    return load_book(path)
+
 class BotHTTPHandler(BaseHTTPRequestHandler):
+    # Keep-alive lets the server reuse one connection for every move
+    protocol_version = 'HTTP/1.1'
+    # Send the reply at once instead of waiting for the server's delayed ACK
+    disable_nagle_algorithm = True
+    
+    def send_json(self, data, status=200):
+        """Send a JSON response with Content-Length (required for keep-alive)"""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_binary(self, body):
+        """Send a binary protocol reply"""
+        self.send_response(200)
+        self.send_header('Content-type', BINARY_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        """Answer the server's health checks"""
+        if self.path == '/health':
+            self.send_json({'status': 'ok'})
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+    
     def do_POST(self):
         """Handle POST requests for getting moves"""
         if self.path == '/get_move':
@@ -22,41 +81,47 @@ class BotHTTPHandler(BaseHTTPRequestHandler):
                 # Read request body
                 content_length = int(self.headers['Content-Length'])
                 post_data = self.rfile.read(content_length)
-                game_state = json.loads(post_data.decode())
+                binary = self.headers.get('Content-Type') == BINARY_CONTENT_TYPE
+                if binary:
+                    import protocol
+                    game_state = protocol.decode_request(post_data)
+                else:
+                    game_state = json.loads(post_data.decode())
                 
                 # Get move from bot (access via server's bot_instance)
-                board = game_state['board']
-                current_player = game_state['currentPlayer']
-                row, col = self.server.bot_instance.get_move(board, current_player)
+                row, col = self.server.bot_instance.get_move_for_state(game_state)
                 
-                # Send response
-                response = {'row': row, 'col': col}
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(response).encode())
+                # Send response in the protocol the request came in
+                if binary:
+                    self.send_binary(protocol.encode_move(row, col))
+                else:
+                    self.send_json({'row': row, 'col': col})
                 
             except Exception as e:
                 print(f"Error in get_move endpoint: {e}")
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({'error': str(e)}).encode())
+                self.send_json({'error': str(e)}, status=500)
         else:
             self.send_response(404)
+            self.send_header('Content-Length', '0')
             self.end_headers()
     
     def log_message(self, format, *args):
         """Suppress HTTP server logs"""
         pass
 
-class BotHTTPServer(HTTPServer):
+class BotHTTPServer(ThreadingHTTPServer):
+    # One thread per connection, so a health check is answered while the
+    # server's keep-alive connection for moves stays open
+    daemon_threads = True
+    
     def __init__(self, server_address, bot_instance):
         self.bot_instance = bot_instance
         super().__init__(server_address, BotHTTPHandler)
 
 class GomokuBot:
-    def __init__(self, server_host, server_port=8080, bot_port=8081):
+    def __init__(self, server_host, server_port=8080, bot_port=8081,
+                 strategy='heuristic', time_limit=2.0, session=True, search_processes=1,
+                 opening_book='default', protocol='json'):
         # Clean up server_host - remove http:// if present
         if server_host.startswith('http://'):
             server_host = server_host[7:]  # Remove 'http://'
@@ -69,6 +134,75 @@ class GomokuBot:
         self.base_url = f"http://{server_host}:{server_port}"
         self.player = None  # Will be set when registering
         self.http_server = None
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, expected one of {STRATEGIES}")
+        self.strategy = strategy
+        self.search_engine = None
+        if strategy == 'search':
+            from bot_engine import SearchEngine, ParallelSearch
+            if search_processes > 1:
+                # Root moves are split across a pool of processes, started
+                # with the bot server (or on the first search)
+                self.search_engine = ParallelSearch(workers=search_processes, time_limit=time_limit)
+            else:
+                self.search_engine = SearchEngine(time_limit=time_limit)
+        # The engine and evaluator each hold one board, and the bot server
+        # answers requests from several games at once: one move at a time
+        self.engine_lock = threading.Lock()
+        self.vector_evaluator = None
+        if strategy == 'vector':
+            from vector_eval import VectorEvaluator
+            self.vector_evaluator = VectorEvaluator()
+        # Session mode: keep the search engine's position, transposition
+        # table and principal variation between requests of the same game
+        self.session = session
+        # Precomputed replies for the first few moves (None if no book file).
+        # 'default' is DEFAULT_BOOK_PATH for BOOK_STRATEGIES and no book for
+        # the others; a path turns a book on, None turns it off
+        if opening_book == 'default':
+            opening_book = DEFAULT_BOOK_PATH if strategy in BOOK_STRATEGIES else None
+        self.opening_book = load_opening_book(opening_book)
+        # Wire format asked for at registration: 'json' or 'binary'
+        self.protocol = protocol
+        
+    def get_move_for_state(self, game_state):
+        """Pick a move for a /get_move request body (the server's game state)"""
+        board = game_state['board']
+        current_player = game_state['currentPlayer']
+        book_move = self.opening_book and self.opening_book.lookup(board)
+        if book_move:
+            return book_move
+        if self.search_engine is None:
+            return self.get_move(board, current_player)
+        start = time.perf_counter()
+        with self.engine_lock:
+            # Time spent waiting for another game's search comes out of this one
+            time_limit = max(self.search_time(game_state) - (time.perf_counter() - start), 0.01)
+            if self.session and 'moveHistory' in game_state:
+                # Play just the moves since the last request instead of
+                # reloading the whole board (a request from another game
+                # rebuilds it)
+                return self.search_engine.search_moves(game_state['moveHistory'], current_player,
+                                                       board_size=len(board), time_limit=time_limit)
+            return self.search_engine.search(board, current_player, time_limit=time_limit)
+    
+    def search_time(self, game_state):
+        """Seconds to search this move: time_limit, within the server's time control.
+        
+        Keeps a safety margin under the per-move limit (moveTimeLimit) and,
+        with a game clock, spends a small share of the remaining time plus
+        the increment.
+        """
+        time_limit = self.search_engine.time_limit
+        move_limit = game_state.get('moveTimeLimit')
+        if move_limit:
+            time_limit = min(time_limit, move_limit * 0.8 - 0.05)
+        clock = game_state.get('clock')
+        if clock:
+            remaining = clock[game_state['currentPlayer']]
+            increment = (game_state.get('timeControl') or {}).get('increment', 0)
+            time_limit = min(time_limit, remaining / 20 + increment * 0.8)
+        return max(time_limit, 0.01)
         
     def get_move(self, board, current_player):
         """
@@ -82,6 +216,22 @@ class GomokuBot:
         - tuple (row, col) with your move (0-14 for both row and col)
         """
         
+        # Known openings are answered from the book without thinking
+        book_move = self.opening_book and self.opening_book.lookup(board)
+        if book_move:
+            return book_move
+        
+        # The search strategy thinks for up to time_limit seconds per move
+        if self.strategy == 'search':
+            with self.engine_lock:
+                return self.search_engine.search(board, current_player)
+        
+        # The vector strategy scores every empty cell in one NumPy pass
+        if self.strategy == 'vector':
+            with self.engine_lock:
+                move = self.vector_evaluator.best_move(board, current_player)
+            return move if move else (7, 7)
+        
         # ========================================
         # SMART BOT IMPLEMENTATION
         # ========================================
@@ -272,7 +422,8 @@ class GomokuBot:
             bot_info = {
                 'host': local_ip,
                 'port': self.bot_port,
-                'name': f'Python Bot ({player})'
+                'name': f'Python Bot ({player})',
+                'protocol': self.protocol
             }
             
             response = requests.post(
@@ -283,7 +434,9 @@ class GomokuBot:
             
             if response.status_code == 200:
                 self.player = player
-                print(f"✅ Successfully registered as player {player}")
+                # Older servers do not negotiate and always send JSON
+                self.protocol = response.json().get('protocol', 'json')
+                print(f"✅ Successfully registered as player {player} ({self.protocol} protocol)")
                 return True
             else:
                 print(f"❌ Failed to register: {response.text}")
@@ -296,6 +449,11 @@ class GomokuBot:
     def start_bot_server(self):
         """Start the HTTP server for this bot using standard library"""
         try:
+            # Start the search processes once, not per request
+            if hasattr(self.search_engine, 'start'):
+                self.search_engine.start()
+                print(f"🧠 Search running on {self.search_engine.workers} processes")
+            
             # Start HTTP server with custom server class
             self.http_server = BotHTTPServer(('0.0.0.0', self.bot_port), self)
             print(f"🤖 Bot server starting on port {self.bot_port}")
@@ -309,11 +467,16 @@ class GomokuBot:
             print("\n🛑 Bot stopped by user")
         except Exception as e:
             print(f"❌ Error starting bot server: {e}")
+        finally:
+            if hasattr(self.search_engine, 'close'):
+                self.search_engine.close()
 
 def main():
     if len(sys.argv) < 3:
-        print("Usage: python client_python.py <server_host> <player> [bot_port]")
-        print("Example: python client_python.py 192.168.1.100 X 8081")
+        print("Usage: python client_python.py <server_host> <player> [bot_port] [strategy] [seconds_per_move] [search_processes] [protocol]")
+        print("Example: python client_python.py 192.168.1.100 X 8081 search 2.0 8 binary")
+        print(f"Strategies: {', '.join(STRATEGIES)} (default: heuristic)")
+        print(f"Protocols: {', '.join(PROTOCOLS)} (default: json)")
         print()
         print("Requirements:")
         print("- Python 3.6+")
@@ -323,13 +486,26 @@ def main():
     server_host = sys.argv[1]
     player = sys.argv[2]
     bot_port = int(sys.argv[3]) if len(sys.argv) > 3 else 8081
+    strategy = sys.argv[4] if len(sys.argv) > 4 else 'heuristic'
+    time_limit = float(sys.argv[5]) if len(sys.argv) > 5 else 2.0
+    search_processes = int(sys.argv[6]) if len(sys.argv) > 6 else 1
+    wire_protocol = sys.argv[7] if len(sys.argv) > 7 else 'json'
     
     if player not in ['X', 'O']:
         print("Player must be 'X' or 'O'")
         sys.exit(1)
     
+    if strategy not in STRATEGIES:
+        print(f"Strategy must be one of: {', '.join(STRATEGIES)}")
+        sys.exit(1)
+    
+    if wire_protocol not in PROTOCOLS:
+        print(f"Protocol must be one of: {', '.join(PROTOCOLS)}")
+        sys.exit(1)
+    
     # Create bot instance
-    bot = GomokuBot(server_host, 8080, bot_port)
+    bot = GomokuBot(server_host, 8080, bot_port, strategy=strategy, time_limit=time_limit,
+                    search_processes=search_processes, protocol=wire_protocol)
     
     # Register with server
     if not bot.register_with_server(player):
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Bot health checks for the Gomoku server.
+Pings registered bots concurrently on a thread pool, records each bot's
+round-trip time and marks unreachable bots as dead, so a bad registration
+shows up before a match instead of as a timeout on every one of its moves.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from sandbox import is_sandboxed, code_key
+
+# Seconds between background probes of every registered bot
+DEFAULT_INTERVAL = 15.0
+# Seconds a bot has to answer a ping
+DEFAULT_TIMEOUT = 2.0
+# Background pings in a row a bot must fail to count as dead
+DEAD_AFTER = 3
+
+
+def bot_key(bot_info):
+    if is_sandboxed(bot_info):
+        return ('sandbox', code_key(bot_info['code']))
+    return (bot_info['host'], int(bot_info['port']))
+
+
+def bot_label(bot_info):
+    """Metrics label for a bot: its name, or host:port"""
+    if not bot_info:
+        return ''
+    if bot_info.get('name'):
+        return bot_info['name']
+    if is_sandboxed(bot_info):
+        return f"sandbox:{code_key(bot_info['code'])}"
+    return f"{bot_info.get('host')}:{bot_info.get('port')}"
+
+
+class HealthChecker:
+    """Concurrent pings of bots with the latest result per bot.
+
+    A ping is GET /health on the bot's keep-alive connection; any HTTP
+    response counts as alive (bots without a /health route answer 404),
+    while a refused connection or a timeout is a failure. check() pings a
+    set of bots at once before a game or round and waits for the results;
+    a bot that fails it is dead. start() keeps pinging every bot registered
+    with the server every interval seconds, and those pings only mark a bot
+    dead after DEAD_AFTER failures in a row. A bot is never pinged while a
+    move request to it is in flight (see moving()): a single-threaded bot
+    cannot answer a ping while it thinks.
+    """
+
+    def __init__(self, game_server, interval=DEFAULT_INTERVAL, timeout=DEFAULT_TIMEOUT, max_workers=32):
+        self.game_server = game_server
+        self.interval = interval
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='health')
+        self.lock = threading.Lock()
+        self.results = {}  # bot_key -> last result
+        self.busy = {}  # bot_key -> move requests in flight
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def ping(self, bot_info, confirm=False):
+        """Ping one bot and record the result.
+
+        A failure marks the bot dead at once with confirm (the pre-game
+        check), else only after DEAD_AFTER failures in a row. A bot busy
+        with a move is not pinged; its last result is returned instead.
+        """
+        if is_sandboxed(bot_info):
+            # Runs in the server's sandbox pool: nothing to reach over the network
+            return self._record(bot_info, {'alive': True, 'rttMs': None, 'error': None}, confirm)
+        if self.is_busy(bot_info):
+            return self._last_result(bot_info)
+        label = bot_label(bot_info)
+        start = time.perf_counter()
+        try:
+            self.game_server.get_bot_connection(bot_info).get('/health', timeout=self.timeout)
+            elapsed = time.perf_counter() - start
+            self.game_server.bot_ping_seconds.observe(elapsed, bot=label)
+            result = {'alive': True, 'rttMs': round(elapsed * 1000, 2), 'error': None}
+        except Exception as e:
+            if self.is_busy(bot_info):
+                # A move was sent while the ping waited: the bot is thinking, not gone
+                return self._last_result(bot_info)
+            self.game_server.bot_ping_failures.inc(bot=label)
+            result = {'alive': False, 'rttMs': None, 'error': type(e).__name__}
+        return self._record(bot_info, result, confirm)
+
+    def _last_result(self, bot_info):
+        """Result for a bot that was not pinged: its last one, or alive"""
+        return self.get(bot_info) or {'alive': True, 'rttMs': None, 'error': None,
+                                      'failures': 0, 'dead': False, 'checkedAt': None}
+
+    def _record(self, bot_info, result, confirm=False):
+        key = bot_key(bot_info)
+        result['checkedAt'] = time.time()
+        with self.lock:
+            previous = self.results.get(key)
+            if result['alive']:
+                result['failures'] = 0
+            else:
+                result['failures'] = (previous['failures'] if previous else 0) + 1
+            result['dead'] = not result['alive'] and (confirm or result['failures'] >= DEAD_AFTER)
+            self.results[key] = result
+        return result
+
+    def check(self, bot_infos):
+        """Ping bots concurrently and wait; returns results in the same order.
+
+        This is the pre-game check: a bot that fails it is dead right away.
+        """
+        bot_infos = [bot_info for bot_info in bot_infos if bot_info]
+        return list(self.pool.map(lambda bot_info: self.ping(bot_info, confirm=True), bot_infos))
+
+    def probe(self, bot_infos):
+        """Background ping of bots (dead only after DEAD_AFTER failures in a row)"""
+        bot_infos = [bot_info for bot_info in bot_infos if bot_info]
+        return list(self.pool.map(self.ping, bot_infos))
+
+    @contextmanager
+    def moving(self, bot_info):
+        """Mark a bot busy with a move request for the duration of the block"""
+        key = bot_key(bot_info)
+        with self.lock:
+            self.busy[key] = self.busy.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                if self.busy[key] == 1:
+                    del self.busy[key]
+                else:
+                    self.busy[key] -= 1
+
+    def is_busy(self, bot_info):
+        """True while a move request to the bot is in flight"""
+        with self.lock:
+            return bot_key(bot_info) in self.busy
+
+    def submit(self, bot_info):
+        """Ping a bot in the background (pre-flight check at registration)"""
+        try:
+            self.pool.submit(self.ping, bot_info)
+        except RuntimeError:  # Pool shut down
+            pass
+
+    def get(self, bot_info):
+        """Last ping result for a bot, or None if it has not been pinged"""
+        with self.lock:
+            result = self.results.get(bot_key(bot_info))
+        return dict(result) if result else None
+
+    def is_dead(self, bot_info):
+        """True if the bot failed the pre-game check, or DEAD_AFTER pings in a
+        row since (bots never pinged are not dead)"""
+        result = self.get(bot_info)
+        return result is not None and result['dead']
+
+    def start(self):
+        """Ping all registered bots every interval seconds in the background"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            self.probe(self.game_server.registered_bots())
+
+    def close(self):
+        self.stopping.set()
+        self.pool.shutdown(wait=False)
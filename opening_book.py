@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Opening book for the Python bot.
+Maps early positions to precomputed replies, looked up by Zobrist hash in a
+memory-mapped binary file. Positions are normalized over the 8 symmetries
+of the board, so one entry covers every rotation and reflection.
+
+Build a book from bot_engine self-play:
+    python opening_book.py --games 200 --plies 8 --time 1.0 --output opening_book.bin
+"""
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import time
+
+from bot_engine import SearchEngine, PLAYER_CODES
+from symmetry import canonical_key, inverse_move, stones_of, transform_move
+
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+# File layout: header, then records sorted by hash (several records may
+# share a hash, one per reply). Moves are cell indexes row * size + col in
+# the canonical orientation; weight is how often self-play chose the reply.
+MAGIC = b'GMKB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHI')  # magic, version, board_size, max_plies, count
+RECORD = struct.Struct('<QHH')     # hash, move, weight
+
+
+class OpeningBook:
+    """Read-only opening book, memory-mapped from a file written by write_book"""
+
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, board_size, max_plies, count = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not an opening book (version {VERSION})")
+        self.board_size = board_size
+        self.max_plies = max_plies
+        self.count = count
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.count
+
+    def _record(self, i):
+        return RECORD.unpack_from(self._data, HEADER.size + i * RECORD.size)
+
+    def replies(self, key):
+        """All (move, weight) records for a canonical hash"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        while lo < self.count:
+            h, move, weight = self._record(lo)
+            if h != key:
+                break
+            found.append((move, weight))
+            lo += 1
+        return found
+
+    def lookup_stones(self, stones):
+        """Book reply for a list of (row, col, player), or None"""
+        if len(stones) > self.max_plies:
+            return None
+        key, t = canonical_key(stones, self.board_size)
+        replies = self.replies(key)
+        if not replies:
+            return None
+        move = max(replies, key=lambda reply: reply[1])[0]
+        # Map the canonical reply back onto the board as it was given
+        row, col = inverse_move(*divmod(move, self.board_size), t, self.board_size)
+        occupied = {(r, c) for r, c, _ in stones}
+        return None if (row, col) in occupied else (row, col)
+
+    def lookup(self, board):
+        """Book reply (row, col) for a list-of-lists board, or None"""
+        if len(board) != self.board_size:
+            return None
+        return self.lookup_stones(stones_of(board))
+
+
+def load_book(path=DEFAULT_BOOK_PATH):
+    """Open a book if the file exists, else None"""
+    if path and os.path.exists(path):
+        return OpeningBook(path)
+    return None
+
+
+def write_book(path, entries, board_size=15, max_plies=8):
+    """Write {(hash, move): weight} to a book file"""
+    records = sorted((h, move, min(weight, 0xFFFF)) for (h, move), weight in entries.items())
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, board_size, max_plies, len(records)))
+        for record in records:
+            f.write(RECORD.pack(*record))
+
+
+def generate(output_path=DEFAULT_BOOK_PATH, games=100, plies=8, time_limit=1.0,
+             random_plies=3, board_size=15, seed=None, verbose=True):
+    """Build a book from engine self-play.
+
+    The first random_plies moves of each game are picked at random among
+    the engine's top candidates, so games cover different openings; from
+    then on the engine searches every position and its reply is recorded.
+    """
+    rng = random.Random(seed)
+    engine = SearchEngine(board_size, time_limit=time_limit)
+    n = board_size
+    entries = {}
+    start = time.time()
+    for game in range(games):
+        engine.clear()
+        stones = []
+        player = PLAYER_CODES['X']
+        for ply in range(plies):
+            if ply == 0:
+                idx = (n // 2) * n + n // 2
+            elif ply < random_plies:
+                idx = rng.choice(engine.ordered_moves(player, limit=4))
+            else:
+                idx = engine.search_position(player)
+            key, t = canonical_key(stones, n)
+            r, c = transform_move(*divmod(idx, n), t, n)
+            entries[(key, r * n + c)] = entries.get((key, r * n + c), 0) + 1
+            engine.play(idx, player)
+            stones.append(divmod(idx, n) + (player,))
+            if engine.is_win(idx, player):
+                break
+            player = 3 - player
+        if verbose:
+            print(f"Game {game + 1}/{games}: {len(entries)} book entries "
+                  f"({time.time() - start:.0f}s)")
+    write_book(output_path, entries, board_size, plies)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a Gomoku opening book from self-play')
+    parser.add_argument('--games', type=int, default=100, help='Self-play games')
+    parser.add_argument('--plies', type=int, default=8, help='Book depth in moves')
+    parser.add_argument('--time', type=float, default=1.0, help='Seconds of search per book move')
+    parser.add_argument('--random-plies', type=int, default=3,
+                        help='Opening moves picked at random among the top candidates')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    parser.add_argument('--output', default=DEFAULT_BOOK_PATH, help='Book file to write')
+    args = parser.parse_args()
+    entries = generate(args.output, args.games, args.plies, args.time, args.random_plies,
+                       seed=args.seed)
+    print(f"📖 Wrote {len(entries)} entries to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
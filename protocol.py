@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compact binary protocol for move requests between the server and bots.
+Opt-in per bot: register with "protocol": "binary" in bot_info and the
+server POSTs /get_move with an application/octet-stream body instead of
+JSON, and expects a 2-byte reply.
+
+Request (little-endian):
+    0   2 bytes  magic b'GM'
+    2   u8       version (1)
+    3   u8       board size n
+    4   u8       player to move (1 = X, 2 = O)
+    5   u8       flags (bit 0: game over)
+    6   u16      number of moves m
+    8   u32      per-move time limit in milliseconds
+    12  i32      X clock in milliseconds (-1: no game clock)
+    16  i32      O clock in milliseconds (-1: no game clock)
+    20  ceil(n*n/4) bytes  board, 2 bits per cell (0 empty, 1 X, 2 O);
+                 cell i = row * n + col is bits 2*(i % 4) of byte i // 4
+    ..  m * 2 bytes  moves in order as (row, col); X moves first and the
+                 players alternate
+
+Reply: 2 bytes (row, col).
+"""
+
+import struct
+
+from time_control import DEFAULT_MOVE_TIME
+
+CONTENT_TYPE = 'application/octet-stream'
+PROTOCOLS = ('json', 'binary')
+
+MAGIC = b'GM'
+VERSION = 1
+HEADER = struct.Struct('<2sBBBBHIii')
+MOVE = struct.Struct('<BB')
+
+CELL_CODES = {' ': 0, 'X': 1, 'O': 2}
+CELL_VALUES = ' XO'
+PLAYERS = {'X': 1, 'O': 2}
+
+
+def board_bytes(board_size):
+    return (board_size * board_size + 3) // 4
+
+
+def pack_board(board):
+    """Pack a list-of-lists board at 2 bits per cell"""
+    n = len(board)
+    packed = bytearray(board_bytes(n))
+    for r, row in enumerate(board):
+        for c, cell in enumerate(row):
+            code = CELL_CODES[cell]
+            if code:
+                i = r * n + c
+                packed[i >> 2] |= code << ((i & 3) * 2)
+    return bytes(packed)
+
+
+def unpack_board(data, board_size):
+    """Unpack a 2-bit board into a list-of-lists of 'X' / 'O' / ' '"""
+    n = board_size
+    return [[CELL_VALUES[(data[(r * n + c) >> 2] >> (((r * n + c) & 3) * 2)) & 3]
+             for c in range(n)]
+            for r in range(n)]
+
+
+def _millis(seconds):
+    return -1 if seconds is None else int(seconds * 1000)
+
+
+def encode_request(game_state):
+    """Encode a game state (as sent to JSON bots) as a binary move request"""
+    board = game_state['board']
+    n = len(board)
+    moves = game_state.get('moveHistory', [])
+    clock = game_state.get('clock') or {}
+    header = HEADER.pack(MAGIC, VERSION, n, PLAYERS[game_state['currentPlayer']],
+                         1 if game_state.get('gameOver') else 0, len(moves),
+                         _millis(game_state.get('moveTimeLimit', DEFAULT_MOVE_TIME)),
+                         _millis(clock.get('X')), _millis(clock.get('O')))
+    return b''.join([header, pack_board(board)] + [MOVE.pack(row, col) for row, col, _ in moves])
+
+
+def decode_request(data):
+    """Decode a binary move request into a game-state dictionary.
+
+    Has the keys a JSON request has for bots: board, currentPlayer,
+    gameOver, moveHistory, moveTimeLimit and clock. Raises ValueError if the
+    data is not a version 1 request.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Move request too short")
+    magic, version, n, player, flags, count, move_ms, clock_x, clock_o = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a version 1 binary move request")
+    offset = HEADER.size + board_bytes(n)
+    if len(data) < offset + count * MOVE.size:
+        raise ValueError("Move request truncated")
+    moves = [list(MOVE.unpack_from(data, offset + i * MOVE.size)) + ['XO'[i % 2]]
+             for i in range(count)]
+    return {
+        'board': unpack_board(data[HEADER.size:offset], n),
+        'currentPlayer': CELL_VALUES[player],
+        'gameOver': bool(flags & 1),
+        'moveHistory': moves,
+        'moveTimeLimit': move_ms / 1000,
+        'clock': None if clock_x < 0 else {'X': clock_x / 1000, 'O': clock_o / 1000},
+    }
+
+
+def encode_move(row, col):
+    """Encode a bot's reply"""
+    return MOVE.pack(row, col)
+
+
+def decode_move(data):
+    """Decode a bot's reply into {'row': r, 'col': c}"""
+    if len(data) != MOVE.size:
+        raise ValueError("Move reply must be 2 bytes")
+    row, col = MOVE.unpack(data)
+    return {'row': row, 'col': col}
+
+
+def negotiate(bot_info):
+    """Protocol to use with a bot: the one it asked for if supported, else JSON"""
+    protocol = (bot_info or {}).get('protocol', 'json')
+    return protocol if protocol in PROTOCOLS else 'json'
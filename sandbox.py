@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+In-process execution of submitted Python bot code.
+A bot registered with "code" in its bot_info instead of a host and port is
+run by the server itself: a pool of pre-forked worker processes executes
+the code once per move, with a CPU-time and memory limit, and keeps each
+bot's compiled code so warm workers only pay for the bot's own thinking.
+
+Bot code sees the same variables as the web bots (gameState, board,
+currentPlayer, gameOver, winner, moveHistory) and sets `move` to
+{'row': r, 'col': c} or (r, c). It may import only the modules in
+ALLOWED_MODULES and gets a reduced set of builtins (no open, exec or
+input). Python-level restrictions can be escaped, so on Linux each worker
+is also isolated by the OS where the server's privileges allow: its own
+network namespace (no network), user nobody instead of root, and no new
+processes or file writes. Even so, the server only accepts code bots when
+started with --allow-code-bots.
+"""
+
+import builtins
+import hashlib
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+from collections import OrderedDict
+
+from time_control import DEFAULT_MOVE_TIME
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+# CPU seconds a bot may use per move (capped further by the move's time budget)
+DEFAULT_CPU_LIMIT = DEFAULT_MOVE_TIME
+# Megabytes a worker may allocate on top of its own footprint
+DEFAULT_MEMORY_LIMIT = 256
+# Extra wall-clock seconds for IPC before a worker that has not answered is killed
+GRACE = 1.0
+# Compiled bots kept per worker
+CODE_CACHE_SIZE = 64
+# User a worker switches to when the server runs as root
+SANDBOX_USER = 'nobody'
+# unshare(2) flags, for Pythons without os.unshare (added in 3.12)
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+
+ALLOWED_MODULES = frozenset(['math', 'random', 'itertools', 'collections', 'functools',
+                             'heapq', 'bisect', 'time', 'copy', 're', 'operator'])
+BLOCKED_BUILTINS = frozenset(['open', 'exec', 'eval', 'compile', 'input', 'breakpoint',
+                              'help', 'exit', 'quit', 'globals', 'vars', 'memoryview'])
+
+
+class SandboxError(RuntimeError):
+    """Bot code failed, broke a limit or returned no usable move"""
+
+
+class SandboxTimeout(SandboxError):
+    """Bot code ran out of CPU time or did not answer in time"""
+
+
+class CPULimitExceeded(Exception):
+    pass
+
+
+def is_sandboxed(bot_info):
+    """True for bots run by the server from submitted code"""
+    return bool(bot_info) and bool(bot_info.get('code'))
+
+
+def code_key(code):
+    """Cache key of a bot's code"""
+    return hashlib.sha1(code.encode()).hexdigest()[:16]
+
+
+def check_code(code):
+    """Error message if code is not valid Python, else None"""
+    try:
+        compile(code, '<bot>', 'exec')
+    except (SyntaxError, ValueError) as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name.split('.')[0] not in ALLOWED_MODULES:
+        raise ImportError(f"Bots may not import {name}")
+    return __import__(name, globals, locals, fromlist, level)
+
+
+SAFE_BUILTINS = {name: value for name, value in vars(builtins).items()
+                 if name not in BLOCKED_BUILTINS and not name.startswith('_')}
+SAFE_BUILTINS['__import__'] = _import
+SAFE_BUILTINS['__build_class__'] = builtins.__build_class__
+
+
+def parse_move(move):
+    """{'row': r, 'col': c} from a bot's dict or (row, col) pair"""
+    if isinstance(move, dict):
+        move = (move.get('row'), move.get('col'))
+    if not isinstance(move, (tuple, list)) or len(move) != 2:
+        raise SandboxError("Bot did not set move to {'row': r, 'col': c} or (r, c)")
+    row, col = move
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in (row, col)):
+        raise SandboxError(f"Move coordinates must be integers, got {move!r}")
+    return {'row': row, 'col': col}
+
+
+def _limit_memory(megabytes):
+    """Cap the worker's address space at its current size plus megabytes"""
+    try:
+        import resource
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (ImportError, OSError, ValueError):
+        return  # No rlimits or /proc here: run without a memory cap
+    limit = current + megabytes * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _unshare(flags):
+    """Move this process into new namespaces; False if that is not allowed"""
+    try:
+        if hasattr(os, 'unshare'):
+            os.unshare(flags)
+            return True
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        return libc.unshare(flags) == 0
+    except (AttributeError, OSError):
+        return False
+
+
+def _isolate():
+    """Best-effort OS sandbox for a worker, each step skipped where unsupported.
+
+    Cuts the worker off the network with a network namespace (a user
+    namespace too when not root), drops root for SANDBOX_USER and forbids
+    new processes and file writes with rlimits.
+    """
+    if not sys.platform.startswith('linux'):
+        return
+    root = os.geteuid() == 0
+    _unshare(CLONE_NEWNET if root else CLONE_NEWUSER | CLONE_NEWNET)
+    if root:
+        try:
+            import pwd
+            user = pwd.getpwnam(SANDBOX_USER)
+            uid, gid = user.pw_uid, user.pw_gid
+        except (ImportError, KeyError):
+            uid = gid = 65534
+        try:
+            os.setgroups([])
+            os.setgid(gid)
+            os.setuid(uid)
+        except OSError:
+            pass  # No CAP_SETUID, e.g. in some containers
+    import resource
+    # A write past the size limit fails with EFBIG instead of killing the worker
+    signal.signal(signal.SIGXFSZ, signal.SIG_IGN)
+    for limit in (resource.RLIMIT_NPROC, resource.RLIMIT_FSIZE):
+        try:
+            resource.setrlimit(limit, (0, 0))
+        except (ValueError, OSError):
+            pass
+
+
+def _on_cpu_limit(signum, frame):
+    raise CPULimitExceeded()
+
+
+def _run_bot(cache, key, code, game_state, cpu_limit):
+    compiled = cache.get(key)
+    if compiled is None:
+        compiled = cache[key] = compile(code, f'<bot {key}>', 'exec')
+        if len(cache) > CODE_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    namespace = {
+        '__builtins__': SAFE_BUILTINS,
+        '__name__': '__bot__',
+        'gameState': game_state,
+        'board': game_state.get('board'),
+        'currentPlayer': game_state.get('currentPlayer'),
+        'gameOver': game_state.get('gameOver'),
+        'winner': game_state.get('winner'),
+        'moveHistory': game_state.get('moveHistory'),
+        'move': None,
+    }
+    # ITIMER_PROF counts user + system CPU time of this process only
+    signal.setitimer(signal.ITIMER_PROF, cpu_limit)
+    try:
+        exec(compiled, namespace)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+    return parse_move(namespace['move'])
+
+
+def _worker_main(conn, memory_limit):
+    """Worker loop: run (key, code, game_state, cpu_limit) requests until None"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is the server's to handle
+    signal.signal(signal.SIGPROF, _on_cpu_limit)
+    _limit_memory(memory_limit)
+    # Import what bots may use while the library is still readable: as
+    # nobody the worker may not be able to read a Python installed under /root
+    for name in ALLOWED_MODULES:
+        __import__(name)
+    _isolate()
+    cache = OrderedDict()  # code_key -> compiled code, least recently used first
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        try:
+            reply = ('ok', _run_bot(cache, *request))
+        except CPULimitExceeded:
+            reply = ('timeout', f"CPU limit of {request[3]:g}s exceeded")
+        except MemoryError:
+            reply = ('error', "Memory limit exceeded")
+        except BaseException as e:  # Including SystemExit from the bot
+            reply = ('error', f"{type(e).__name__}: {e}")
+        try:
+            conn.send(reply)
+        except (EOFError, OSError):
+            return
+
+
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.moves = 0
+
+    def kill(self):
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+
+
+class SandboxPool:
+    """Pre-forked worker processes that run bot code one move at a time.
+
+    Workers are forked from a clean fork server when the pool starts (on
+    the first move unless start() is called earlier, as run_server does)
+    and reused for every move of every bot. A move may use cpu_limit
+    seconds of CPU; a worker that does not answer within the move's
+    wall-clock budget, or dies, is killed and replaced so one bad bot
+    cannot eat the pool.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, cpu_limit=DEFAULT_CPU_LIMIT,
+                 memory_limit=DEFAULT_MEMORY_LIMIT):
+        self.size = workers
+        self.cpu_limit = cpu_limit
+        self.memory_limit = memory_limit
+        self.lock = threading.Lock()
+        self.idle = queue.Queue()
+        self.workers = set()
+        self.context = None
+        self.closed = False
+        self.moves = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    def start(self):
+        """Fork the workers now instead of on the first move"""
+        with self.lock:
+            if self.context is not None or self.closed:
+                return
+            methods = multiprocessing.get_all_start_methods()
+            self.context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            if 'forkserver' in methods:
+                # Workers need only this module. __main__ is left out: the
+                # fork server would run a script that has no main guard
+                self.context.set_forkserver_preload(['sandbox', 'resource'])
+            for _ in range(self.size):
+                self.idle.put(self._spawn())
+
+    def _spawn(self):
+        conn, child_conn = self.context.Pipe()
+        process = self.context.Process(target=_worker_main, args=(child_conn, self.memory_limit),
+                                       name='bot-sandbox', daemon=True)
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, conn)
+        self.workers.add(worker)
+        return worker
+
+    def _replace(self, worker):
+        """Kill a stuck or dead worker and put a fresh one in its place"""
+        worker.kill()
+        with self.lock:
+            self.workers.discard(worker)
+            self.restarts += 1
+            if not self.closed:
+                self.idle.put(self._spawn())
+
+    def execute(self, code, game_state, timeout=None):
+        """Run bot code on game_state and return its move as {'row', 'col'}.
+
+        timeout is the move's wall-clock budget in seconds (default:
+        cpu_limit); the bot gets the smaller of it and cpu_limit in CPU
+        time. Raises SandboxError if the bot fails or breaks a limit.
+        """
+        self.start()
+        budget = self.cpu_limit if timeout is None else min(timeout, self.cpu_limit)
+        wait = budget + GRACE
+        try:
+            worker = self.idle.get(timeout=wait)
+        except queue.Empty:
+            raise SandboxError("No free sandbox worker") from None
+        try:
+            worker.conn.send((code_key(code), code, game_state, budget))
+            if not worker.conn.poll(wait):
+                self.timeouts += 1
+                self._replace(worker)
+                worker = None
+                raise SandboxTimeout(f"Bot did not answer within {wait:g}s")
+            status, result = worker.conn.recv()
+        except (EOFError, OSError):
+            self.failures += 1
+            self._replace(worker)
+            worker = None
+            raise SandboxError("Sandbox worker died") from None
+        finally:
+            if worker is not None:
+                worker.moves += 1
+                self.idle.put(worker)
+        self.moves += 1
+        if status != 'ok':
+            self.failures += 1
+            raise (SandboxTimeout if status == 'timeout' else SandboxError)(result)
+        return result
+
+    def get_stats(self):
+        """Worker and move counts as a dictionary"""
+        with self.lock:
+            workers = len(self.workers)
+        return {
+            'workers': workers,
+            'idle': self.idle.qsize(),
+            'moves': self.moves,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'restarts': self.restarts,
+            'cpuLimit': self.cpu_limit,
+            'memoryLimitMb': self.memory_limit,
+        }
+
+    def close(self):
+        """Stop every worker"""
+        with self.lock:
+            self.closed = True
+            workers = list(self.workers)
+            self.workers.clear()
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        for worker in workers:
+            worker.process.join(timeout=0.5)
+            worker.kill()
@@ -1,12 +1,30 @@
 import http.server
 import socketserver
 import json
+import gzip
+import hashlib
+import mimetypes
 import threading
 import time
 import os
+import random
+import argparse
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
 import socket
 import requests
+from zobrist import get_hasher
+from symmetry import canonical_key
+from tournament import Tournament
+from time_control import TimeControl, DEFAULT_MOVE_TIME
+from metrics import MetricsRegistry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+import protocol
+from health import HealthChecker, DEFAULT_INTERVAL as HEALTH_INTERVAL, bot_key, bot_label
+from archive import GameArchive, DEFAULT_ARCHIVE_PATH
+from sandbox import (SandboxPool, SandboxError, SandboxTimeout, is_sandboxed, check_code, DEFAULT_WORKERS as SANDBOX_WORKERS,
+                     DEFAULT_CPU_LIMIT as SANDBOX_CPU_LIMIT, DEFAULT_MEMORY_LIMIT as SANDBOX_MEMORY_LIMIT)
 
 class GomokuGame:
     def __init__(self, board_size=15):
@@ -16,24 +34,111 @@ class GomokuGame:
         self.game_over = False
         self.winner = None
         self.move_history = []
+        self.redo_stack = []  # Undone moves, most recent last; cleared by a new move
+        self.ending = None  # Winner when end_game ended the game without a move
+        self.undone_ending = None  # An undone ending, redone after the redo stack
+        self.generation = 0  # Bumped by reset_game/undo_move so clients can tell games apart
+        self.state_version = 0  # Bumped by every change; keys the serialized state cache
+        self._state_cache = None
+        self.zobrist = get_hasher(board_size)
+        self.zobrist_hash = 0  # Zobrist hash of the stones on the board
+        self.clock = None  # Seconds left per player when the match has a game clock
         
+    @classmethod
+    def from_moves(cls, moves, board_size=15):
+        """Build a game by replaying moves onto an empty board.
+        
+        Moves are (row, col) or (row, col, player); without a player X moves
+        first and the players alternate. Raises ValueError on a move to an
+        occupied or off-board cell or after the game has ended.
+        """
+        game = cls(board_size)
+        for move in moves:
+            row, col = move[0], move[1]
+            player = move[2] if len(move) > 2 else game.current_player
+            if game.game_over or not game.make_move(row, col, player):
+                raise ValueError(f"Invalid move {player} at ({row}, {col}) after {len(game.move_history)} moves")
+        return game
+    
     def make_move(self, row, col, player):
         """Make a move on the board"""
         if self.is_valid_move(row, col):
-            self.board[row][col] = player
-            self.move_history.append((row, col, player))
-            
-            if self.check_win(row, col, player):
-                self.game_over = True
-                self.winner = player
-            elif self.is_board_full():
-                self.game_over = True
-                self.winner = 'Tie'
-            else:
-                self.current_player = 'O' if player == 'X' else 'X'
+            self.redo_stack.clear()
+            self.undone_ending = None
+            self._apply_move(row, col, player)
             return True
         return False
     
+    def _apply_move(self, row, col, player):
+        """Play a valid move and update the game status"""
+        self._place_stone(row, col, player)
+        self.move_history.append((row, col, player))
+        
+        if self.check_win(row, col, player):
+            self.game_over = True
+            self.winner = player
+        elif self.is_board_full():
+            self.game_over = True
+            self.winner = 'Tie'
+        else:
+            self.current_player = 'O' if player == 'X' else 'X'
+        self.state_version += 1
+    
+    def undo_move(self):
+        """Take back the last move; returns it, or None if there is none.
+        
+        A game ended by end_game (a time loss or forfeit) has its ending
+        taken back first, as its own step: game_over and winner are
+        cleared and {'winner': winner} is returned. Otherwise the last
+        move is taken back; nothing was over before it, so game_over and
+        winner are cleared and the turn goes back to the player who moved.
+        The move goes on the redo stack.
+        """
+        if self.ending is not None:
+            self.undone_ending, self.ending = self.ending, None
+            self.game_over = False
+            self.winner = None
+            self.state_version += 1
+            return {'winner': self.undone_ending}
+        if not self.move_history:
+            return None
+        row, col, player = move = self.move_history.pop()
+        self._remove_stone(row, col, player)
+        self.redo_stack.append(move)
+        self.current_player = player
+        self.game_over = False
+        self.winner = None
+        # The history shrank, so delta clients must refetch the full state
+        self.generation += 1
+        self.state_version += 1
+        return move
+    
+    def redo_move(self):
+        """Replay the last undone move; returns it, or None if there is none.
+        
+        Once every undone move is replayed, an undone ending is restored
+        and returned as {'winner': winner}.
+        """
+        if not self.redo_stack:
+            if self.undone_ending is None:
+                return None
+            winner, self.undone_ending = self.undone_ending, None
+            self._end(winner)
+            return {'winner': winner}
+        move = self.redo_stack.pop()
+        self._apply_move(*move)
+        return move
+    
+    def _place_stone(self, row, col, player):
+        """Put a stone on the board (no rule checks)"""
+        self.board[row][col] = player
+        self.zobrist_hash ^= self.zobrist.key(row, col, player)
+    
+    def _remove_stone(self, row, col, player):
+        """Take a stone off the board (no rule checks)"""
+        self.board[row][col] = ' '
+        self.zobrist_hash ^= self.zobrist.key(row, col, player)
+    
     def is_valid_move(self, row, col):
         """Check if a move is valid"""
         return (0 <= row < self.board_size and 
@@ -82,7 +187,62 @@ class GomokuGame:
             'currentPlayer': self.current_player,
             'gameOver': self.game_over,
             'winner': self.winner,
-            'moveHistory': self.move_history
+            'moveHistory': self.move_history,
+            'generation': self.generation,
+            'moveCount': len(self.move_history),
+            'clock': self.clock
+        }
+    
+    def get_game_state_json(self, compress=False):
+        """Get the game state as encoded JSON bytes (gzip'd if compress).
+        
+        The encoding is cached until the next make_move/reset_game, so any
+        number of pollers cost one json.dumps (and one gzip) per move.
+        """
+        # Read the version first: a move landing mid-encode leaves a stale key
+        key = self.state_version
+        cache = self._state_cache
+        if cache is None or cache['version'] != key:
+            cache = {'version': key, 'json': json.dumps(self.get_game_state()).encode()}
+            self._state_cache = cache
+        if not compress:
+            return cache['json']
+        if 'gzip' not in cache:
+            cache['gzip'] = gzip.compress(cache['json'])
+        return cache['gzip']
+    
+    def canonical_key(self):
+        """(hash, transform) of the position, the same for all 8 symmetries"""
+        return canonical_key(self.move_history, self.board_size)
+    
+    def set_clock(self, clock):
+        """Set the remaining time per player ({'X': s, 'O': s} or None)"""
+        self.clock = clock
+        self.state_version += 1
+    
+    def end_game(self, winner):
+        """End the game without a move, e.g. when a player runs out of time"""
+        self.redo_stack.clear()
+        self.undone_ending = None
+        self._end(winner)
+    
+    def _end(self, winner):
+        self.ending = winner
+        self.game_over = True
+        self.winner = winner
+        self.state_version += 1
+    
+    def get_state_delta(self, since):
+        """Get the moves played after the first `since` moves plus status fields"""
+        return {
+            'currentPlayer': self.current_player,
+            'gameOver': self.game_over,
+            'winner': self.winner,
+            'moves': self.move_history[since:],
+            'since': since,
+            'generation': self.generation,
+            'moveCount': len(self.move_history),
+            'clock': self.clock
         }
     
     def reset_game(self):
@@ -92,20 +252,405 @@ class GomokuGame:
         self.game_over = False
         self.winner = None
         self.move_history = []
+        self.redo_stack = []
+        self.ending = None
+        self.undone_ending = None
+        self.generation += 1
+        self.state_version += 1
+        self.zobrist_hash = 0
+        self.clock = None
 
-class GameServer:
-    def __init__(self, port=8080):
-        self.port = port
-        self.game = GomokuGame()
+class BitboardGomokuGame(GomokuGame):
+    """GomokuGame backed by one integer bitboard per player.
+    
+    Cell (row, col) maps to bit row * (board_size + 1) + col. The extra
+    column per row is never set, so whole-board shifts cannot wrap a line
+    from one row onto the next. Win checks only look at the 9-cell segment
+    through the last move in each direction, and fullness is a stone counter,
+    so make_move costs the same on a 15x15 or a 25x25 board.
+    """
+    
+    # Line masks depend only on board size, so share them between games
+    _line_mask_cache = {}
+    
+    def __init__(self, board_size=15):
+        super().__init__(board_size)
+        self.stride = board_size + 1
+        self.line_masks = self._get_line_masks(board_size)
+        self.bitboards = {'X': 0, 'O': 0}
+        self.stone_count = 0
+    
+    @classmethod
+    def _get_line_masks(cls, board_size):
+        """Precompute (shift, mask) pairs for every cell and direction"""
+        if board_size not in cls._line_mask_cache:
+            stride = board_size + 1
+            # Shifting right by `shift` moves the next cell of the line onto this one
+            directions = [(0, 1, 1), (1, 0, stride), (1, 1, stride + 1), (1, -1, stride - 1)]
+            masks = {}
+            for row in range(board_size):
+                for col in range(board_size):
+                    cell_masks = []
+                    for dr, dc, shift in directions:
+                        mask = 0
+                        for step in range(-4, 5):
+                            r, c = row + dr * step, col + dc * step
+                            if 0 <= r < board_size and 0 <= c < board_size:
+                                mask |= 1 << (r * stride + c)
+                        cell_masks.append((shift, mask))
+                    masks[row * stride + col] = tuple(cell_masks)
+            cls._line_mask_cache[board_size] = masks
+        return cls._line_mask_cache[board_size]
+    
+    def _place_stone(self, row, col, player):
+        """Put a stone on the board and in the player's bitboard"""
+        super()._place_stone(row, col, player)
+        self.bitboards[player] |= 1 << (row * self.stride + col)
+        self.stone_count += 1
+    
+    def _remove_stone(self, row, col, player):
+        """Take a stone off the board and out of the player's bitboard"""
+        super()._remove_stone(row, col, player)
+        self.bitboards[player] &= ~(1 << (row * self.stride + col))
+        self.stone_count -= 1
+    
+    def is_valid_move(self, row, col):
+        """Check if a move is valid"""
+        if not (0 <= row < self.board_size and 0 <= col < self.board_size):
+            return False
+        occupied = self.bitboards['X'] | self.bitboards['O']
+        return not (occupied >> (row * self.stride + col)) & 1
+    
+    def check_win(self, row, col, player):
+        """Check if the last move resulted in a win"""
+        bits = self.bitboards[player]
+        for shift, mask in self.line_masks[row * self.stride + col]:
+            line = bits & mask
+            line &= line >> shift
+            line &= line >> (2 * shift)
+            # Pairs overlap after the first two steps, so one more shift covers 5 cells
+            if line & (line >> shift):
+                return True
+        return False
+    
+    def is_board_full(self):
+        """Check if the board is full"""
+        return self.stone_count >= self.board_size * self.board_size
+    
+    def reset_game(self):
+        """Reset the game to initial state"""
+        super().reset_game()
+        self.bitboards = {'X': 0, 'O': 0}
+        self.stone_count = 0
+
+# Board engines selectable by name (GameServer, run_server)
+GAME_ENGINES = {
+    'list': GomokuGame,
+    'bitboard': BitboardGomokuGame,
+}
+
+def random_valid_move(game, rng=random):
+    """Pick a random empty cell, or None if the board is full"""
+    valid_moves = [(i, j)
+                   for i in range(game.board_size)
+                   for j in range(game.board_size)
+                   if game.is_valid_move(i, j)]
+    return rng.choice(valid_moves) if valid_moves else None
+
+# Random moves that open each game of `server.py --batch`
+BATCH_OPENING_PLIES = 4
+
+class MatchRunner:
+    """Play bots against each other in-process with no HTTP and no delays.
+    
+    A bot is any callable taking (board, current_player) and returning a
+    (row, col) tuple or a {'row': .., 'col': ..} dict, e.g.
+    client_python.GomokuBot(...).get_move. Invalid moves and bot exceptions
+    fall back to a random move, just like GameServer.run_game.
+    
+    The first opening_plies moves of each game are random cells near the
+    center, drawn from the rng seeded with seed, so deterministic bots
+    still play a different game each time and a seed replays the batch.
+    """
+    
+    # Opening moves are drawn from cells at most this far from the center
+    OPENING_RADIUS = 3
+    
+    def __init__(self, bot_x, bot_o, engine='bitboard', board_size=15,
+                 names=None, output_path=None, seed=None, opening_plies=0):
+        self.bots = {'X': bot_x, 'O': bot_o}
+        self.names = names or {
+            'X': getattr(bot_x, '__qualname__', 'X'),
+            'O': getattr(bot_o, '__qualname__', 'O'),
+        }
+        self.game_class = GAME_ENGINES[engine]
+        self.board_size = board_size
+        self.output_path = output_path
+        self.rng = random.Random(seed)
+        self.opening_plies = opening_plies
+    
+    def opening_move(self, game):
+        """A random empty cell near the center"""
+        center, radius = game.board_size // 2, self.OPENING_RADIUS
+        cells = [(row, col)
+                 for row in range(max(0, center - radius), min(game.board_size, center + radius + 1))
+                 for col in range(max(0, center - radius), min(game.board_size, center + radius + 1))
+                 if game.is_valid_move(row, col)]
+        return self.rng.choice(cells) if cells else random_valid_move(game, self.rng)
+    
+    def play_game(self, swap_colors=False):
+        """Play one game to the end and return its result record"""
+        bots, names = self.bots, self.names
+        if swap_colors:
+            bots = {'X': bots['O'], 'O': bots['X']}
+            names = {'X': names['O'], 'O': names['X']}
+        
+        game = self.game_class(self.board_size)
+        invalid_moves = {'X': 0, 'O': 0}
+        start = time.perf_counter()
+        while not game.game_over:
+            player = game.current_player
+            if len(game.move_history) < self.opening_plies:
+                game.make_move(*self.opening_move(game), player)
+                continue
+            try:
+                # Bots may scribble on the board while thinking, so give them a copy
+                move = bots[player]([row[:] for row in game.board], player)
+                if isinstance(move, dict):
+                    move = (move['row'], move['col'])
+                ok = game.make_move(move[0], move[1], player)
+            except Exception:
+                ok = False
+            if not ok:
+                invalid_moves[player] += 1
+                row, col = random_valid_move(game, self.rng)
+                game.make_move(row, col, player)
+        
+        return {
+            'X': names['X'],
+            'O': names['O'],
+            'winner': game.winner,
+            'moves': len(game.move_history),
+            'moveHistory': game.move_history,
+            'invalidMoves': invalid_moves,
+            'durationMs': round((time.perf_counter() - start) * 1000, 3),
+        }
+    
+    def run(self, num_games, swap_colors=True):
+        """Play num_games back-to-back, alternating colors if swap_colors.
+        
+        Results are returned and, if output_path is set, appended to it as
+        one JSON object per line.
+        """
+        results = []
+        out = open(self.output_path, 'a') if self.output_path else None
+        try:
+            for i in range(num_games):
+                result = self.play_game(swap_colors=swap_colors and i % 2 == 1)
+                result['game'] = i
+                results.append(result)
+                if out:
+                    out.write(json.dumps(result) + '\n')
+        finally:
+            if out:
+                out.close()
+        return results
+
+class BotConnection:
+    """Keep-alive connection pool to one bot endpoint.
+    
+    Created when a bot registers and reused for every move, so each turn
+    rides an already-open TCP connection instead of paying for a fresh
+    connect/teardown (and leaving a TIME_WAIT socket behind).
+    """
+    
+    def __init__(self, host, port, pool_size=4):
+        self.base_url = f"http://{host}:{port}"
+        self.session = requests.Session()
+        self.adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', self.adapter)
+        self.requests_sent = 0
+        self.errors = 0
+    
+    def post(self, path, **kwargs):
+        """POST to the bot, counting requests and failures"""
+        self.requests_sent += 1
+        try:
+            return self.session.post(self.base_url + path, **kwargs)
+        except Exception:
+            self.errors += 1
+            raise
+    
+    def get(self, path, **kwargs):
+        """GET from the bot (health checks; not counted as move requests)"""
+        return self.session.get(self.base_url + path, **kwargs)
+    
+    def get_stats(self):
+        """Get request counts and urllib3 pool counters as a dictionary"""
+        connections_opened = 0
+        pooled_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections_opened += pool.num_connections
+                pooled_requests += pool.num_requests
+        return {
+            'url': self.base_url,
+            'requests': self.requests_sent,
+            'errors': self.errors,
+            'connectionsOpened': connections_opened,
+            'connectionsReused': max(0, pooled_requests - connections_opened),
+        }
+    
+    def close(self):
+        self.session.close()
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# Browsers revalidate with If-None-Match each time, so UI edits show up at once
+STATIC_CACHE_CONTROL = 'no-cache'
+
+class StaticAssetCache:
+    """In-memory copies of the web UI files with ETags and gzip'd variants.
+    
+    Everything under `root` is loaded at startup. A file is re-read only when
+    its mtime changes, and mtimes are checked at most every check_interval
+    seconds, so a page load normally touches no disk at all.
+    """
+    
+    # Smaller files are not worth the gzip header overhead
+    MIN_GZIP_SIZE = 256
+    
+    def __init__(self, root=STATIC_DIR, check_interval=2.0):
+        self.root = os.path.realpath(root)
+        self.check_interval = check_interval
+        self.assets = {}  # absolute path -> asset dict
+        self.lock = threading.Lock()
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                self.get(os.path.relpath(os.path.join(directory, filename), self.root))
+    
+    def get(self, relative_path):
+        """Get the asset dict for a path under root, or None if there is no such file"""
+        path = os.path.realpath(os.path.join(self.root, relative_path))
+        if not path.startswith(self.root + os.sep):
+            return None  # Refuse ../ escapes
+        
+        now = time.monotonic()
+        asset = self.assets.get(path)
+        if asset is not None and now - asset['checked'] < self.check_interval:
+            return asset
+        
+        with self.lock:
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                self.assets.pop(path, None)
+                return None
+            asset = self.assets.get(path)
+            if asset is None or asset['mtime'] != mtime:
+                try:
+                    asset = self.load(path, mtime)
+                except OSError:
+                    return None
+                self.assets[path] = asset
+            asset['checked'] = now
+            return asset
+    
+    def load(self, path, mtime):
+        """Read a file and precompute its ETag and gzip'd body"""
+        with open(path, 'rb') as f:
+            content = f.read()
+        content_type = mimetypes.guess_type(path)[0] or 'text/plain'
+        compressible = content_type.startswith('text/') or content_type in (
+            'application/javascript', 'application/json', 'image/svg+xml')
+        return {
+            'content': content,
+            'gzip': gzip.compress(content) if compressible and len(content) >= self.MIN_GZIP_SIZE else None,
+            'content_type': content_type,
+            'etag': '"' + hashlib.sha1(content).hexdigest()[:20] + '"',
+            'mtime': mtime,
+            'checked': 0,
+        }
+
+# Upper bound for ?wait= on long-poll game-state requests
+MAX_LONG_POLL_SECONDS = 30
+# Idle Server-Sent Event streams get a comment line this often
+SSE_HEARTBEAT_SECONDS = 15
+# Long-polls and event streams open at once, each on its own thread
+MAX_STREAMS = 256
+
+# Match ID used by the legacy single-game endpoints (/api/game-state etc.)
+DEFAULT_MATCH_ID = 'default'
+
+class Match:
+    """One game with its own pair of bots and its own game loop thread"""
+    
+    def __init__(self, match_id, game_server, engine='bitboard', verbose=False, time_control=None):
+        self.match_id = match_id
+        self.game_server = game_server
+        self.game = GAME_ENGINES[engine]()
         self.connected_bots = {'X': None, 'O': None}  # Store bot info
         self.game_thread = None
         self.running = False
+        self.status = 'waiting'  # waiting -> queued -> playing -> finished/stopped
+        self.verbose = verbose  # Print the board after every move
+        self.time_control = time_control or TimeControl()
+        self.start_lock = threading.Lock()  # Concurrent /start requests must not both start
+        # Set to end the current run; every start gets a fresh one, so a game
+        # thread that outlives stop() can tell it no longer owns the game
+        self.stop_event = threading.Event()
+        self.move_lock = threading.Lock()  # Held by the game thread while it changes the game
+        self.changed = threading.Condition()  # Notified after every move and reset
+        self.move_latencies = []  # Seconds each bot took per move (None: not asked)
+        self.archive_id = None  # ID in the game archive once the game is archived
+    
+    def notify_change(self):
+        """Wake up long-poll and event-stream requests waiting on this match"""
+        with self.changed:
+            self.changed.notify_all()
+    
+    def wait_for_change(self, generation, move_count, timeout):
+        """Block until the game differs from (generation, move_count) or timeout.
         
+        Returns True if it changed.
+        """
+        def changed():
+            return (self.game.generation != generation or
+                    len(self.game.move_history) != move_count or
+                    self.game_server.closing.is_set())
+        
+        with self.changed:
+            return self.changed.wait_for(changed, timeout=timeout)
+    
+    def get_state_since(self, since, generation):
+        """Get only the moves after `since`, or the full state flagged with
+        'full': True if the client is looking at a different (reset) game.
+        """
+        game = self.game
+        if generation != game.generation or not 0 <= since <= len(game.move_history):
+            state = game.get_game_state()
+            state['full'] = True
+        else:
+            state = game.get_state_delta(since)
+            state['full'] = False
+        return state
+    
+    def log(self, message):
+        """Print a message tagged with the match ID (untagged for the default match)"""
+        if self.match_id == DEFAULT_MATCH_ID:
+            print(message)
+        else:
+            print(f"[{self.match_id}] {message}")
+    
     def register_bot(self, player, bot_info):
         """Register a bot for a player"""
         if player in ['X', 'O']:
             self.connected_bots[player] = bot_info
-            print(f"🤖 Bot registered for player {player}: {bot_info}")
+            if not is_sandboxed(bot_info):
+                self.game_server.get_bot_connection(bot_info)
+            self.game_server.health.submit(bot_info)  # Pre-flight ping
+            self.log(f"🤖 Bot registered for player {player}: {bot_info}")
             return True
         return False
     
@@ -113,88 +658,184 @@ class GameServer:
         """Unregister a bot"""
         if player in ['X', 'O']:
             self.connected_bots[player] = None
-            print(f"🤖 Bot unregistered for player {player}")
+            self.log(f"🤖 Bot unregistered for player {player}")
     
-    def start_game(self):
+    def has_bots(self):
+        """Check if both players have a bot"""
+        return bool(self.connected_bots['X'] and self.connected_bots['O'])
+    
+    def start(self):
         """Start the game if both bots are connected"""
-        if self.connected_bots['X'] and self.connected_bots['O']:
-            self.game.reset_game()
+        with self.start_lock:
+            return self._start()
+    
+    def _start(self):
+        if self.running:
+            self.log("❌ Game is already running")
+            return False
+        if self.has_bots():
+            self.stop_event = stop_event = threading.Event()
+            with self.move_lock:
+                self.game.reset_game()
+                self.game.set_clock(self.time_control.new_clock())
+                self.move_latencies = []
+                self.archive_id = None
+            self.notify_change()
             self.running = True
-            self.game_thread = threading.Thread(target=self.run_game)
+            self.status = 'queued'
+            self.game_thread = threading.Thread(target=self.run_game, args=(stop_event,))
             self.game_thread.daemon = True
             self.game_thread.start()
-            print("🎮 Game started! Bots are playing...")
+            self.log("🎮 Game started! Bots are playing...")
             return True
         else:
-            print("❌ Need both bots connected to start game")
+            self.log("❌ Need both bots connected to start game")
             return False
     
-    def stop_game(self):
+    def stop(self):
         """Stop the game"""
         self.running = False
-        if self.game_thread:
+        self.stop_event.set()
+        if self.game_thread and self.game_thread is not threading.current_thread():
             self.game_thread.join(timeout=1)
+        if self.status in ('queued', 'playing'):
+            self.status = 'stopped'
+    
+    def reset(self):
+        """Stop the game and clear the board"""
+        self.stop()
+        with self.move_lock:
+            self.game.reset_game()
+        self.notify_change()
+        self.status = 'waiting'
+    
+    def step(self, backward):
+        """Undo (backward) or redo one move for analysis of a game that is not running.
+        
+        Returns the move (or {'winner': w} for a time loss or forfeit), or
+        None if the game is running or there is nothing to step over.
+        """
+        if self.running:
+            return None
+        move = self.game.undo_move() if backward else self.game.redo_move()
+        if move:
+            self.notify_change()
+        return move
     
-    def run_game(self):
-        """Run the game loop - get moves from connected bots"""
-        while self.running and not self.game.game_over:
+    def run_game(self, stop_event):
+        """Run the game loop once a slot under the concurrency cap is free.
+        
+        stop_event is this run's token: once it is set (by stop()) the loop
+        ends and leaves the match alone, even if a new game has started.
+        """
+        slots = self.game_server.game_slots
+        while not stop_event.is_set() and not slots.acquire(timeout=0.5):
+            pass
+        if stop_event.is_set():
+            return
+        try:
+            self.status = 'playing'
+            self.play(stop_event)
+            # Archived while the match still counts as running, so nothing
+            # can reset or restart it under the archive write
+            if self.game.game_over and not stop_event.is_set():
+                self.status = 'finished'
+                self.log(f"🏁 Game over! Winner: {self.game.winner}")
+                self.archive_id = self.game_server.archive_game(self)
+        finally:
+            slots.release()
+            with self.move_lock:
+                if self.stop_event is stop_event:
+                    self.running = False
+    
+    def play(self, stop_event=None):
+        """Get moves from the connected bots until the game ends or is stopped"""
+        stop_event = stop_event or self.stop_event
+        time_control = self.time_control
+        # Ping both bots before the first move; dead bots get random moves
+        # without waiting for a timeout until a later ping finds them alive
+        bots = [self.connected_bots['X'], self.connected_bots['O']]
+        for bot_info, result in zip(bots, self.game_server.health.check(bots)):
+            if not result['alive']:
+                self.log(f"💀 Bot {bot_label(bot_info)} is not reachable ({result['error']})")
+        while not stop_event.is_set() and not self.game.game_over:
             current_player = self.game.current_player
             bot_info = self.connected_bots[current_player]
+            moves_before = len(self.game.move_history)
+            elapsed = None
             
             if bot_info:
                 try:
-                    # Get move from bot via HTTP API
-                    move = self.get_bot_move(bot_info, self.game.get_game_state())
-                    if move and self.game.make_move(move['row'], move['col'], current_player):
-                        print(f"Player {current_player} moved to ({move['row']}, {move['col']})")
-                        self.display_board()
-                    else:
-                        print(f"Invalid move by player {current_player}")
+                    # Get move from bot via HTTP API; the state tells it how long it has
+                    budget = time_control.move_budget(self.game.clock, current_player)
+                    state = self.game.get_game_state()
+                    state['timeControl'] = time_control.to_dict()
+                    state['moveTimeLimit'] = budget
+                    start = time.perf_counter()
+                    move = self.game_server.get_bot_move(bot_info, state, timeout=budget)
+                    elapsed = time.perf_counter() - start
+                    with self.move_lock:
+                        if stop_event.is_set():
+                            break  # Stopped while the bot was thinking
+                        if not self.charge_clock(current_player, elapsed):
+                            break
+                        if move and self.game.make_move(move['row'], move['col'], current_player):
+                            self.notify_change()
+                            self.log(f"Player {current_player} moved to ({move['row']}, {move['col']})")
+                            if self.verbose:
+                                self.display_board()
+                        else:
+                            self.log(f"Invalid move by player {current_player}")
+                            if move:
+                                self.game_server.bot_invalid_moves.inc(bot=bot_label(bot_info))
+                            # Make a random valid move as fallback
+                            self.make_random_move(current_player)
+                except Exception as e:
+                    self.log(f"Bot error for player {current_player}: {e}")
+                    self.game_server.bot_invalid_moves.inc(bot=bot_label(bot_info))
+                    with self.move_lock:
+                        if stop_event.is_set():
+                            break
                         # Make a random valid move as fallback
                         self.make_random_move(current_player)
-                except Exception as e:
-                    print(f"Bot error for player {current_player}: {e}")
-                    # Make a random valid move as fallback
-                    self.make_random_move(current_player)
+            if len(self.game.move_history) > moves_before:
+                self.move_latencies.append(elapsed)
             
-            time.sleep(1)  # Delay between moves
-        
-        if self.game.game_over:
-            print(f"🏁 Game over! Winner: {self.game.winner}")
+            if time_control.move_delay:
+                stop_event.wait(time_control.move_delay)  # Delay between moves
     
-    def get_bot_move(self, bot_info, game_state):
-        """Get move from a connected bot"""
-        try:
-            # Send game state to bot and get move back
-            response = requests.post(
-                f"http://{bot_info['host']}:{bot_info['port']}/get_move",
-                json=game_state,
-                timeout=10
-            )
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            print(f"Error getting move from bot: {e}")
-        return None
+    def charge_clock(self, player, elapsed):
+        """Take a move's thinking time off player's game clock.
+        
+        Returns False if the player ran out of time, which ends the game.
+        """
+        clock = self.game.clock
+        if clock is None:
+            return True
+        clock = self.time_control.charge(clock, player, elapsed)
+        self.game.set_clock(clock)
+        if clock[player] > 0:
+            return True
+        winner = 'O' if player == 'X' else 'X'
+        self.game.end_game(winner)
+        self.notify_change()
+        self.log(f"⏰ Player {player} ran out of time")
+        return False
     
     def make_random_move(self, player):
         """Make a random valid move as fallback"""
-        import random
-        valid_moves = []
-        for i in range(self.game.board_size):
-            for j in range(self.game.board_size):
-                if self.game.is_valid_move(i, j):
-                    valid_moves.append((i, j))
-        
-        if valid_moves:
-            row, col = random.choice(valid_moves)
+        move = random_valid_move(self.game)
+        if move:
+            row, col = move
             self.game.make_move(row, col, player)
-            print(f"Random move for player {player}: ({row}, {col})")
+            self.game_server.random_moves.inc(bot=bot_label(self.connected_bots[player]))
+            self.notify_change()
+            self.log(f"Random move for player {player}: ({row}, {col})")
     
     def display_board(self):
         """Display the current board"""
         print("\n" + "="*50)
-        print("Current Board:")
+        print("Current Board:" if self.match_id == DEFAULT_MATCH_ID else f"Current Board ({self.match_id}):")
         print("  " + " ".join(str(i) for i in range(self.game.board_size)))
         for i, row in enumerate(self.game.board):
             print(f"{i:2d} {' '.join(cell if cell != ' ' else '.' for cell in row)}")
@@ -202,124 +843,871 @@ class GameServer:
         if self.game.game_over:
             print(f"Game over! Winner: {self.game.winner}")
         print("="*50)
+    
+    def get_status(self):
+        """Get the match status as a dictionary"""
+        return {
+            'matchId': self.match_id,
+            'status': self.status,
+            'isRunning': self.running,
+            'hasBots': self.has_bots(),
+            'bots': self.connected_bots,
+            'moves': len(self.game.move_history),
+            'winner': self.game.winner,
+            'timeControl': self.time_control.to_dict(),
+            'clock': self.game.clock,
+        }
+
+class GameServer:
+    """Registry of matches keyed by match ID plus the shared bot plumbing.
+    
+    The legacy single-game API (game, connected_bots, start_game, ...) acts
+    on the match with ID DEFAULT_MATCH_ID.
+    """
+    
+    def __init__(self, port=8080, engine='bitboard', max_concurrent_games=16, time_control=None,
+                 archive_path=None, sandbox_workers=SANDBOX_WORKERS, allow_code_bots=False):
+        self.port = port
+        self.engine = engine
+        self.time_control = time_control or TimeControl()  # For new matches
+        self.matches = {}
+        self.matches_lock = threading.Lock()
+        # Matches started beyond the cap wait in 'queued' until a slot frees up
+        self.game_slots = threading.BoundedSemaphore(max_concurrent_games)
+        # Keep-alive pools keyed by bot address, shared by every match the bot plays in
+        self.bot_connections = {}
+        self.bot_connections_lock = threading.Lock()
+        self.closing = threading.Event()  # Set on shutdown to end event streams
+        self.static_assets = StaticAssetCache()
+        self.metrics = MetricsRegistry()
+        self.bot_move_seconds = self.metrics.histogram(
+            'gomoku_bot_move_seconds', 'Time for a bot to answer a move request', ['bot'])
+        self.bot_timeouts = self.metrics.counter(
+            'gomoku_bot_move_timeouts_total', 'Move requests that timed out', ['bot'])
+        self.bot_errors = self.metrics.counter(
+            'gomoku_bot_move_errors_total', 'Move requests that failed or returned an error status', ['bot'])
+        self.bot_invalid_moves = self.metrics.counter(
+            'gomoku_bot_invalid_moves_total', 'Moves rejected as invalid or malformed', ['bot'])
+        self.random_moves = self.metrics.counter(
+            'gomoku_random_moves_total', 'Random fallback moves played for a bot', ['bot'])
+        self.http_request_seconds = self.metrics.histogram(
+            'gomoku_http_request_seconds', 'Time to answer API requests', ['method', 'path'])
+        self.http_requests = self.metrics.counter(
+            'gomoku_http_requests_total', 'API requests by response status', ['method', 'path', 'status'])
+        self.bot_ping_seconds = self.metrics.histogram(
+            'gomoku_bot_ping_seconds', 'Round-trip time of bot health checks', ['bot'])
+        self.bot_ping_failures = self.metrics.counter(
+            'gomoku_bot_ping_failures_total', 'Bot health checks that got no answer', ['bot'])
+        self.health = HealthChecker(self)
+        # Finished games are appended here when an archive path is given
+        self.archive = GameArchive(archive_path) if archive_path else None
+        # Runs bots registered with code instead of an address; forks on first
+        # use. The HTTP API only accepts such bots with allow_code_bots
+        self.sandbox = SandboxPool(workers=sandbox_workers)
+        self.allow_code_bots = allow_code_bots
+        self.tournament = Tournament(self)
+        self.default_match = self.create_match(DEFAULT_MATCH_ID, verbose=True)
+    
+    @property
+    def game(self):
+        return self.default_match.game
+    
+    @property
+    def connected_bots(self):
+        return self.default_match.connected_bots
+    
+    @property
+    def running(self):
+        return self.default_match.running
+    
+    def create_match(self, match_id=None, verbose=False):
+        """Create a new match and return it, or None if the ID is taken"""
+        with self.matches_lock:
+            if match_id is None:
+                match_id = uuid.uuid4().hex[:8]
+            if match_id in self.matches:
+                return None
+            match = Match(match_id, self, engine=self.engine, verbose=verbose,
+                          time_control=TimeControl.from_dict({}, default=self.time_control))
+            self.matches[match_id] = match
+            return match
+    
+    def close(self):
+        """Stop all matches and release long-lived requests before shutdown"""
+        self.closing.set()
+        self.tournament.stop()
+        self.health.close()
+        self.sandbox.close()
+        for match in list(self.matches.values()):
+            match.stop()
+            match.notify_change()
+        if self.archive:
+            self.archive.close()
+    
+    def get_match(self, match_id):
+        """Look up a match by ID"""
+        return self.matches.get(match_id)
+    
+    def remove_match(self, match_id):
+        """Stop and forget a match (the default match cannot be removed)"""
+        if match_id == DEFAULT_MATCH_ID:
+            return False
+        with self.matches_lock:
+            match = self.matches.pop(match_id, None)
+        if match:
+            match.stop()
+            return True
+        return False
+    
+    def register_bot(self, player, bot_info):
+        """Register a bot for a player"""
+        return self.default_match.register_bot(player, bot_info)
+    
+    def unregister_bot(self, player):
+        """Unregister a bot"""
+        self.default_match.unregister_bot(player)
+    
+    def start_game(self):
+        """Start the game if both bots are connected"""
+        return self.default_match.start()
+    
+    def stop_game(self):
+        """Stop the game"""
+        self.default_match.stop()
+    
+    def get_bot_connection(self, bot_info):
+        """Get (or open) the pooled connection to a bot"""
+        key = (bot_info['host'], int(bot_info['port']))
+        with self.bot_connections_lock:
+            connection = self.bot_connections.get(key)
+            if connection is None:
+                connection = BotConnection(*key)
+                self.bot_connections[key] = connection
+            return connection
+    
+    def archive_game(self, match):
+        """Append a match's finished game to the archive; returns its ID or None"""
+        if not self.archive:
+            return None
+        game = match.game
+        return self.archive.append(bot_label(match.connected_bots['X']), bot_label(match.connected_bots['O']),
+                                   game.winner, game.move_history, board_size=game.board_size,
+                                   latencies=match.move_latencies, matchId=match.match_id,
+                                   timeControl=match.time_control.to_dict())
+    
+    def registered_bots(self):
+        """Every distinct bot registered with a match or the tournament"""
+        bots = {}
+        for match in list(self.matches.values()):
+            for bot_info in match.connected_bots.values():
+                if bot_info:
+                    bots[bot_key(bot_info)] = bot_info
+        for bot_info in list(self.tournament.bots.values()):
+            bots[bot_key(bot_info)] = bot_info
+        return list(bots.values())
+    
+    def get_bot_health(self, bot_info):
+        """bot_info with its latest health check result, for the API"""
+        if not bot_info:
+            return bot_info
+        return dict(bot_info, health=self.health.get(bot_info))
+    
+    def get_connection_stats(self):
+        """Get pool stats for every bot connection"""
+        with self.bot_connections_lock:
+            connections = list(self.bot_connections.values())
+        return [connection.get_stats() for connection in connections]
+    
+    def get_bot_move(self, bot_info, game_state, timeout=DEFAULT_MOVE_TIME):
+        """Get move from a connected bot (None if it fails or takes longer than timeout)"""
+        if is_sandboxed(bot_info):
+            return self.execute_bot(bot_info['code'], game_state, timeout=timeout, bot_info=bot_info)
+        label = bot_label(bot_info)
+        if self.health.is_dead(bot_info):
+            # Failed the pre-game check or several pings since: don't wait out the timeout
+            self.bot_errors.inc(bot=label)
+            return None
+        start = time.perf_counter()
+        binary = protocol.negotiate(bot_info) == 'binary'
+        # Not pinged while it thinks: a busy single-threaded bot cannot answer
+        with self.health.moving(bot_info):
+            try:
+                # Send game state to bot over its keep-alive pool and get move back
+                if binary:
+                    response = self.get_bot_connection(bot_info).post(
+                        "/get_move",
+                        data=protocol.encode_request(game_state),
+                        headers={'Content-Type': protocol.CONTENT_TYPE},
+                        timeout=timeout
+                    )
+                else:
+                    response = self.get_bot_connection(bot_info).post(
+                        "/get_move",
+                        json=game_state,
+                        timeout=timeout
+                    )
+                self.bot_move_seconds.observe(time.perf_counter() - start, bot=label)
+                if response.status_code == 200:
+                    return protocol.decode_move(response.content) if binary else response.json()
+                self.bot_errors.inc(bot=label)
+            except requests.exceptions.Timeout as e:
+                self.bot_timeouts.inc(bot=label)
+                print(f"Timeout getting move from bot: {e}")
+            except Exception as e:
+                self.bot_errors.inc(bot=label)
+                print(f"Error getting move from bot: {e}")
+            return None
+    
+    def execute_bot(self, bot_code, game_state, timeout=DEFAULT_MOVE_TIME, bot_info=None):
+        """Run submitted bot code in the sandbox pool and return its move.
+        
+        Returns {'row': r, 'col': c}, or None if the code fails, sets no
+        move or breaks the pool's CPU or memory limit.
+        """
+        label = bot_label(bot_info or {'code': bot_code})
+        start = time.perf_counter()
+        try:
+            move = self.sandbox.execute(bot_code, game_state, timeout=timeout)
+        except SandboxTimeout as e:
+            self.bot_timeouts.inc(bot=label)
+            print(f"Timeout running bot code for {label}: {e}")
+            return None
+        except SandboxError as e:
+            self.bot_errors.inc(bot=label)
+            print(f"Error running bot code for {label}: {e}")
+            return None
+        self.bot_move_seconds.observe(time.perf_counter() - start, bot=label)
+        return move
+    
+    def make_random_move(self, player):
+        """Make a random valid move as fallback"""
+        self.default_match.make_random_move(player)
+    
+    def display_board(self):
+        """Display the current board"""
+        self.default_match.display_board()
 
 class GameHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # /api/games/<match_id>[/<action>]
+    MATCH_PATH = re.compile(r'^/api/games/([\w-]+)(?:/([\w-]+))?$')
+    # /api/archive/<game_id>[/position]
+    ARCHIVE_PATH = re.compile(r'^/api/archive/(\d+)(?:/(position))?$')
+    # Routes that get their own request metrics label; any other /api/ path
+    # is counted as /api/other so unknown URLs cannot grow the label set
+    API_PATHS = frozenset([
+        '/api/game-state', '/api/game-events', '/api/connected-bots', '/api/game-status',
+        '/api/bot-connections', '/api/games', '/api/tournament', '/api/archive',
+        '/api/register-bot', '/api/start-game', '/api/reset-game', '/api/time-control',
+        '/api/tournament/register-bot', '/api/tournament/start', '/api/tournament/stop',
+        '/api/tournament/reset',
+    ])
+    MATCH_ACTIONS = frozenset(['status', 'state', 'events', 'bots', 'register-bot', 'start',
+                               'reset', 'delete', 'time-control', 'undo', 'redo'])
+    # Headers and body go out in separate writes; with Nagle's algorithm on,
+    # the body waits for the client's delayed ACK (~40 ms per keep-alive request)
+    disable_nagle_algorithm = True
+    
     def __init__(self, *args, game_server=None, **kwargs):
         self.game_server = game_server
         super().__init__(*args, **kwargs)
     
+    # Set once the response has been handed to a stream thread (see run_stream)
+    detached = False
+    
+    def send_response(self, code, message=None):
+        self.response_status = code  # For the request metrics
+        super().send_response(code, message)
+        if self.detached:
+            # The stream thread closes the connection when it is done
+            self.send_header('Connection', 'close')
+    
+    def finish(self):
+        # A detached response is still being written; its stream thread finishes it
+        if not self.detached:
+            super().finish()
+    
+    def run_stream(self, respond):
+        """Run respond(), a response that may block for a long time.
+        
+        On a PooledHTTPServer it runs on a dedicated stream thread, so
+        long-polls and event streams never hold one of the bounded workers;
+        above the server's max_streams the client gets a 503 instead. Other
+        servers run it inline.
+        """
+        start_stream = getattr(self.server, 'start_stream', None)
+        if start_stream is None:
+            respond()
+            return
+        start = self.request_start
+        
+        def stream():
+            try:
+                respond()
+            finally:
+                self.record_request(self.command, urlparse(self.path).path, start)
+        
+        if not start_stream(self, stream):
+            self.send_json({'error': 'Too many open streams, try again later'}, status=503)
+    
+    @classmethod
+    def metrics_path(cls, path):
+        """Path label for request metrics, with match IDs collapsed"""
+        match = cls.MATCH_PATH.match(path)
+        if match:
+            action = match.group(2)
+            if action is None:
+                return '/api/games/{id}'
+            return f'/api/games/{{id}}/{action}' if action in cls.MATCH_ACTIONS else '/api/other'
+        match = cls.ARCHIVE_PATH.match(path)
+        if match:
+            return '/api/archive/{id}' + (f'/{match.group(2)}' if match.group(2) else '')
+        return path if path in cls.API_PATHS else '/api/other'
+    
+    def record_request(self, method, path, start):
+        """Record timing for an /api/ request"""
+        if not path.startswith('/api/'):
+            return
+        path = self.metrics_path(path)
+        game_server = self.game_server
+        game_server.http_request_seconds.observe(time.perf_counter() - start, method=method, path=path)
+        game_server.http_requests.inc(method=method, path=path,
+                                      status=getattr(self, 'response_status', 0))
+    
+    def send_json(self, data, status=200):
+        """Send a JSON response"""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_json_bytes(self, body, gzipped=False):
+        """Send already-encoded (and possibly gzip'd) JSON"""
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_static(self, relative_path):
+        """Send a web UI file from the in-memory asset cache.
+        
+        Answers If-None-Match with 304 Not Modified when the ETag matches.
+        """
+        asset = self.game_server.static_assets.get(relative_path)
+        if asset is None:
+            self.send_error(404, "File not found")
+            return
+        
+        if self.headers.get('If-None-Match') == asset['etag']:
+            self.send_response(304)
+            self.send_header('ETag', asset['etag'])
+            self.send_header('Cache-Control', STATIC_CACHE_CONTROL)
+            self.end_headers()
+            return
+        
+        gzipped = asset['gzip'] is not None and self.accepts_gzip()
+        body = asset['gzip'] if gzipped else asset['content']
+        self.send_response(200)
+        self.send_header('Content-type', asset['content_type'])
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', asset['etag'])
+        self.send_header('Cache-Control', STATIC_CACHE_CONTROL)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def accepts_gzip(self):
+        """Check if the client accepts gzip'd responses"""
+        return 'gzip' in (self.headers.get('Accept-Encoding') or '')
+    
+    def read_json(self):
+        """Read a JSON request body (empty body -> {})"""
+        content_length = int(self.headers.get('Content-Length') or 0)
+        if not content_length:
+            return {}
+        return json.loads(self.rfile.read(content_length).decode())
+    
     def do_GET(self):
         """Handle GET requests"""
+        start = self.request_start = time.perf_counter()
+        self.response_status = 0
+        try:
+            self.route_get()
+        finally:
+            if not self.detached:  # Streams are timed when they end
+                self.record_request('GET', urlparse(self.path).path, start)
+    
+    def do_POST(self):
+        """Handle POST requests"""
+        start = time.perf_counter()
+        self.response_status = 0
+        try:
+            self.route_post()
+        finally:
+            self.record_request('POST', urlparse(self.path).path, start)
+    
+    def route_get(self):
+        """Dispatch a GET request"""
         parsed_path = urlparse(self.path)
         
         if parsed_path.path == '/':
             # Serve the main HTML file
-            try:
-                with open('static/index.html', 'rb') as f:
-                    content = f.read()
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html')
-                self.end_headers()
-                self.wfile.write(content)
-            except FileNotFoundError:
-                self.send_error(404, "File not found")
+            self.send_static('index.html')
         elif parsed_path.path.startswith('/static/'):
             # Serve static files
-            file_path = parsed_path.path[1:]  # Remove leading slash
-            try:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-                
-                # Determine content type based on file extension
-                if file_path.endswith('.css'):
-                    content_type = 'text/css'
-                elif file_path.endswith('.js'):
-                    content_type = 'application/javascript'
-                else:
-                    content_type = 'text/plain'
-                
-                self.send_response(200)
-                self.send_header('Content-type', content_type)
-                self.end_headers()
-                self.wfile.write(content)
-            except FileNotFoundError:
-                self.send_error(404, "File not found")
+            self.send_static(parsed_path.path[len('/static/'):])
         elif parsed_path.path == '/api/game-state':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = self.game_server.game.get_game_state()
-            self.wfile.write(json.dumps(response).encode())
+            self.send_game_state(self.game_server.default_match, parse_qs(parsed_path.query))
+        elif parsed_path.path == '/api/game-events':
+            self.send_event_stream(self.game_server.default_match)
         elif parsed_path.path == '/api/connected-bots':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                'X': self.game_server.connected_bots['X'],
-                'O': self.game_server.connected_bots['O']
-            }
-            self.wfile.write(json.dumps(response).encode())
+            self.send_json({
+                'X': self.game_server.get_bot_health(self.game_server.connected_bots['X']),
+                'O': self.game_server.get_bot_health(self.game_server.connected_bots['O'])
+            })
         elif parsed_path.path == '/api/game-status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
+            self.send_json({
                 'isRunning': self.game_server.running,
-                'hasBots': bool(self.game_server.connected_bots['X'] and self.game_server.connected_bots['O'])
-            }
-            self.wfile.write(json.dumps(response).encode())
+                'hasBots': self.game_server.default_match.has_bots()
+            })
+        elif parsed_path.path == '/api/bot-connections':
+            self.send_json({'connections': self.game_server.get_connection_stats(),
+                            'sandbox': self.game_server.sandbox.get_stats()})
+        elif parsed_path.path == '/api/games':
+            self.send_json({
+                'games': [match.get_status() for match in list(self.game_server.matches.values())]
+            })
+        elif self.MATCH_PATH.match(parsed_path.path):
+            self.handle_match_get(*self.MATCH_PATH.match(parsed_path.path).groups())
+        elif parsed_path.path == '/api/tournament':
+            self.send_json(self.game_server.tournament.get_status())
+        elif parsed_path.path == '/api/archive' or self.ARCHIVE_PATH.match(parsed_path.path):
+            self.handle_archive_get(parsed_path)
+        elif parsed_path.path == '/metrics':
+            self.send_metrics()
         else:
             super().do_GET()
     
-    def do_POST(self):
-        """Handle POST requests"""
+    def handle_match_get(self, match_id, action):
+        """Handle GET /api/games/<match_id>[/<action>]"""
+        match = self.game_server.get_match(match_id)
+        if not match:
+            self.send_json({'error': f'Unknown match {match_id}'}, status=404)
+        elif action is None or action == 'status':
+            self.send_json(match.get_status())
+        elif action == 'state':
+            self.send_game_state(match, parse_qs(urlparse(self.path).query))
+        elif action == 'events':
+            self.send_event_stream(match)
+        elif action == 'bots':
+            self.send_json(match.connected_bots)
+        else:
+            self.send_json({'error': f'Unknown action {action}'}, status=404)
+    
+    def handle_archive_get(self, parsed_path):
+        """Handle GET /api/archive[/<game_id>[/position]]"""
+        archive = self.game_server.archive
+        if archive is None:
+            self.send_json({'error': 'The game archive is not enabled'}, status=404)
+            return
+        query = {key: values[0] for key, values in parse_qs(parsed_path.query).items()}
+        path_match = self.ARCHIVE_PATH.match(parsed_path.path)
+        try:
+            if path_match is None:
+                games = archive.query(bot=query.get('bot'), winner=query.get('winner'),
+                                      since=query.get('since'), until=query.get('until'),
+                                      offset=int(query.get('offset', 0)), limit=int(query.get('limit', 100)))
+                self.send_json({'total': len(archive), 'games': games})
+            elif path_match.group(2) is None:
+                self.send_json(archive.get(int(path_match.group(1))))
+            else:
+                ply = int(query['ply']) if 'ply' in query else None
+                self.send_json(archive.position(int(path_match.group(1)), ply))
+        except KeyError:
+            self.send_json({'error': f'Unknown game {path_match.group(1)}'}, status=404)
+        except ValueError as e:
+            self.send_json({'error': str(e)}, status=400)
+    
+    def send_game_state(self, match, query):
+        """Send the game state, or only what changed if ?since= is given.
+        
+        ?since=<moveCount>&generation=<generation> returns just the newer
+        moves; adding &wait=<seconds> long-polls until there is something
+        new (or the wait runs out) before answering.
+        """
+        if 'since' not in query:
+            compress = self.accepts_gzip()
+            self.send_json_bytes(match.game.get_game_state_json(compress=compress), gzipped=compress)
+            return
+        try:
+            since = int(query['since'][0])
+            generation = int(query.get('generation', [match.game.generation])[0])
+            wait = min(float(query.get('wait', ['0'])[0]), MAX_LONG_POLL_SECONDS)
+        except ValueError:
+            self.send_json({'error': 'since, generation and wait must be numbers'}, status=400)
+            return
+        if wait <= 0 or match.wait_for_change(generation, since, 0):
+            self.send_json(match.get_state_since(since, generation))
+            return
+        
+        def respond():
+            match.wait_for_change(generation, since, wait)
+            self.send_json(match.get_state_since(since, generation))
+        self.run_stream(respond)
+    
+    def send_event_stream(self, match):
+        """Push moves as Server-Sent Events until the client disconnects.
+        
+        The first event (and one after every reset) is a 'state' event with
+        the full game state; after that each move is a 'move' event.
+        """
+        self.run_stream(lambda: self.write_event_stream(match))
+    
+    def write_event_stream(self, match):
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        if not self.detached:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        
+        generation, sent = None, 0
+        try:
+            while not self.game_server.closing.is_set():
+                game = match.game
+                moves = game.move_history
+                if game.generation != generation or len(moves) < sent:
+                    generation, sent = game.generation, len(moves)
+                    self.write_event('state', game.get_game_state())
+                elif len(moves) > sent:
+                    total = len(moves)
+                    for row, col, player in moves[sent:total]:
+                        sent += 1
+                        latest = sent == total
+                        self.write_event('move', {
+                            'row': row,
+                            'col': col,
+                            'player': player,
+                            'moveCount': sent,
+                            'generation': generation,
+                            'currentPlayer': game.current_player if latest else ('O' if player == 'X' else 'X'),
+                            'gameOver': game.game_over and latest,
+                            'winner': game.winner if latest else None
+                        })
+                else:
+                    # Comment line keeps proxies from timing out an idle stream
+                    self.wfile.write(b': keep-alive\n\n')
+                self.wfile.flush()
+                match.wait_for_change(generation, sent, SSE_HEARTBEAT_SECONDS)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
+    def send_metrics(self):
+        """Send all server metrics in the Prometheus text format"""
+        body = self.game_server.metrics.render().encode()
+        self.send_response(200)
+        self.send_header('Content-type', METRICS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def write_event(self, event, data):
+        """Write one Server-Sent Event"""
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+    
+    def route_post(self):
+        """Dispatch a POST request"""
         parsed_path = urlparse(self.path)
         
         if parsed_path.path == '/api/register-bot':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode())
-            
-            player = data.get('player')
-            bot_info = data.get('bot_info')
-            
-            if player in ['X', 'O'] and bot_info:
-                success = self.game_server.register_bot(player, bot_info)
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({'status': 'success' if success else 'error'}).encode())
-            else:
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({'error': 'Invalid player or bot info'}).encode())
+            self.handle_register_bot(self.game_server.default_match)
         
         elif parsed_path.path == '/api/start-game':
             success = self.game_server.start_game()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({'status': 'success' if success else 'error'}).encode())
+            self.send_json({'status': 'success' if success else 'error'})
         
         elif parsed_path.path == '/api/reset-game':
-            self.game_server.game.reset_game()
-            self.game_server.stop_game()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({'status': 'success'}).encode())
+            self.game_server.default_match.reset()
+            self.send_json({'status': 'success'})
+        
+        elif parsed_path.path == '/api/time-control':
+            self.handle_time_control(self.game_server.default_match)
+        
+        elif parsed_path.path == '/api/games':
+            data = self.read_json()
+            match = self.game_server.create_match(data.get('matchId'))
+            if match:
+                self.send_json({'status': 'success', 'matchId': match.match_id})
+            else:
+                self.send_json({'error': 'Match ID already in use'}, status=409)
+        
+        elif self.MATCH_PATH.match(parsed_path.path):
+            self.handle_match_post(*self.MATCH_PATH.match(parsed_path.path).groups())
+        
+        elif parsed_path.path.startswith('/api/tournament/'):
+            self.handle_tournament_post(parsed_path.path[len('/api/tournament/'):])
+        
+        else:
+            self.send_json({'error': 'Not found'}, status=404)
+    
+    def handle_match_post(self, match_id, action):
+        """Handle POST /api/games/<match_id>/<action>"""
+        match = self.game_server.get_match(match_id)
+        if not match:
+            self.send_json({'error': f'Unknown match {match_id}'}, status=404)
+        elif action == 'register-bot':
+            self.handle_register_bot(match)
+        elif action == 'start':
+            success = match.start()
+            self.send_json({'status': 'success' if success else 'error'})
+        elif action == 'reset':
+            match.reset()
+            self.send_json({'status': 'success'})
+        elif action == 'delete':
+            success = self.game_server.remove_match(match_id)
+            self.send_json({'status': 'success' if success else 'error'})
+        elif action == 'time-control':
+            self.handle_time_control(match)
+        elif action in ('undo', 'redo'):
+            self.handle_step(match, backward=action == 'undo')
+        else:
+            self.send_json({'error': f'Unknown action {action}'}, status=404)
+    
+    def handle_step(self, match, backward):
+        """Undo or redo a move of a game that is not running"""
+        if match.running:
+            self.send_json({'error': 'Game is running'}, status=409)
+            return
+        move = match.step(backward)
+        self.send_json({'status': 'success' if move else 'error',
+                        'move': move,
+                        'moveCount': len(match.game.move_history)})
+    
+    def handle_time_control(self, match):
+        """Change a match's time control; takes effect at the next start"""
+        try:
+            match.time_control = TimeControl.from_dict(self.read_json(), default=match.time_control)
+        except ValueError as e:
+            self.send_json({'error': str(e)}, status=400)
+            return
+        self.send_json({'status': 'success', 'timeControl': match.time_control.to_dict()})
+    
+    def handle_tournament_post(self, action):
+        """Handle POST /api/tournament/<action>"""
+        tournament = self.game_server.tournament
+        if action == 'register-bot':
+            data = self.read_json()
+            bot_info = data.get('bot_info')
+            if not isinstance(bot_info, dict):
+                self.send_json({'error': 'bot_info must be an object'}, status=400)
+                return
+            name = data.get('name') or bot_info.get('name')
+            error = self.code_bot_error(bot_info)
+            if error:
+                self.send_json({'error': error[0]}, status=error[1])
+            elif name and bot_info:
+                bot_info['protocol'] = protocol.negotiate(bot_info)
+                success = tournament.register(name, bot_info)
+                self.send_json({'status': 'success' if success else 'error',
+                                'protocol': bot_info['protocol']})
+            else:
+                self.send_json({'error': 'Invalid name or bot info'}, status=400)
+        elif action == 'start':
+            data = self.read_json()
+            try:
+                # Tournament games play at full speed unless asked otherwise
+                time_control = TimeControl.from_dict(data.get('timeControl', {}),
+                                                     default=TimeControl(move_delay=data.get('moveDelay', 0)))
+                success = tournament.start(format=data.get('format', 'round-robin'),
+                                           rounds=data.get('rounds'),
+                                           games_per_pairing=int(data.get('gamesPerPairing', 2)),
+                                           time_control=time_control)
+            except (TypeError, ValueError):
+                self.send_json({'error': 'rounds, gamesPerPairing and the time control must be numbers'},
+                               status=400)
+                return
+            self.send_json({'status': 'success' if success else 'error'})
+        elif action == 'stop':
+            tournament.stop()
+            self.send_json({'status': 'success'})
+        elif action == 'reset':
+            tournament.reset()
+            self.send_json({'status': 'success'})
+        else:
+            self.send_json({'error': f'Unknown action {action}'}, status=404)
+    
+    def code_bot_error(self, bot_info):
+        """(message, status) if bot_info is code the server will not run, else None"""
+        if not is_sandboxed(bot_info):
+            return None
+        if not self.game_server.allow_code_bots:
+            return 'Bots submitted as code are turned off on this server (see --allow-code-bots)', 403
+        error = check_code(bot_info['code'])
+        return (f'Invalid bot code: {error}', 400) if error else None
+    
+    def handle_register_bot(self, match):
+        """Register the bot described in the request body with a match"""
+        data = self.read_json()
+        player = data.get('player')
+        bot_info = data.get('bot_info')
+        if not isinstance(bot_info, dict):
+            self.send_json({'error': 'bot_info must be an object'}, status=400)
+            return
+        
+        error = self.code_bot_error(bot_info)
+        if error:
+            self.send_json({'error': error[0]}, status=error[1])
+        elif player in ['X', 'O'] and bot_info:
+            # Bots may ask for the binary protocol; anything else gets JSON
+            bot_info['protocol'] = protocol.negotiate(bot_info)
+            success = match.register_bot(player, bot_info)
+            self.send_json({'status': 'success' if success else 'error',
+                            'protocol': bot_info['protocol']})
+        else:
+            self.send_json({'error': 'Invalid player or bot info'}, status=400)
 
-def run_server(port=8080):
-    """Run the game server"""
-    game_server = GameServer(port)
+class PooledHTTPServer(socketserver.TCPServer):
+    """TCPServer that handles connections on a bounded pool of worker threads.
+    
+    The accept loop never blocks on a slow client; connections beyond
+    max_workers wait in the executor queue until a worker frees up.
+    Responses that wait on the game (long-polls, event streams) move off
+    the pool onto their own threads, at most max_streams at a time, so
+    spectators cannot starve the API of workers.
+    """
+    
+    allow_reuse_address = True
+    
+    def __init__(self, server_address, handler_class, max_workers=64, max_streams=MAX_STREAMS):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='http-worker')
+        self.stream_slots = threading.BoundedSemaphore(max_streams)
+        self.detached = set()  # Sockets whose response continues on a stream thread
+        self.detached_lock = threading.Lock()
+        self.open_streams = 0
+    
+    def start_stream(self, handler, respond):
+        """Finish handler's request with respond() on a new thread.
+        
+        Returns False, leaving the request on its worker, if max_streams
+        streams are already open.
+        """
+        if not self.stream_slots.acquire(blocking=False):
+            return False
+        handler.detached = True
+        handler.close_connection = True  # The worker stops reading this connection
+        with self.detached_lock:
+            self.detached.add(handler.request)
+            self.open_streams += 1
+        threading.Thread(target=self.stream_worker, args=(handler, respond),
+                         name='http-stream', daemon=True).start()
+        return True
+    
+    def stream_worker(self, handler, respond):
+        try:
+            respond()
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            pass
+        except Exception:
+            self.handle_error(handler.request, handler.client_address)
+        finally:
+            try:
+                # The handler's own finish() skips detached responses
+                socketserver.StreamRequestHandler.finish(handler)
+            except OSError:
+                pass
+            finally:
+                self.shutdown_request(handler.request)
+                with self.detached_lock:
+                    self.open_streams -= 1
+                self.stream_slots.release()
+    
+    def process_request(self, request, client_address):
+        """Hand the connection to the worker pool"""
+        self.executor.submit(self.process_request_worker, request, client_address)
     
+    def process_request_worker(self, request, client_address):
+        """Serve one connection (all its keep-alive requests) on a worker thread"""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self.detached_lock:
+                detached = request in self.detached
+                self.detached.discard(request)
+            if not detached:
+                self.shutdown_request(request)
+    
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def create_http_server(game_server, port=8080, threaded=True, max_workers=64, keep_alive_timeout=5,
+                       host="", log_requests=True, max_streams=MAX_STREAMS):
+    """HTTP server for game_server's API and web UI (not yet serving)"""
     # Create custom handler class that passes game_server to each instance
     class GameHandler(GameHTTPRequestHandler):
+        if threaded:
+            protocol_version = 'HTTP/1.1'
+            timeout = keep_alive_timeout
+        
         def __init__(self, *args, **kwargs):
             super().__init__(*args, game_server=game_server, **kwargs)
+        
+        def log_message(self, format, *args):
+            if log_requests:
+                super().log_message(format, *args)
+    
+    if threaded:
+        return PooledHTTPServer((host, port), GameHandler, max_workers=max_workers, max_streams=max_streams)
+    return socketserver.TCPServer((host, port), GameHandler)
+
+def run_server(port=8080, engine='bitboard', max_concurrent_games=16,
+               threaded=True, max_workers=64, keep_alive_timeout=5, max_streams=MAX_STREAMS, time_control=None,
+               health_interval=HEALTH_INTERVAL, archive_path=None, sandbox_workers=SANDBOX_WORKERS,
+               sandbox_cpu_limit=SANDBOX_CPU_LIMIT, sandbox_memory_limit=SANDBOX_MEMORY_LIMIT,
+               allow_code_bots=False):
+    """Run the game server.
     
-    with socketserver.TCPServer(("", port), GameHandler) as httpd:
+    With threaded=True (the default) requests are served by a pool of
+    max_workers threads using HTTP/1.1 keep-alive; idle keep-alive
+    connections are closed after keep_alive_timeout seconds so they do not
+    pin workers. Long-polls and event streams run on their own threads, up
+    to max_streams at once, instead of holding a worker. threaded=False
+    uses the old one-request-at-a-time server. time_control is the default
+    TimeControl for every match. Registered bots are pinged every
+    health_interval seconds (0 turns this off; bots are still pinged when
+    they register and when a game starts). Finished games are appended to
+    the archive at archive_path, if given. Bots registered with code are
+    only accepted with allow_code_bots; they run on sandbox_workers
+    processes, forked at startup, with sandbox_cpu_limit CPU seconds and
+    sandbox_memory_limit MB per move.
+    """
+    game_server = GameServer(port, engine=engine, max_concurrent_games=max_concurrent_games,
+                             time_control=time_control, archive_path=archive_path,
+                             sandbox_workers=sandbox_workers, allow_code_bots=allow_code_bots)
+    game_server.sandbox.cpu_limit = sandbox_cpu_limit
+    game_server.sandbox.memory_limit = sandbox_memory_limit
+    if allow_code_bots:
+        # Fork the workers now, before the first move and any request threads
+        game_server.sandbox.start()
+    if health_interval > 0:
+        game_server.health.interval = health_interval
+        game_server.health.start()
+    httpd = create_http_server(game_server, port, threaded=threaded, max_workers=max_workers,
+                               keep_alive_timeout=keep_alive_timeout, max_streams=max_streams)
+    
+    with httpd:
         print(f"🎮 Gomoku Bot Battle Server running on http://localhost:{port}")
         print("📱 Other computers can access via: http://YOUR_IP_ADDRESS:8080")
         print("🤖 Bots should connect via HTTP API")
@@ -329,6 +1717,99 @@ def run_server(port=8080):
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\n🛑 Server stopped")
+        finally:
+            game_server.close()
+
+def run_batch(num_games, output_path, engine='bitboard', strategies=('heuristic', 'heuristic'),
+              seed=None, opening_plies=BATCH_OPENING_PLIES):
+    """Play two Python bots (the reference bot by default) headlessly.
+    
+    strategies are the client_python strategies of the first and second
+    bot. Each game opens with opening_plies random moves from the rng
+    seeded with seed, so the games differ even between deterministic bots.
+    """
+    from client_python import GomokuBot
+    
+    bots, names = [], []
+    for strategy, color in zip(strategies, 'XO'):
+        bots.append(GomokuBot('localhost', strategy=strategy))
+        names.append(f'Python Bot ({color})' if strategy == 'heuristic' else f'Python {strategy} Bot ({color})')
+    runner = MatchRunner(bots[0].get_move, bots[1].get_move, engine=engine,
+                         names={'X': names[0], 'O': names[1]},
+                         output_path=output_path, seed=seed, opening_plies=opening_plies)
+    start = time.perf_counter()
+    results = runner.run(num_games)
+    elapsed = time.perf_counter() - start
+    
+    wins = {}
+    for result in results:
+        wins[result['winner']] = wins.get(result['winner'], 0) + 1
+    print(f"🏁 Played {num_games} games in {elapsed:.2f}s ({num_games / elapsed:.1f} games/s)")
+    print(f"📊 Winners: {wins} ({len({tuple(result['moveHistory']) for result in results})} distinct games)")
+    print(f"💾 Results written to {output_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Gomoku Bot Battle server")
+    parser.add_argument('--port', type=int, default=8080, help="HTTP port (default: 8080)")
+    parser.add_argument('--engine', choices=sorted(GAME_ENGINES), default='bitboard',
+                        help="board engine (default: bitboard)")
+    parser.add_argument('--max-games', type=int, default=16,
+                        help="how many matches may play at once (default: 16)")
+    parser.add_argument('--http-workers', type=int, default=64,
+                        help="worker threads serving HTTP requests (default: 64)")
+    parser.add_argument('--max-streams', type=int, default=MAX_STREAMS,
+                        help=f"long-polls and event streams open at once (default: {MAX_STREAMS})")
+    parser.add_argument('--single-threaded', action='store_true',
+                        help="serve one HTTP request at a time (no keep-alive)")
+    parser.add_argument('--move-time', type=float, default=DEFAULT_MOVE_TIME,
+                        help=f"seconds a bot may think per move (default: {DEFAULT_MOVE_TIME:g})")
+    parser.add_argument('--clock', type=float, metavar='SECONDS',
+                        help="game clock per player; a bot that runs out loses (default: none)")
+    parser.add_argument('--increment', type=float, default=0.0,
+                        help="seconds added to a player's clock after each move (default: 0)")
+    parser.add_argument('--move-delay', type=float, default=1.0,
+                        help="pause between moves for spectators, 0 for none (default: 1)")
+    parser.add_argument('--health-interval', type=float, default=HEALTH_INTERVAL,
+                        help=f"seconds between bot health checks, 0 for none (default: {HEALTH_INTERVAL:g})")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_PATH, metavar='PATH',
+                        help=f"append finished games to this archive, '' for none (default: {DEFAULT_ARCHIVE_PATH})")
+    parser.add_argument('--allow-code-bots', action='store_true',
+                        help="accept bots submitted as Python code (off by default: runs untrusted code)")
+    parser.add_argument('--sandbox-workers', type=int, default=SANDBOX_WORKERS,
+                        help=f"processes running bots submitted as code (default: {SANDBOX_WORKERS})")
+    parser.add_argument('--sandbox-cpu', type=float, default=SANDBOX_CPU_LIMIT,
+                        help=f"CPU seconds per move for bots submitted as code (default: {SANDBOX_CPU_LIMIT:g})")
+    parser.add_argument('--sandbox-memory', type=int, default=SANDBOX_MEMORY_LIMIT,
+                        help=f"MB of memory for bots submitted as code (default: {SANDBOX_MEMORY_LIMIT})")
+    parser.add_argument('--batch', type=int, metavar='N',
+                        help="play N headless games in-process and exit instead of serving")
+    parser.add_argument('--output', default='batch_results.jsonl',
+                        help="JSONL file for --batch results (default: batch_results.jsonl)")
+    parser.add_argument('--bots', nargs=2, default=['heuristic', 'heuristic'], metavar='STRATEGY',
+                        help="client_python strategies of the two --batch bots (default: heuristic heuristic)")
+    parser.add_argument('--seed', type=int, help="seed for the --batch random openings (default: random)")
+    parser.add_argument('--opening-plies', type=int, default=BATCH_OPENING_PLIES,
+                        help=f"random moves that open each --batch game (default: {BATCH_OPENING_PLIES})")
+    args = parser.parse_args()
+    
+    if args.batch:
+        from client_python import STRATEGIES
+        for strategy in args.bots:
+            if strategy not in STRATEGIES:
+                parser.error(f"--bots must be among {', '.join(STRATEGIES)}")
+        run_batch(args.batch, args.output, engine=args.engine, strategies=args.bots,
+                  seed=args.seed, opening_plies=args.opening_plies)
+    else:
+        try:
+            time_control = TimeControl(args.move_time, args.clock, args.increment, args.move_delay)
+        except ValueError as e:
+            parser.error(str(e))
+        run_server(args.port, engine=args.engine, max_concurrent_games=args.max_games,
+                   threaded=not args.single_threaded, max_workers=args.http_workers,
+                   max_streams=args.max_streams, time_control=time_control, health_interval=args.health_interval,
+                   archive_path=args.archive, sandbox_workers=args.sandbox_workers,
+                   sandbox_cpu_limit=args.sandbox_cpu, sandbox_memory_limit=args.sandbox_memory,
+                   allow_code_bots=args.allow_code_bots)
 
 if __name__ == "__main__":
-    run_server() 
\ No newline at end of file
+    main() 
\ No newline at end of file
@@ -1,5 +1,7 @@
-let gameInterval;
 let isGameRunning = false;
+let isPolling = false;
+let knownGeneration = null;
+let knownMoveCount = 0;
 
 async function startGame() {
     const response = await fetch('/api/start-game', {
@@ -26,10 +28,8 @@ async function resetGame() {
 
 async function refreshBoard() {
     try {
-        const response = await fetch('/api/game-state');
-        const gameState = await response.json();
-        displayBoard(gameState.board);
-        updateGameStatus(gameState);
+        const gameState = await fetchGameState(0);
+        applyGameState(gameState);
         
         // Stop auto-refresh if game is over
         if (gameState.gameOver && isGameRunning) {
@@ -41,6 +41,52 @@ async function refreshBoard() {
     }
 }
 
+async function fetchGameState(wait) {
+    // Once we have a board, only ask for the moves we have not seen yet
+    let url = '/api/game-state';
+    if (knownGeneration !== null) {
+        url += `?since=${knownMoveCount}&generation=${knownGeneration}&wait=${wait}`;
+    }
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`Game state request failed: ${response.status}`);
+    }
+    return response.json();
+}
+
+function applyGameState(gameState) {
+    // Full states come back on first load and whenever the game was reset
+    if (knownGeneration === null || gameState.full) {
+        displayBoard(gameState.board);
+    } else {
+        for (const [row, col, player] of gameState.moves) {
+            placeStone(row, col, player);
+        }
+    }
+    knownGeneration = gameState.generation;
+    knownMoveCount = gameState.moveCount;
+    updateGameStatus(gameState);
+}
+
+async function pollGameState() {
+    // Long-poll: the server answers as soon as a move is made (or after 25s)
+    if (isPolling) return;
+    isPolling = true;
+    while (isGameRunning) {
+        try {
+            const gameState = await fetchGameState(25);
+            applyGameState(gameState);
+            if (gameState.gameOver) {
+                isGameRunning = false;
+            }
+        } catch (error) {
+            console.error('Error polling game state:', error);
+            await new Promise(resolve => setTimeout(resolve, 1000));
+        }
+    }
+    isPolling = false;
+}
+
 async function updateBotStatus() {
     try {
         const response = await fetch('/api/connected-bots');
@@ -95,6 +141,12 @@ function displayBoard(board) {
     }
 }
 
+function placeStone(row, col, player) {
+    const cell = document.getElementById('board').children[row * 15 + col];
+    cell.textContent = player;
+    cell.classList.add(player);
+}
+
 function updateGameStatus(gameState) {
     let statusText = '';
     let statusClass = 'waiting';
@@ -120,17 +172,13 @@ function updateStatus(text, className) {
 }
 
 function startGameLoop() {
-    // Refresh immediately
-    refreshBoard();
-    // Then refresh every 500ms for smooth updates
-    gameInterval = setInterval(refreshBoard, 500);
+    // Refresh immediately, then long-poll for each new move
+    refreshBoard().then(pollGameState);
 }
 
 function stopGameLoop() {
-    if (gameInterval) {
-        clearInterval(gameInterval);
-        gameInterval = null;
-    }
+    // The long-poll loop exits once isGameRunning is false
+    isGameRunning = false;
 }
 
 // Load initial state
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Board symmetries for Gomoku.
+Maps positions to a canonical form under the 8 rotations and reflections of
+the board, so equivalent positions share one key in caches, books and
+archives, and maps moves between a board and its canonical orientation.
+Works on list-of-lists boards of 'X' / 'O' / ' ' (GomokuGame.board and the
+board bots receive) and on stone lists of (row, col, player).
+"""
+
+from zobrist import get_hasher, PLAYER_INDEX
+
+# The 8 symmetries of a square board as (row, col, n) -> (row, col)
+TRANSFORMS = [
+    lambda r, c, n: (r, c),                  # identity
+    lambda r, c, n: (c, n - 1 - r),          # rotate 90° clockwise
+    lambda r, c, n: (n - 1 - r, n - 1 - c),  # rotate 180°
+    lambda r, c, n: (n - 1 - c, r),          # rotate 270° clockwise
+    lambda r, c, n: (r, n - 1 - c),          # mirror left-right
+    lambda r, c, n: (n - 1 - r, c),          # mirror top-bottom
+    lambda r, c, n: (c, r),                  # transpose
+    lambda r, c, n: (n - 1 - c, n - 1 - r),  # anti-transpose
+]
+IDENTITY = 0
+
+# Index of the transform that undoes each one
+INVERSES = [0, 3, 2, 1, 4, 5, 6, 7]
+
+
+def transform_move(row, col, transform, board_size=15):
+    """Map a move through one of the 8 transforms"""
+    return TRANSFORMS[transform](row, col, board_size)
+
+
+def inverse_move(row, col, transform, board_size=15):
+    """Map a move back through the inverse of a transform"""
+    return TRANSFORMS[INVERSES[transform]](row, col, board_size)
+
+
+def stones_of(board):
+    """(row, col, player) for every stone on a list-of-lists board"""
+    return [(r, c, cell)
+            for r, row in enumerate(board)
+            for c, cell in enumerate(row)
+            if cell in PLAYER_INDEX]
+
+
+def transform_board(board, transform):
+    """New list-of-lists board with every stone mapped through a transform"""
+    n = len(board)
+    result = [[' ' for _ in range(n)] for _ in range(n)]
+    for row, col, player in stones_of(board):
+        r, c = TRANSFORMS[transform](row, col, n)
+        result[r][c] = player
+    return result
+
+
+def canonical_key(stones, board_size=15):
+    """Canonical Zobrist hash of a position and the transform reaching it.
+
+    stones is a list of (row, col, player) with player 'X'/'O' or 1/2.
+    The canonical orientation is the one with the smallest hash; returns
+    (hash, transform).
+    """
+    keys = get_hasher(board_size).keys
+    n = board_size
+    stones = [(row, col, PLAYER_INDEX[player]) for row, col, player in stones]
+    best = None
+    for t, transform in enumerate(TRANSFORMS):
+        h = 0
+        for row, col, player in stones:
+            r, c = transform(row, col, n)
+            h ^= keys[player][r * n + c]
+        if best is None or h < best[0]:
+            best = (h, t)
+    return best
+
+
+def canonical_board_key(board):
+    """canonical_key of a list-of-lists board"""
+    return canonical_key(stones_of(board), len(board))
+
+
+def canonical_board(board):
+    """Canonical form of a list-of-lists board: (board, transform)"""
+    _, transform = canonical_board_key(board)
+    return transform_board(board, transform), transform
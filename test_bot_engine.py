@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Test script for the Python bot's search engine
+"""
+
+from bot_engine import SearchEngine, ParallelSearch, TranspositionTable, X, O
+
+def empty_board():
+    return [[' ' for _ in range(15)] for _ in range(15)]
+
+def test_takes_win_and_blocks():
+    """Test the engine wins when it can and blocks when it must"""
+    print("🧪 Testing forced moves...")
+    
+    engine = SearchEngine(time_limit=0.5)
+    
+    # X to play can complete five on row 7
+    board = empty_board()
+    for col in range(3, 7):
+        board[7][col] = 'X'
+    board[8][3] = board[8][4] = board[9][9] = 'O'
+    assert engine.search(board, 'X') in [(7, 2), (7, 7)]
+    
+    # O to play must block X's four on the diagonal
+    board = empty_board()
+    for k in range(4):
+        board[2 + k][2 + k] = 'X'
+    board[1][1] = 'O'
+    board[10][3] = board[10][4] = 'O'
+    assert engine.search(board, 'O') == (6, 6)
+    
+    print("✅ Forced move tests passed!")
+
+def test_search_respects_time_budget():
+    """Test iterative deepening stops within the time budget"""
+    print("🧪 Testing time budget...")
+    
+    import time
+    
+    engine = SearchEngine(time_limit=0.2)
+    board = empty_board()
+    for row, col, player in [(7, 7, 'X'), (7, 8, 'O'), (8, 8, 'X'), (6, 6, 'O'),
+                             (8, 6, 'X'), (8, 7, 'O'), (9, 7, 'X'), (6, 9, 'O')]:
+        board[row][col] = player
+    start = time.perf_counter()
+    row, col = engine.search(board, 'X')
+    assert time.perf_counter() - start < 0.5
+    assert board[row][col] == ' '
+    assert engine.depth_reached >= 1
+    
+    print("✅ Time budget tests passed!")
+
+def test_incremental_evaluation():
+    """Test play/undo keeps the threat index exact"""
+    print("🧪 Testing incremental evaluation...")
+    
+    import random
+    
+    rng = random.Random(3)
+    engine = SearchEngine()
+    played = []
+    for _ in range(40):
+        idx = rng.choice([i for i, v in enumerate(engine.cells) if not v])
+        engine.play(idx, X if len(played) % 2 == 0 else O)
+        played.append(idx)
+    for idx in reversed(played[20:]):
+        engine.undo(idx)
+    
+    fresh = SearchEngine()
+    for i, idx in enumerate(played[:20]):
+        fresh.play(idx, X if i % 2 == 0 else O)
+    for attr in ('codes', 'counts', 'open_counts', 'win_cells', 'potential', 'score'):
+        assert getattr(engine.index, attr) == getattr(fresh.index, attr), attr
+    assert engine.hash == fresh.hash
+    assert engine.near == fresh.near
+    assert engine.frontier == fresh.frontier == {
+        idx for idx, count in enumerate(fresh.near) if count and not fresh.cells[idx]}
+    
+    print("✅ Incremental evaluation tests passed!")
+
+def test_threat_index():
+    """Test the threat index classifies fours and threes"""
+    print("🧪 Testing threat index...")
+    
+    engine = SearchEngine()
+    # Open three on row 7 for X: O . X X X . .
+    engine.play(7 * 15 + 3, O)
+    for col in (5, 6, 7):
+        engine.play(7 * 15 + col, X)
+    patterns = engine.index.pattern_counts(X)
+    assert patterns['open_three'] == 1 and patterns['four'] == 0
+    
+    # Closed four on column 2 for O, blocked at the top by X
+    engine.play(1 * 15 + 2, X)
+    for row in (2, 3, 4, 5):
+        engine.play(row * 15 + 2, O)
+    patterns = engine.index.pattern_counts(O)
+    assert patterns['closed_four'] == 1 and patterns['open_four'] == 0
+    assert patterns['win_cells'] == 1 and 6 * 15 + 2 in engine.index.win_cells[O]
+    
+    # Blocking the four removes the threat; taking it back restores it
+    engine.play(6 * 15 + 2, X)
+    assert engine.index.pattern_counts(O)['four'] == 0
+    assert not engine.index.win_cells[O]
+    engine.undo(6 * 15 + 2)
+    assert engine.index.win_cells[O] == {6 * 15 + 2: 1}
+    
+    print("✅ Threat index tests passed!")
+
+def test_transposition_table():
+    """Test transposition table replacement and hit counters"""
+    print("🧪 Testing transposition table...")
+    
+    tt = TranspositionTable(size_bits=4)
+    assert tt.probe(5) is None
+    tt.store(5, 3, 100, TranspositionTable.EXACT, 42)
+    assert tt.probe(5)[1:5] == (3, 100, TranspositionTable.EXACT, 42)
+    
+    # Same slot (5 + 16): a shallower result goes to the always-replace entry
+    tt.store(21, 1, 7, TranspositionTable.LOWER, 1)
+    assert tt.probe(5)[1] == 3
+    assert tt.probe(21)[1] == 1
+    
+    # A deeper one takes the depth-preferred entry
+    tt.store(37, 5, 9, TranspositionTable.UPPER, 2)
+    assert tt.probe(37)[1] == 5
+    assert tt.probe(5)[1] == 3
+    assert tt.probe(21) is None
+    
+    # Entries from an older search can be replaced by anything
+    tt.new_search()
+    tt.store(53, 0, 1, TranspositionTable.EXACT, 3)
+    assert tt.probe(53)[1] == 0
+    
+    stats = tt.stats()
+    assert stats['hits'] == 6 and stats['misses'] == 2
+    
+    # A search that revisits positions through different move orders hits the table
+    engine = SearchEngine(time_limit=30, max_depth=4)
+    board = empty_board()
+    for row, col, player in [(7, 7, 'X'), (7, 8, 'O'), (8, 8, 'X'), (6, 6, 'O')]:
+        board[row][col] = player
+    engine.search(board, 'X')
+    assert engine.tt.stats()['hits'] > 0
+    
+    print("✅ Transposition table tests passed!")
+
+def test_session_reuse():
+    """Test a continued game only plays the new moves"""
+    print("🧪 Testing session reuse...")
+    
+    engine = SearchEngine(time_limit=0.2)
+    moves = [[7, 7, 'X'], [7, 8, 'O'], [8, 8, 'X'], [6, 6, 'O']]
+    assert engine.sync_moves(moves) == 4
+    row, col = engine.search_moves(moves, 'X')
+    assert engine.pv and engine.pv[0] == row * 15 + col
+    
+    # The next request adds our move and the opponent's reply
+    moves = moves + [[row, col, 'X'], [9, 9, 'O']]
+    assert engine.sync_moves(moves) == 2
+    board = empty_board()
+    for r, c, player in moves:
+        board[r][c] = player
+    fresh = SearchEngine()
+    fresh.set_position(board)
+    assert engine.hash == fresh.hash
+    assert engine.index.score == fresh.index.score
+    
+    # A different game (after a reset) is rebuilt from scratch
+    assert engine.sync_moves([[3, 3, 'X']]) == 1
+    assert engine.stones == 1
+    
+    # So is anything after a plain board search
+    engine.search(board, 'X')
+    assert engine.sync_moves(moves) == len(moves)
+    
+    # The bot uses session mode for requests carrying moveHistory
+    from client_python import GomokuBot
+    bot = GomokuBot('localhost', strategy='search', time_limit=0.2)
+    state = {'board': board, 'currentPlayer': 'X', 'moveHistory': moves}
+    row, col = bot.get_move_for_state(state)
+    assert board[row][col] == ' '
+    assert bot.search_engine.history is not None
+    
+    # The search time follows the server's time control
+    assert bot.search_time(state) == 0.2
+    state.update(moveTimeLimit=0.1, clock={'X': 0.5, 'O': 9}, timeControl={'increment': 0})
+    assert abs(bot.search_time(state) - 0.025) < 1e-9
+    
+    print("✅ Session reuse tests passed!")
+
+def test_concurrent_requests():
+    """Test a search bot answering /get_move for several games at once"""
+    print("🧪 Testing concurrent move requests...")
+    
+    import random
+    import threading
+    import requests
+    from client_python import GomokuBot, BotHTTPServer
+    
+    bot = GomokuBot('localhost', strategy='search', time_limit=0.05, opening_book=None)
+    http_server = BotHTTPServer(('127.0.0.1', 0), bot)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{http_server.server_address[1]}/get_move"
+    errors = []
+    
+    def play(seed):
+        # Each thread plays its own game, asking the bot for X's moves
+        rng = random.Random(seed)
+        board = empty_board()
+        moves = []
+        with requests.Session() as session:
+            for _ in range(6):
+                state = {'board': board, 'currentPlayer': 'X', 'gameOver': False,
+                         'moveHistory': moves, 'moveTimeLimit': 5}
+                response = session.post(url, json=state, timeout=10)
+                move = response.json()
+                if response.status_code != 200 or board[move['row']][move['col']] != ' ':
+                    errors.append(move)
+                    return
+                board[move['row']][move['col']] = 'X'
+                moves.append([move['row'], move['col'], 'X'])
+                empty = [(r, c) for r in range(15) for c in range(15) if board[r][c] == ' ']
+                row, col = rng.choice(empty)
+                board[row][col] = 'O'
+                moves.append([row, col, 'O'])
+    
+    try:
+        threads = [threading.Thread(target=play, args=(seed,)) for seed in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+        assert errors == []
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+    
+    print("✅ Concurrent move request tests passed!")
+
+def test_parallel_search():
+    """Test the root-split search across worker processes"""
+    print("🧪 Testing parallel search...")
+    
+    search = ParallelSearch(workers=2, time_limit=0.3)
+    try:
+        # Both processes are running before the first search
+        search.start()
+        assert len(search.pool._processes) == 2
+        
+        # X to play can complete five on row 7
+        board = empty_board()
+        for col in range(3, 7):
+            board[7][col] = 'X'
+        board[8][3] = board[8][4] = board[9][9] = 'O'
+        assert search.search(board, 'X') in [(7, 2), (7, 7)]
+        
+        # An open position is split between both workers
+        moves = [[7, 7, 'X'], [7, 8, 'O'], [8, 8, 'X'], [6, 6, 'O']]
+        row, col = search.search_moves(moves, 'X')
+        assert (row, col) not in [(r, c) for r, c, _ in moves]
+        assert search.pool is not None
+        assert search.depth_reached >= 1 and search.nodes > 0
+    finally:
+        search.close()
+    
+    print("✅ Parallel search tests passed!")
+
+def test_opening_book():
+    """Test book lookups across board symmetries"""
+    print("🧪 Testing opening book...")
+    
+    import os
+    import tempfile
+    from opening_book import OpeningBook, write_book
+    from symmetry import TRANSFORMS, canonical_key
+    
+    # Book one position: X at (7, 7), O at (6, 8); reply (8, 6)
+    stones = [(7, 7, X), (6, 8, O)]
+    key, t = canonical_key(stones)
+    r, c = TRANSFORMS[t](8, 6, 15)
+    path = os.path.join(tempfile.mkdtemp(), 'book.bin')
+    write_book(path, {(key, r * 15 + c): 3, (key + 1, 0): 1}, max_plies=4)
+    
+    book = OpeningBook(path)
+    try:
+        assert len(book) == 2 and book.max_plies == 4
+        board = empty_board()
+        board[7][7], board[6][8] = 'X', 'O'
+        assert book.lookup(board) == (8, 6)
+        
+        # Every rotation and reflection of the position finds the same entry
+        for transform in TRANSFORMS:
+            board = empty_board()
+            for row, col, player in stones:
+                rr, cc = transform(row, col, 15)
+                board[rr][cc] = 'X' if player == X else 'O'
+            assert book.lookup(board) == transform(8, 6, 15)
+        
+        # Unknown positions are not in the book
+        board[0][0] = 'X'
+        assert book.lookup(board) is None
+    finally:
+        book.close()
+    
+    # The book is on by default for the search bot only; the heuristic
+    # reference bot plays the same moves as without a book
+    from client_python import GomokuBot, DEFAULT_BOOK_PATH
+    assert GomokuBot('localhost').opening_book is None
+    if os.path.exists(DEFAULT_BOOK_PATH):
+        assert GomokuBot('localhost', strategy='search').opening_book is not None
+        assert GomokuBot('localhost', opening_book=DEFAULT_BOOK_PATH).opening_book is not None
+    heuristic, plain = GomokuBot('localhost'), GomokuBot('localhost', opening_book=None)
+    board = empty_board()
+    for ply in range(8):
+        player = 'XO'[ply % 2]
+        move = heuristic.get_move([row[:] for row in board], player)
+        assert move == plain.get_move([row[:] for row in board], player)
+        assert heuristic.get_move_for_state({'board': board, 'currentPlayer': player}) == move
+        board[move[0]][move[1]] = player
+    
+    print("✅ Opening book tests passed!")
+
+def test_vector_evaluator():
+    """Test the NumPy evaluator against the threat index"""
+    print("🧪 Testing vectorized evaluation...")
+    
+    from vector_eval import HAVE_NUMPY, VectorEvaluator
+    if not HAVE_NUMPY:
+        print("⏭️  NumPy not installed, skipping")
+        return
+    
+    import random
+    
+    rng = random.Random(7)
+    evaluator = VectorEvaluator()
+    for _ in range(5):
+        engine = SearchEngine()
+        board = empty_board()
+        for i in range(30):
+            idx = rng.choice([i for i, v in enumerate(engine.cells) if not v])
+            player = X if i % 2 == 0 else O
+            engine.play(idx, player)
+            board[idx // 15][idx % 15] = 'X' if player == X else 'O'
+        evaluator.load(board)
+        potential_x, potential_o = evaluator.potentials()
+        for idx, value in enumerate(engine.cells):
+            if not value:
+                assert potential_x[idx // 15, idx % 15] == engine.index.potential[X][idx]
+                assert potential_o[idx // 15, idx % 15] == engine.index.potential[O][idx]
+    
+    # Wins come before blocks
+    board = empty_board()
+    for col in range(3, 7):
+        board[7][col] = 'X'
+    for row in range(2, 6):
+        board[row][10] = 'O'
+    assert evaluator.best_move(board, 'X') in [(7, 2), (7, 7)]
+    assert evaluator.best_move(board, 'O') in [(1, 10), (6, 10)]
+    
+    print("✅ Vectorized evaluation tests passed!")
+
+def test_search_beats_heuristic():
+    """Test the search strategy beats the heuristic bot"""
+    print("🧪 Testing search strategy against the heuristic...")
+    
+    from client_python import GomokuBot
+    from server import MatchRunner
+    
+    # A fixed depth keeps the games the same on fast and slow machines
+    search_bot = GomokuBot('localhost', strategy='search', time_limit=30)
+    search_bot.search_engine.max_depth = 3
+    heuristic_bot = GomokuBot('localhost')
+    runner = MatchRunner(search_bot.get_move, heuristic_bot.get_move,
+                         names={'X': 'search', 'O': 'heuristic'})
+    for result in runner.run(2):
+        assert result[result['winner']] == 'search'
+    
+    print("✅ Search strategy tests passed!")
+
+if __name__ == "__main__":
+    print("🎮 Running bot engine tests...")
+    print("=" * 50)
+    
+    try:
+        test_takes_win_and_blocks()
+        test_search_respects_time_budget()
+        test_incremental_evaluation()
+        test_threat_index()
+        test_transposition_table()
+        test_session_reuse()
+        test_concurrent_requests()
+        test_parallel_search()
+        test_opening_book()
+        test_vector_evaluator()
+        test_search_beats_heuristic()
+        
+        print("=" * 50)
+        print("🎉 All tests passed! The bot engine is working correctly.")
+        
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
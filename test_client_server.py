@@ -6,6 +6,7 @@ Test script to verify client-server communication
 import subprocess
 import time
 import requests
+import json
 import signal
 import sys
 
@@ -61,6 +62,97 @@ def test_client_server():
         server_process.terminate()
         server_process.wait()
 
+def test_concurrent_requests():
+    """Test that a stalled client does not block other requests"""
+    print("🧪 Testing concurrent request handling...")
+    
+    import http.client
+    import socket
+    
+    server_process = subprocess.Popen(['python3', '-c', 'from server import run_server; run_server(8083)'],
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.PIPE)
+    time.sleep(2)
+    
+    try:
+        # A client that connects and never finishes its request
+        stalled = socket.create_connection(('localhost', 8083))
+        stalled.sendall(b'GET /api/game-state HTTP/1.1\r\n')
+        
+        start = time.time()
+        response = requests.get('http://localhost:8083/api/game-state', timeout=2)
+        assert response.status_code == 200
+        assert time.time() - start < 1
+        
+        # Several requests over a single keep-alive connection
+        conn = http.client.HTTPConnection('localhost', 8083, timeout=2)
+        for _ in range(3):
+            conn.request('GET', '/api/game-status')
+            response = conn.getresponse()
+            assert response.status == 200
+            assert 'isRunning' in json.loads(response.read())
+        conn.close()
+        stalled.close()
+        
+        # Every API request is timed and counted at /metrics
+        response = requests.get('http://localhost:8083/metrics', timeout=2)
+        assert response.headers['Content-type'].startswith('text/plain')
+        assert 'gomoku_http_requests_total{method="GET",path="/api/game-status",status="200"} 3' in response.text
+        assert 'gomoku_http_request_seconds_count{method="GET",path="/api/game-status"} 3' in response.text
+        
+        print("✅ Concurrent request tests passed!")
+    finally:
+        server_process.terminate()
+        server_process.wait()
+
+def test_streams_off_pool():
+    """Test long-polls do not hold the HTTP workers and are capped"""
+    print("🧪 Testing long-poll streams...")
+    
+    import threading
+    from server import GameServer, create_http_server
+    
+    game_server = GameServer()
+    httpd = create_http_server(game_server, port=0, host='127.0.0.1', max_workers=2, max_streams=3,
+                               log_requests=False)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    poll = f"{url}/api/game-state?since=0&generation={game_server.game.generation}&wait=10"
+    
+    try:
+        # More long-polls than workers
+        results = []
+        pollers = [threading.Thread(target=lambda: results.append(requests.get(poll, timeout=15)))
+                   for _ in range(3)]
+        for poller in pollers:
+            poller.start()
+        deadline = time.time() + 5
+        while httpd.open_streams < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert httpd.open_streams == 3
+        
+        # The workers are free for other requests, and a 4th stream is refused
+        response = requests.get(f"{url}/api/game-status", timeout=2)
+        assert response.status_code == 200
+        assert requests.get(poll, timeout=2).status_code == 503
+        
+        # A move answers every long-poll
+        game_server.game.make_move(7, 7, 'X')
+        game_server.default_match.notify_change()
+        for poller in pollers:
+            poller.join(timeout=5)
+        assert [response.status_code for response in results] == [200] * 3
+        assert all(response.json()['moves'] == [[7, 7, 'X']] for response in results)
+        assert all(response.headers['Connection'] == 'close' for response in results)
+        
+        print("✅ Long-poll stream tests passed!")
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        game_server.close()
+
 if __name__ == "__main__":
+    test_concurrent_requests()
+    test_streams_off_pool()
     success = test_client_server()
     sys.exit(0 if success else 1) 
\ No newline at end of file
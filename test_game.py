@@ -3,7 +3,7 @@
 Test script for Gomoku game logic
 """
 
-from server import GomokuGame
+from server import GomokuGame, BitboardGomokuGame
 
 def test_basic_game():
     """Test basic game functionality"""
@@ -47,6 +47,876 @@ def test_win_conditions():
     
     print("✅ Win condition tests passed!")
 
+def test_bitboard_engine():
+    """Test the bitboard engine agrees with the list engine"""
+    print("🧪 Testing bitboard engine...")
+    
+    import random
+    rng = random.Random(1234)
+    for _ in range(50):
+        reference = GomokuGame()
+        game = BitboardGomokuGame()
+        cells = [(i, j) for i in range(15) for j in range(15)]
+        rng.shuffle(cells)
+        for row, col in cells:
+            player = reference.current_player
+            assert game.make_move(row, col, player) == reference.make_move(row, col, player)
+            assert game.game_over == reference.game_over
+            assert game.winner == reference.winner
+            if reference.game_over:
+                break
+        assert game.board == reference.board
+    
+    # Anti-diagonal win touching the edge of a larger board
+    game = BitboardGomokuGame(board_size=19)
+    for k in range(5):
+        assert not game.game_over
+        game.make_move(14 + k, 4 - k, 'X')
+    assert game.game_over and game.winner == 'X'
+    
+    # A row ending at the right edge must not join the next row
+    game = BitboardGomokuGame()
+    for row, col in [(3, 12), (3, 13), (3, 14), (4, 0), (4, 1)]:
+        game.make_move(row, col, 'X')
+    assert not game.game_over
+    
+    print("✅ Bitboard engine tests passed!")
+
+def test_undo_redo():
+    """Test undo/redo and building a game from its moves"""
+    print("🧪 Testing undo and redo...")
+    
+    import random
+    rng = random.Random(99)
+    for game_class in (GomokuGame, BitboardGomokuGame):
+        # A win is taken back and replayed
+        game = game_class()
+        for k in range(4):
+            game.make_move(7, k, 'X')
+            game.make_move(8, k, 'O')
+        game.make_move(7, 4, 'X')
+        assert game.game_over and game.winner == 'X'
+        generation = game.generation
+        assert game.undo_move() == (7, 4, 'X')
+        assert not game.game_over and game.winner is None
+        assert game.current_player == 'X' and game.board[7][4] == ' '
+        assert game.generation == generation + 1
+        assert game.redo_move() == (7, 4, 'X')
+        assert game.game_over and game.winner == 'X'
+        assert game.redo_move() is None
+        
+        # Undoing everything gives back an empty board
+        while game.undo_move():
+            pass
+        assert game.move_history == [] and game.zobrist_hash == 0
+        assert game.board == game_class().board and game.current_player == 'X'
+        assert game.make_move(0, 0, 'X') and game.redo_stack == []  # A new move drops the redo stack
+        
+        # A time loss is undone as its own step, before the last move
+        game.make_move(0, 1, 'O')
+        game.end_game('O')
+        assert game.undo_move() == {'winner': 'O'}
+        assert not game.game_over and game.winner is None and len(game.move_history) == 2
+        assert game.undo_move() == (0, 1, 'O')
+        assert game.redo_move() == (0, 1, 'O') and not game.game_over
+        assert game.redo_move() == {'winner': 'O'}
+        assert game.game_over and game.winner == 'O'
+        assert game.redo_move() is None
+        game.undo_move()
+        assert game.make_move(0, 2, 'X') and game.redo_move() is None  # A new move drops the ending too
+        
+        # A full board is a tie again after undo + redo
+        game = game_class(board_size=5)
+        cells = [(i, j) for i in range(5) for j in range(5)]
+        rng.shuffle(cells)
+        for row, col in cells:
+            game.make_move(row, col, 'XO'[(row + col // 2) % 2])  # No five in a row anywhere
+        assert game.winner == 'Tie'
+        game.undo_move()
+        assert not game.is_board_full() and not game.game_over
+        game.redo_move()
+        assert game.is_board_full() and game.winner == 'Tie'
+        
+        # from_moves agrees with playing the moves one by one
+        reference = game_class()
+        moves = []
+        while not reference.game_over:
+            row, col = rng.randrange(15), rng.randrange(15)
+            if reference.make_move(row, col, reference.current_player):
+                moves.append((row, col))
+        game = game_class.from_moves(moves)
+        assert game.board == reference.board and game.winner == reference.winner
+        assert game.zobrist_hash == reference.zobrist_hash
+        try:
+            game_class.from_moves([(7, 7), (7, 7)])
+            assert False, "Replaying a move onto an occupied cell should fail"
+        except ValueError:
+            pass
+    
+    print("✅ Undo and redo tests passed!")
+
+def test_match_runner():
+    """Test headless in-process matches"""
+    print("🧪 Testing match runner...")
+    
+    from server import MatchRunner
+    
+    def first_empty(board, player):
+        for i in range(15):
+            for j in range(15):
+                if board[i][j] == ' ':
+                    return (i, j)
+    
+    def broken(board, player):
+        raise RuntimeError("bot crashed")
+    
+    runner = MatchRunner(first_empty, broken, names={'X': 'first', 'O': 'broken'}, seed=7)
+    results = runner.run(4)
+    assert len(results) == 4
+    for i, result in enumerate(results):
+        assert result['game'] == i
+        assert result['winner'] in ('X', 'O', 'Tie')
+        assert result['moves'] == len(result['moveHistory'])
+        broken_color = 'O' if i % 2 == 0 else 'X'
+        assert result[broken_color] == 'broken'
+        assert result['invalidMoves'][broken_color] > 0
+    
+    # Random openings make a deterministic bot play different games, the
+    # same ones again for the same seed
+    def games(seed):
+        runner = MatchRunner(first_empty, first_empty, seed=seed, opening_plies=4)
+        return [tuple(result['moveHistory']) for result in runner.run(6)]
+    assert len(set(games(1))) > 1 and games(1) == games(1)
+    assert all(abs(row - 7) <= 3 and abs(col - 7) <= 3 for row, col, _ in games(2)[0][:4])
+    assert len(set(tuple(result['moveHistory']) for result in
+                   MatchRunner(first_empty, first_empty).run(4))) == 1
+    
+    print("✅ Match runner tests passed!")
+
+def test_match_registry():
+    """Test hosting several matches with a concurrency cap"""
+    print("🧪 Testing match registry...")
+    
+    import threading
+    from server import GameServer, DEFAULT_MATCH_ID
+    from time_control import TimeControl
+    
+    server = GameServer(max_concurrent_games=1)
+    assert server.get_match(DEFAULT_MATCH_ID) is server.default_match
+    
+    # Bots answer with the first empty cell without any HTTP
+    def first_empty(bot_info, game_state, timeout):
+        for i, row in enumerate(game_state['board']):
+            for j, cell in enumerate(row):
+                if cell == ' ':
+                    return {'row': i, 'col': j}
+    server.get_bot_move = first_empty
+    
+    first = server.create_match('first')
+    second = server.create_match()
+    assert server.create_match('first') is None
+    for match in (first, second):
+        match.register_bot('X', {'host': 'localhost', 'port': 1, 'name': 'X'})
+        match.register_bot('O', {'host': 'localhost', 'port': 2, 'name': 'O'})
+    
+    assert first.start()
+    assert second.start()
+    assert first.wait_for_change(first.game.generation, 0, timeout=5)
+    assert first.status == 'playing'
+    assert second.status == 'queued'
+    assert len(first.game.move_history) > 0
+    assert len(second.game.move_history) == 0
+    
+    assert server.remove_match('first')
+    assert server.get_match('first') is None
+    assert second.wait_for_change(second.game.generation, 0, timeout=5)
+    assert second.status == 'playing'
+    second.reset()
+    assert second.status == 'waiting'
+    assert not server.remove_match(DEFAULT_MATCH_ID)
+    
+    # A game thread still waiting on a bot after stop() must not touch the
+    # next game: its late answer is dropped and the new run stays running
+    server = GameServer()
+    asked, old_answer, new_answer = threading.Event(), threading.Event(), threading.Event()
+    calls = []
+    def slow_bot(bot_info, game_state, timeout):
+        calls.append(game_state['generation'])
+        asked.set()
+        (old_answer if len(calls) == 1 else new_answer).wait(timeout=10)
+        return {'row': 14, 'col': 14} if len(calls) == 1 else first_empty(bot_info, game_state, timeout)
+    server.get_bot_move = slow_bot
+    match = server.default_match
+    match.time_control = TimeControl(move_delay=0)
+    match.register_bot('X', {'host': 'localhost', 'port': 1})
+    match.register_bot('O', {'host': 'localhost', 'port': 2})
+    assert match.start()
+    old_thread = match.game_thread
+    assert asked.wait(timeout=5)
+    match.reset()  # stop() gives up on joining the thread after 1 s
+    assert old_thread.is_alive()
+    assert match.start()
+    old_answer.set()
+    old_thread.join(timeout=5)
+    assert not old_thread.is_alive()
+    assert match.running and match.game.move_history == []
+    new_answer.set()
+    match.game_thread.join(timeout=5)
+    assert match.game.game_over and match.game.board[14][14] == ' '
+    assert not match.running and match.status == 'finished'
+    server.close()
+    
+    print("✅ Match registry tests passed!")
+
+def test_bot_connections():
+    """Test bots get a pooled connection when they register"""
+    print("🧪 Testing bot connection pools...")
+    
+    from server import GameServer
+    
+    server = GameServer()
+    server.health.ping = lambda bot_info, confirm=False: {'alive': True}  # Or the failed ping skips the request
+    server.register_bot('X', {'host': '127.0.0.1', 'port': 9, 'name': 'X'})
+    server.register_bot('O', {'host': '127.0.0.1', 'port': 9, 'name': 'O'})
+    stats = server.get_connection_stats()
+    assert len(stats) == 1
+    assert stats[0]['url'] == 'http://127.0.0.1:9'
+    assert stats[0]['requests'] == 0
+    
+    # Nothing listens on the discard port, so the move request fails
+    assert server.get_bot_move(server.connected_bots['X'], server.game.get_game_state()) is None
+    stats = server.get_connection_stats()
+    assert stats[0]['requests'] == 1
+    assert stats[0]['errors'] == 1
+    
+    print("✅ Bot connection pool tests passed!")
+
+def test_metrics():
+    """Test bot call metrics and their Prometheus text rendering"""
+    print("🧪 Testing metrics...")
+    
+    from metrics import MetricsRegistry
+    from server import GameServer, GameHTTPRequestHandler
+    from time_control import TimeControl
+    
+    registry = MetricsRegistry()
+    counter = registry.counter('test_total', 'A counter', ['bot'])
+    histogram = registry.histogram('test_seconds', 'A histogram', ['bot'], buckets=(0.1, 1.0))
+    counter.inc(bot='a "quoted" bot')
+    histogram.observe(0.05, bot='a')
+    histogram.observe(0.5, bot='a')
+    text = registry.render()
+    assert '# TYPE test_total counter' in text
+    assert 'test_total{bot="a \\"quoted\\" bot"} 1' in text
+    assert 'test_seconds_bucket{bot="a",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{bot="a",le="1.0"} 2' in text
+    assert 'test_seconds_bucket{bot="a",le="+Inf"} 2' in text
+    assert 'test_seconds_count{bot="a"} 2' in text
+    
+    # A bot that cannot be reached: an error, then a random fallback move
+    server = GameServer()
+    match = server.default_match
+    match.time_control = TimeControl(move_delay=0)
+    bot = {'host': '127.0.0.1', 'port': 9, 'name': 'ghost'}
+    match.register_bot('X', bot)
+    match.register_bot('O', bot)
+    assert server.get_bot_move(bot, server.game.get_game_state()) is None
+    assert server.bot_errors.get(bot='ghost') == 1
+    
+    # A bot that always answers the center: after the first move every
+    # answer is invalid and replaced by a random move
+    server.get_bot_move = lambda bot_info, state, timeout: {'row': 7, 'col': 7}
+    match.running = True
+    match.play()
+    moves = len(server.game.move_history)
+    assert server.game.game_over
+    assert server.bot_invalid_moves.get(bot='ghost') == moves - 1
+    assert server.random_moves.get(bot='ghost') == moves - 1
+    assert f'gomoku_random_moves_total{{bot="ghost"}} {moves - 1}' in server.metrics.render()
+    
+    # Request labels: IDs collapsed, unknown paths share one label
+    label = GameHTTPRequestHandler.metrics_path
+    assert label('/api/game-status') == '/api/game-status'
+    assert label('/api/games/m1') == '/api/games/{id}'
+    assert label('/api/games/m1/undo') == '/api/games/{id}/undo'
+    assert label('/api/archive/12/position') == '/api/archive/{id}/position'
+    assert label('/api/tournament/start') == '/api/tournament/start'
+    for path in ('/api/nope-1', '/api/games/m1/nope', '/api/tournament/nope', '/api/archive/x'):
+        assert label(path) == '/api/other', path
+    
+    print("✅ Metrics tests passed!")
+
+def test_time_control():
+    """Test per-move limits, game clocks and running out of time"""
+    print("🧪 Testing time controls...")
+    
+    import threading
+    import time
+    import requests
+    from server import GameServer, create_http_server
+    from time_control import TimeControl
+    
+    # The budget is the per-move limit, capped by what is left on the clock
+    control = TimeControl(move_time=5, base_time=3, increment=1, move_delay=0)
+    clock = control.new_clock()
+    assert control.move_budget(clock, 'X') == 3
+    clock = control.charge(clock, 'X', 2.5)
+    assert clock == {'X': 1.5, 'O': 3}
+    assert control.charge(clock, 'X', 2)['X'] == 0
+    assert TimeControl(move_time=5).new_clock() is None
+    assert TimeControl.from_dict({'baseTime': 60}, default=control).to_dict() == {
+        'moveTime': 5, 'baseTime': 60, 'increment': 1, 'moveDelay': 0}
+    for bad in ({'moveTime': 0}, {'moveTime': 'soon'}, {'increment': -1}, None, [], 5):
+        try:
+            TimeControl.from_dict(bad)
+            assert False, bad
+        except ValueError:
+            pass
+    
+    # Bots are told their budget and clock; a slow X loses on time
+    seen = []
+    def bot(bot_info, state, timeout):
+        seen.append((state['currentPlayer'], state['moveTimeLimit'], state['clock']))
+        if state['currentPlayer'] == 'X':
+            time.sleep(0.1)
+        empty = [(r, c) for r, row in enumerate(state['board']) for c, cell in enumerate(row) if cell == ' ']
+        return {'row': empty[0][0], 'col': empty[0][1]}
+    
+    server = GameServer(time_control=TimeControl(move_time=1, base_time=0.25, increment=0.02, move_delay=0))
+    server.get_bot_move = bot
+    match = server.default_match
+    match.register_bot('X', {'host': 'localhost', 'port': 1})
+    match.register_bot('O', {'host': 'localhost', 'port': 2})
+    assert match.start()
+    match.game_thread.join(timeout=5)
+    
+    assert match.game.game_over and match.game.winner == 'O'
+    assert match.game.clock['X'] == 0 and match.game.clock['O'] > 0.25
+    assert seen[0] == ('X', 0.25, {'X': 0.25, 'O': 0.25})
+    assert seen[1][0] == 'O' and 0.15 < seen[1][2]['X'] < 0.2
+    assert len(match.game.move_history) == len([s for s in seen if s[0] == 'X']) * 2 - 2
+    assert match.get_status()['timeControl']['baseTime'] == 0.25
+    
+    # A time control that is not a JSON object is a bad request, not a crash
+    httpd = create_http_server(server, port=0, host='127.0.0.1', log_requests=False)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        for body in ('null', '[1]', '5'):
+            assert requests.post(f"{url}/api/time-control", data=body, timeout=5).status_code == 400
+        response = requests.post(f"{url}/api/tournament/start", json={'timeControl': None}, timeout=5)
+        assert response.status_code == 400
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        server.close()
+    
+    print("✅ Time control tests passed!")
+
+def test_binary_protocol():
+    """Test the binary move request format and a bot speaking it"""
+    print("🧪 Testing binary protocol...")
+    
+    import threading
+    import protocol
+    from server import GameServer
+    from client_python import GomokuBot, BotHTTPServer
+    
+    game = GomokuGame()
+    for row, col in [(7, 7), (7, 8), (0, 14), (14, 0), (8, 8)]:
+        game.make_move(row, col, game.current_player)
+    state = game.get_game_state()
+    state['moveTimeLimit'] = 1.5
+    state['clock'] = {'X': 12.25, 'O': 9.5}
+    
+    # 20-byte header, 57 bytes of board, 2 bytes per move
+    data = protocol.encode_request(state)
+    assert len(data) == 20 + 57 + 2 * 5
+    decoded = protocol.decode_request(data)
+    assert decoded['board'] == state['board']
+    assert decoded['currentPlayer'] == 'O' and not decoded['gameOver']
+    assert decoded['moveHistory'] == [list(move) for move in state['moveHistory']]
+    assert decoded['moveTimeLimit'] == 1.5 and decoded['clock'] == {'X': 12.25, 'O': 9.5}
+    state['clock'] = None
+    assert protocol.decode_request(protocol.encode_request(state))['clock'] is None
+    assert protocol.decode_move(protocol.encode_move(3, 11)) == {'row': 3, 'col': 11}
+    for bad in (b'', b'GM\x02' + data[3:], data[:-1]):
+        try:
+            protocol.decode_request(bad)
+            assert False, bad
+        except ValueError:
+            pass
+    assert protocol.negotiate({'protocol': 'binary'}) == 'binary'
+    assert protocol.negotiate({'protocol': 'xml'}) == protocol.negotiate({}) == 'json'
+    
+    # The server asks a binary bot for moves and gets the same answer as JSON
+    bot = GomokuBot('localhost', bot_port=0)
+    http_server = BotHTTPServer(('127.0.0.1', 0), bot)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    server = GameServer()
+    try:
+        port = http_server.server_address[1]
+        binary = server.get_bot_move({'host': '127.0.0.1', 'port': port, 'protocol': 'binary'}, state)
+        json_move = server.get_bot_move({'host': '127.0.0.1', 'port': port}, state)
+        assert binary == json_move == {'row': 6, 'col': 6}
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+    
+    print("✅ Binary protocol tests passed!")
+
+def test_single_file_client():
+    """Test client_python.py runs as a copy on its own with the heuristic strategy"""
+    print("🧪 Testing single-file bot client...")
+    
+    import os
+    import shutil
+    import subprocess
+    import sys
+    import tempfile
+    
+    script = (
+        "import sys\n"
+        "from client_python import GomokuBot\n"
+        "board = [[' '] * 15 for _ in range(15)]\n"
+        "board[7][7] = 'X'\n"
+        "print(GomokuBot('localhost').get_move_for_state({'board': board, 'currentPlayer': 'O'}))\n"
+        "print(sorted({'bot_engine', 'opening_book', 'vector_eval', 'protocol'} & set(sys.modules)))\n"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'client_python.py'), directory)
+        result = subprocess.run([sys.executable, '-c', script], cwd=directory,
+                                capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    move, modules = result.stdout.splitlines()
+    assert move.startswith('(') and modules == '[]'
+    
+    print("✅ Single-file bot client tests passed!")
+
+def test_bot_health():
+    """Test concurrent bot health checks and what happens to dead bots"""
+    print("🧪 Testing bot health checks...")
+    
+    import socket
+    import threading
+    import time
+    from server import GameServer
+    from health import DEAD_AFTER
+    from client_python import GomokuBot, BotHTTPServer
+    
+    bot = GomokuBot('localhost', bot_port=0)
+    http_server = BotHTTPServer(('127.0.0.1', 0), bot)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    # Ports nobody listens on
+    probes = [socket.socket(), socket.socket()]
+    for probe in probes:
+        probe.bind(('127.0.0.1', 0))
+    dead_port, gone_port = [probe.getsockname()[1] for probe in probes]
+    for probe in probes:
+        probe.close()
+    
+    alive = {'host': '127.0.0.1', 'port': http_server.server_address[1], 'name': 'alive'}
+    dead = {'host': '127.0.0.1', 'port': dead_port, 'name': 'dead'}
+    server = GameServer()
+    try:
+        assert server.health.get(alive) is None and not server.health.is_dead(dead)
+        results = server.health.check([alive, dead, None])
+        assert len(results) == 2
+        assert results[0]['alive'] and results[0]['rttMs'] >= 0
+        assert not results[1]['alive'] and results[1]['error']
+        assert server.health.is_dead(dead) and not server.health.is_dead(alive)
+        assert server.get_bot_health(alive)['health']['alive']
+        assert server.bot_ping_failures.get(bot='dead') == 1
+        
+        # Moves are not even asked of a dead bot
+        state = GomokuGame().get_game_state()
+        start = time.perf_counter()
+        assert server.get_bot_move(dead, state, timeout=5) is None
+        assert time.perf_counter() - start < 0.1
+        assert server.get_bot_move(alive, state) == {'row': 7, 'col': 7}
+        
+        # Background pings mark a bot dead only after several failures in a
+        # row, and skip a bot while a move request to it is in flight
+        gone = {'host': '127.0.0.1', 'port': gone_port, 'name': 'gone'}
+        with server.health.moving(gone):
+            assert server.health.probe([gone])[0]['alive'] and server.health.get(gone) is None
+        for _ in range(DEAD_AFTER - 1):
+            assert not server.health.probe([gone])[0]['alive']
+            assert not server.health.is_dead(gone)
+        server.health.probe([gone])
+        assert server.health.is_dead(gone)
+        assert not server.health.is_busy(gone)
+        
+        # Registered bots are pinged in the background
+        server.default_match.register_bot('X', alive)
+        server.default_match.register_bot('O', dead)
+        assert server.registered_bots() == [alive, dead]
+        
+        # A dead bot forfeits its tournament games
+        server.tournament.register('alive', alive)
+        server.tournament.register('dead', dead)
+        assert server.tournament.start('round-robin', games_per_pairing=2)
+        server.tournament.thread.join(timeout=10)
+        status = server.tournament.get_status()
+        assert [game['status'] for game in status['games']] == ['forfeit', 'forfeit']
+        assert status['standings'][0]['name'] == 'alive' and status['standings'][0]['points'] == 2
+        assert not status['bots']['dead']['health']['alive']
+    finally:
+        server.close()
+        http_server.shutdown()
+        http_server.server_close()
+    
+    print("✅ Bot health tests passed!")
+
+def test_game_archive():
+    """Test archiving games, index queries, replay and index recovery"""
+    print("🧪 Testing game archive...")
+    
+    import os
+    import tempfile
+    from server import GameServer
+    from archive import GameArchive
+    from time_control import TimeControl
+    
+    def play(moves):
+        game = GomokuGame()
+        for row, col in moves:
+            game.make_move(row, col, game.current_player)
+        return game
+    
+    x_wins = play([(7, 0), (8, 0), (7, 1), (8, 1), (7, 2), (8, 2), (7, 3), (8, 3), (7, 4)])
+    o_wins = play([(0, 0), (7, 0), (0, 2), (7, 1), (0, 4), (7, 2), (0, 6), (7, 3), (0, 8), (7, 4)])
+    assert x_wins.winner == 'X' and o_wins.winner == 'O'
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'games.jsonl')
+        archive = GameArchive(path)
+        assert archive.append('alpha', 'beta', 'X', x_wins.move_history,
+                              latencies=[0.01] * 9, matchId='m1') == 0
+        assert archive.append('beta', 'gamma', 'O', o_wins.move_history) == 1
+        assert archive.append('gamma', 'alpha', 'O', o_wins.move_history) == 2
+        
+        assert [g['id'] for g in archive.query(bot='alpha')] == [0, 2]
+        assert [g['id'] for g in archive.query(winner='O')] == [1, 2]
+        assert [g['id'] for g in archive.query(bot='alpha', winner='O')] == [2]
+        assert archive.query(until='2000-01-01') == []
+        assert len(archive.query(since='2000-01-01', limit=2)) == 2
+        record = archive.get(0)
+        assert record['matchId'] == 'm1' and record['latencyMs'] == [10.0] * 9
+        assert record['moves'][:2] == [7 * 15, 8 * 15]
+        
+        # Replay any ply
+        position = archive.position(1, ply=3)
+        assert position['board'][0][0] == 'X' and position['board'][7][0] == 'O'
+        assert position['board'][0][2] == 'X' and position['currentPlayer'] == 'O'
+        assert not position['gameOver'] and position['winner'] is None
+        final = archive.position(1)
+        assert final['board'] == o_wins.board and final['winner'] == 'O'
+        archive.close()
+        assert archive._log.closed and archive._index.closed and archive._map is None
+        archive.close()
+        
+        # The index survives a restart; a lost index and a torn write are recovered
+        archive = GameArchive(path)
+        assert len(archive) == 3
+        archive.close()
+        os.remove(path + '.idx')
+        with open(path, 'ab') as f:
+            f.write(b'{"id":3,"X":"torn')
+        archive = GameArchive(path)
+        assert len(archive) == 3 and archive.query(bot='gamma')[-1]['id'] == 2
+        assert archive.append('delta', 'alpha', 'X', x_wins.move_history) == 3
+        assert archive.get(3)['X'] == 'delta'
+        end = archive.entries[3]['offset']
+        archive.close()
+        
+        # Index entries past the end of a truncated log are dropped
+        with open(path, 'r+b') as f:
+            f.truncate(end)
+        archive = GameArchive(path)
+        assert len(archive) == 3 and archive.get(2)['X'] == 'gamma'
+        assert archive.append('epsilon', 'alpha', 'X', x_wins.move_history) == 3
+        assert archive.get(3)['X'] == 'epsilon'
+        archive.close()
+        archive = GameArchive(path)
+        assert len(archive) == 4
+        archive.close()
+        
+        # The server archives finished matches with each move's latency
+        def bot(bot_info, state, timeout):
+            empty = [(r, c) for r, row in enumerate(state['board']) for c, cell in enumerate(row) if cell == ' ']
+            return {'row': empty[0][0], 'col': empty[0][1]}
+        
+        server = GameServer(archive_path=path, time_control=TimeControl(move_delay=0))
+        server.get_bot_move = bot
+        server.health.ping = lambda bot_info, confirm=False: {'alive': True}
+        archive_game = server.archive_game
+        running = []
+        server.archive_game = lambda match: running.append(match.running) or archive_game(match)
+        match = server.default_match
+        match.register_bot('X', {'host': 'localhost', 'port': 1, 'name': 'first'})
+        match.register_bot('O', {'host': 'localhost', 'port': 2, 'name': 'second'})
+        assert match.start()
+        match.game_thread.join(timeout=5)
+        # Archived before the match stopped counting as running
+        assert running == [True] and not match.running
+        assert match.archive_id == 4
+        record = server.archive.get(4)
+        assert record['X'] == 'first' and record['winner'] == match.game.winner
+        assert len(record['latencyMs']) == len(record['moves']) == len(match.game.move_history)
+        assert server.archive.position(4)['board'] == match.game.board
+        server.close()
+    
+    print("✅ Game archive tests passed!")
+
+def test_benchmark():
+    """Test the benchmark suites produce comparable JSON results"""
+    print("🧪 Testing benchmarks...")
+    
+    import json
+    import benchmark
+    
+    engine = benchmark.bench_engine(number=200, repeat=2)
+    assert set(engine['engines']) == {'list', 'bitboard'}
+    for methods in engine['engines'].values():
+        assert set(methods) == {'make_move', 'check_win', 'is_board_full', 'get_game_state', 'undo_redo'}
+        assert all(stats['count'] == 2 and stats['p50'] > 0 for stats in methods.values())
+    
+    server = benchmark.bench_server(clients=(2,), duration=0.3)
+    assert server[0]['clients'] == 2 and server[0]['errors'] == 0 and server[0]['requests'] > 0
+    # Keep-alive replies are not held back by Nagle's algorithm (~40 ms each)
+    from server import GameHTTPRequestHandler
+    from client_python import BotHTTPHandler
+    assert GameHTTPRequestHandler.disable_nagle_algorithm and BotHTTPHandler.disable_nagle_algorithm
+    
+    positions = benchmark.self_play_corpus(3)
+    assert len(positions) == 3
+    bot = benchmark.bench_bot(positions)
+    assert bot[0]['strategy'] == 'heuristic' and bot[0]['moveMs']['count'] == 3
+    
+    results = dict(benchmark.environment(), engine=engine, server=server, bot=bot)
+    results = json.loads(json.dumps(results))
+    rows = benchmark.compare(results, results)
+    assert len(rows) == 10 + 2 + 1
+    assert all(ratio == 1 for _, _, _, ratio in rows)
+    
+    print("✅ Benchmark tests passed!")
+
+def test_state_deltas():
+    """Test incremental game-state updates and waiting for moves"""
+    print("🧪 Testing game-state deltas...")
+    
+    import threading
+    from server import GameServer
+    
+    server = GameServer()
+    match = server.default_match
+    match.game.make_move(7, 7, 'X')
+    match.game.make_move(7, 8, 'O')
+    generation = match.game.generation
+    
+    delta = match.get_state_since(1, generation)
+    assert not delta['full']
+    assert delta['moves'] == [(7, 8, 'O')]
+    assert delta['moveCount'] == 2
+    assert delta['currentPlayer'] == 'X'
+    
+    # A client still looking at an older game gets the full board
+    assert match.get_state_since(1, generation - 1)['full']
+    assert match.get_state_since(5, generation)['full']
+    
+    # Nothing new: waiting times out
+    assert not match.wait_for_change(generation, 2, timeout=0.05)
+    
+    def play():
+        match.game.make_move(8, 8, 'X')
+        match.notify_change()
+    timer = threading.Timer(0.05, play)
+    timer.start()
+    assert match.wait_for_change(generation, 2, timeout=2)
+    assert match.get_state_since(2, generation)['moves'] == [(8, 8, 'X')]
+    
+    match.reset()
+    assert match.game.generation == generation + 1
+    assert match.get_state_since(3, generation)['full']
+    
+    print("✅ Game-state delta tests passed!")
+
+def test_state_cache():
+    """Test the serialized game state is cached until the next change"""
+    print("🧪 Testing serialized state cache...")
+    
+    import gzip
+    import json
+    
+    game = BitboardGomokuGame()
+    first = game.get_game_state_json()
+    assert game.get_game_state_json() is first
+    assert json.loads(first)['moveCount'] == 0
+    
+    game.make_move(7, 7, 'X')
+    second = game.get_game_state_json()
+    assert second is not first
+    assert json.loads(second)['board'][7][7] == 'X'
+    assert json.loads(gzip.decompress(game.get_game_state_json(compress=True))) == json.loads(second)
+    
+    # Invalid moves change nothing, so the cache survives them
+    assert not game.make_move(7, 7, 'O')
+    assert game.get_game_state_json() is second
+    
+    game.reset_game()
+    assert json.loads(game.get_game_state_json())['moveCount'] == 0
+    
+    print("✅ Serialized state cache tests passed!")
+
+def test_static_asset_cache():
+    """Test web UI files are cached with ETags and reloaded on change"""
+    print("🧪 Testing static asset cache...")
+    
+    import gzip
+    import os
+    import tempfile
+    from server import StaticAssetCache
+    
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'app.js')
+        with open(path, 'w') as f:
+            f.write('console.log("hello");\n' * 50)
+        
+        cache = StaticAssetCache(root, check_interval=0)
+        asset = cache.get('app.js')
+        assert asset['content_type'] in ('application/javascript', 'text/javascript')
+        assert gzip.decompress(asset['gzip']) == asset['content']
+        assert cache.get('app.js')['etag'] == asset['etag']
+        assert cache.get('../app.js') is None
+        assert cache.get('missing.js') is None
+        
+        with open(path, 'w') as f:
+            f.write('console.log("changed");')
+        os.utime(path, ns=(0, asset['mtime'] + 10 ** 9))
+        changed = cache.get('app.js')
+        assert changed['etag'] != asset['etag']
+        assert changed['content'] == b'console.log("changed");'
+        assert changed['gzip'] is None  # Too small to be worth compressing
+    
+    print("✅ Static asset cache tests passed!")
+
+def test_zobrist_hash():
+    """Test the incremental Zobrist hash matches a from-scratch hash"""
+    print("🧪 Testing Zobrist hashing...")
+    
+    from zobrist import get_hasher
+    
+    hasher = get_hasher(15)
+    for game_class in (GomokuGame, BitboardGomokuGame):
+        game = game_class()
+        assert game.zobrist_hash == 0
+        for row, col, player in [(7, 7, 'X'), (7, 8, 'O'), (8, 8, 'X'), (6, 6, 'O')]:
+            game.make_move(row, col, player)
+            assert game.zobrist_hash == hasher.hash_board(game.board)
+        
+        # The same stones reached in a different order hash the same
+        other = game_class()
+        for row, col, player in [(8, 8, 'X'), (6, 6, 'O'), (7, 7, 'X'), (7, 8, 'O')]:
+            other.make_move(row, col, player)
+        assert other.zobrist_hash == game.zobrist_hash
+        
+        game.reset_game()
+        assert game.zobrist_hash == 0
+    
+    print("✅ Zobrist hashing tests passed!")
+
+def test_symmetry():
+    """Test positions are canonicalized across the 8 board symmetries"""
+    print("🧪 Testing board symmetries...")
+    
+    from symmetry import (TRANSFORMS, canonical_board, canonical_board_key,
+                          inverse_move, transform_board, transform_move)
+    
+    moves = [(7, 7, 'X'), (6, 8, 'O'), (8, 8, 'X'), (3, 10, 'O')]
+    game = GomokuGame()
+    for row, col, player in moves:
+        game.make_move(row, col, player)
+    key, _ = game.canonical_key()
+    canonical, _ = canonical_board(game.board)
+    
+    for t in range(len(TRANSFORMS)):
+        # Every rotation and reflection has the same canonical key and board
+        other = GomokuGame()
+        for row, col, player in moves:
+            other.make_move(*transform_move(row, col, t), player)
+        assert other.board == transform_board(game.board, t)
+        assert other.canonical_key()[0] == key
+        assert canonical_board_key(other.board)[0] == key
+        assert canonical_board(other.board)[0] == canonical
+        
+        # Moves map back through the inverse transform
+        assert inverse_move(*transform_move(3, 10, t), t) == (3, 10)
+    
+    # A different position has a different key
+    game.make_move(0, 0, 'X')
+    assert game.canonical_key()[0] != key
+    
+    print("✅ Board symmetry tests passed!")
+
+def test_tournament():
+    """Test tournament pairings and a full tournament run"""
+    print("🧪 Testing tournaments...")
+    
+    import itertools
+    import random
+    from server import GameServer
+    from tournament import round_robin_pairings, swiss_pairings
+    
+    # Round-robin: every pair meets exactly once, nobody plays twice a round
+    names = ['bot%d' % i for i in range(7)]
+    rounds = round_robin_pairings(names)
+    assert len(rounds) == 7
+    met = [frozenset(pair) for round_pairs in rounds for pair in round_pairs]
+    assert sorted(met, key=sorted) == sorted(
+        (frozenset(pair) for pair in itertools.combinations(names, 2)), key=sorted)
+    for round_pairs in rounds:
+        seated = [name for pair in round_pairs for name in pair]
+        assert len(seated) == len(set(seated)) == 6
+    
+    # Swiss: avoid rematches; the lowest-ranked player without a bye sits out
+    pairs, bye = swiss_pairings(['a', 'b', 'c', 'd', 'e'], {frozenset(('a', 'b'))}, byes={'e'})
+    assert bye == 'd'
+    assert pairs == [('a', 'c'), ('b', 'e')]
+    
+    # A full round-robin on the server with in-process stand-ins for the bots
+    def random_bot(bot_info, state, timeout):
+        empty = [(r, c) for r, row in enumerate(state['board'])
+                 for c, cell in enumerate(row) if cell == ' ']
+        row, col = rng.choice(empty)
+        return {'row': row, 'col': col}
+    
+    rng = random.Random(1)
+    server = GameServer(max_concurrent_games=4)
+    server.get_bot_move = random_bot
+    server.health.ping = lambda bot_info, confirm=False: {'alive': True}  # Nothing listens on the ports
+    for i in range(4):
+        assert server.tournament.register(f'bot{i}', {'host': 'localhost', 'port': 9000 + i})
+    assert server.tournament.start('round-robin', games_per_pairing=2)
+    assert not server.tournament.register('late', {'host': 'localhost', 'port': 9100})
+    server.tournament.thread.join(timeout=60)
+    
+    status = server.tournament.get_status()
+    assert status['status'] == 'finished'
+    assert status['rounds'] == 3 and len(status['games']) == 12
+    standings = status['standings']
+    assert all(entry['played'] == 6 for entry in standings)
+    assert sum(entry['points'] for entry in standings) == 12
+    assert standings == sorted(standings, key=lambda entry: -entry['points'])
+    # Each pairing played once with each color
+    colors = {(game['X'], game['O']) for game in status['games']}
+    assert all((o, x) in colors for x, o in colors)
+    # Finished games leave the match registry
+    assert all(server.get_match(game['matchId']) is None for game in status['games'])
+    server.close()
+    
+    print("✅ Tournament tests passed!")
+
 def test_bot_execution():
     """Test bot code execution"""
     print("🧪 Testing bot execution...")
@@ -77,9 +947,110 @@ if validMoves:
     assert 'col' in move
     assert 0 <= move['row'] < 15
     assert 0 <= move['col'] < 15
+    server.close()
     
     print("✅ Bot execution tests passed!")
 
+def test_sandbox():
+    """Test the sandbox worker pool's limits and a match between code bots"""
+    print("🧪 Testing bot sandbox...")
+    
+    import os
+    import sys
+    import threading
+    import requests
+    from sandbox import SandboxPool, SandboxError, SandboxTimeout
+    from server import GameServer, create_http_server
+    from time_control import TimeControl
+    
+    state = GomokuGame().get_game_state()
+    pool = SandboxPool(workers=1, cpu_limit=0.3, memory_limit=64)
+    try:
+        assert pool.execute("move = (7, 7)", state) == {'row': 7, 'col': 7}
+        for code, error in [("while True: pass", SandboxTimeout),
+                            ("import time\ntime.sleep(5)", SandboxTimeout),
+                            ("x = bytearray(512 * 1024 * 1024)", SandboxError),
+                            ("import os", SandboxError),
+                            ("open('/etc/passwd')", SandboxError),
+                            ("move = 'center'", SandboxError)]:
+            try:
+                pool.execute(code, state)
+                assert False, code
+            except error:
+                pass
+        # The worker stuck in time.sleep was replaced and the pool still plays
+        assert pool.execute("import random\nmove = {'row': random.randrange(15), 'col': 0}", state)['col'] == 0
+        stats = pool.get_stats()
+        assert stats['workers'] == 1 and stats['timeouts'] == 1 and stats['restarts'] == 1
+        
+        # Code that escapes the restricted builtins still meets the OS limits:
+        # not root, no new processes, no network
+        if sys.platform.startswith('linux') and os.geteuid() == 0:
+            escape = """
+g = next(c for c in ().__class__.__base__.__subclasses__() if c.__name__ == '_wrap_close').__init__.__globals__
+try:
+    if g['fork']() == 0:
+        g['_exit'](0)
+    forked = 1
+except OSError:
+    forked = 0
+fd = g['open']('/proc/net/dev', g['O_RDONLY'])
+online = int(g['read'](fd, 65536).count(b':') > 1)  # Only loopback in its own namespace
+move = (int(g['getuid']() == 0), forked * 2 + online)
+"""
+            assert pool.execute(escape, state) == {'row': 0, 'col': 0}
+    finally:
+        pool.close()
+    
+    # Two code bots play a whole match without any HTTP server
+    first_empty = """
+empty = [(r, c) for r in range(15) for c in range(15) if board[r][c] == ' ']
+move = empty[0] if currentPlayer == 'X' else empty[-1]
+"""
+    server = GameServer(time_control=TimeControl(move_time=2, move_delay=0), sandbox_workers=2)
+    try:
+        match = server.default_match
+        match.register_bot('X', {'name': 'Top Left', 'code': first_empty})
+        match.register_bot('O', {'name': 'Bottom Right', 'code': first_empty})
+        assert match.start()
+        match.game_thread.join(timeout=20)
+        assert match.game.game_over and match.game.winner == 'X'
+        assert len(match.game.move_history) == 9
+        assert server.bot_errors.get(bot='Top Left') == server.bot_errors.get(bot='Bottom Right') == 0
+        assert server.bot_move_seconds.get_count(bot='Top Left') == 5
+        assert server.sandbox.get_stats()['moves'] == 9
+        assert server.get_bot_health(match.connected_bots['X'])['health']['alive']
+    finally:
+        server.close()
+    
+    # Over HTTP, code bots are refused unless the server allows them
+    for allow, status in ((False, 403), (True, 200)):
+        server = GameServer(allow_code_bots=allow)
+        httpd = create_http_server(server, port=0, host='127.0.0.1', log_requests=False)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{httpd.server_address[1]}"
+        try:
+            for path in ('/api/register-bot', '/api/tournament/register-bot'):
+                response = requests.post(url + path, timeout=5, json={
+                    'player': 'X', 'bot_info': {'name': 'Center', 'code': 'move = (7, 7)'}})
+                assert response.status_code == status, (path, response.text)
+            response = requests.post(url + '/api/register-bot', timeout=5, json={
+                'player': 'X', 'bot_info': {'name': 'Broken', 'code': 'move = ('}})
+            assert response.status_code == (400 if allow else 403)
+            assert (server.default_match.connected_bots['X'] is not None) == allow
+            # bot_info that is not an object is a bad request, not a crash
+            for path in ('/api/register-bot', '/api/tournament/register-bot'):
+                for bot_info in ('x', [1], 5, None):
+                    response = requests.post(url + path, timeout=5, json={
+                        'player': 'O', 'name': 'Odd', 'bot_info': bot_info})
+                    assert response.status_code == 400, (path, bot_info, response.text)
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            server.close()
+    
+    print("✅ Sandbox tests passed!")
+
 def test_full_game():
     """Test a complete game"""
     print("🧪 Testing complete game...")
@@ -112,7 +1083,26 @@ if __name__ == "__main__":
     try:
         test_basic_game()
         test_win_conditions()
+        test_bitboard_engine()
+        test_undo_redo()
+        test_match_runner()
+        test_match_registry()
+        test_bot_connections()
+        test_metrics()
+        test_time_control()
+        test_binary_protocol()
+        test_single_file_client()
+        test_bot_health()
+        test_game_archive()
+        test_benchmark()
+        test_state_deltas()
+        test_state_cache()
+        test_static_asset_cache()
+        test_zobrist_hash()
+        test_symmetry()
+        test_tournament()
         test_bot_execution()
+        test_sandbox()
         test_full_game()
         
         print("=" * 50)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Time controls for Gomoku matches.
+A per-move limit, an optional chess clock with increment, and the pause
+between moves used to pace games for spectators.
+"""
+
+# Seconds a bot may think about one move unless the time control says otherwise
+DEFAULT_MOVE_TIME = 10.0
+
+
+class TimeControl:
+    """How long bots may think and how fast a match is paced.
+
+    move_time caps every move. With base_time set, each player also has a
+    game clock of base_time seconds that pays for their moves, with
+    increment seconds added back after each move (Fischer style); a player
+    whose clock runs out loses. move_delay is a pause between moves so
+    spectators can follow (0 plays at full speed).
+    """
+
+    # Field name in API payloads -> attribute
+    FIELDS = {'moveTime': 'move_time', 'baseTime': 'base_time',
+              'increment': 'increment', 'moveDelay': 'move_delay'}
+
+    def __init__(self, move_time=DEFAULT_MOVE_TIME, base_time=None, increment=0.0, move_delay=1.0):
+        self.move_time = float(move_time)
+        self.base_time = None if base_time is None else float(base_time)
+        self.increment = float(increment)
+        self.move_delay = float(move_delay)
+        if (self.move_time <= 0 or self.increment < 0 or self.move_delay < 0 or
+                (self.base_time is not None and self.base_time <= 0)):
+            raise ValueError("moveTime and baseTime must be positive, increment and moveDelay not negative")
+
+    @classmethod
+    def from_dict(cls, data, default=None):
+        """Build from an API payload; missing fields come from default.
+
+        Raises ValueError if data is not an object or has fields that are
+        not numbers (baseTime may be null for no game clock).
+        """
+        if not isinstance(data, dict):
+            raise ValueError("time control must be an object")
+        default = default or cls()
+        values = default.to_dict()
+        for field in cls.FIELDS:
+            if field in data:
+                values[field] = data[field]
+        try:
+            return cls(**{cls.FIELDS[field]: value for field, value in values.items()})
+        except TypeError:
+            raise ValueError("time control fields must be numbers")
+
+    def to_dict(self):
+        return {field: getattr(self, attribute) for field, attribute in self.FIELDS.items()}
+
+    def new_clock(self):
+        """Remaining time per player at the start of a game (None: no clock)"""
+        if self.base_time is None:
+            return None
+        return {'X': self.base_time, 'O': self.base_time}
+
+    def move_budget(self, clock, player):
+        """Seconds player may spend on the next move"""
+        if clock is None:
+            return self.move_time
+        return min(self.move_time, clock[player])
+
+    def charge(self, clock, player, elapsed):
+        """New clock after player spent elapsed seconds on a move.
+
+        The increment is only added if the player still had time left, so
+        a remaining time of 0 means the player lost on time.
+        """
+        remaining = clock[player] - elapsed
+        remaining = remaining + self.increment if remaining > 0 else 0.0
+        return dict(clock, **{player: round(remaining, 3)})
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Tournaments for the Gomoku server.
+Bots register into a pool; the scheduler pairs them round-robin or Swiss
+style and plays each round's games as concurrent matches on the GameServer,
+keeping a standings table as results come in.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from time_control import TimeControl
+from sandbox import is_sandboxed
+
+FORMATS = ('round-robin', 'swiss')
+
+# Points per game result
+WIN_POINTS, DRAW_POINTS, LOSS_POINTS = 1.0, 0.5, 0.0
+
+
+def round_robin_pairings(names):
+    """Rounds in which every pair of names meets once (circle method).
+
+    Returns a list of rounds, each a list of (a, b) pairs; with an odd
+    number of names, one name sits out each round.
+    """
+    players = list(names)
+    if len(players) % 2:
+        players.append(None)  # Bye
+    n = len(players)
+    rounds = []
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            a, b = players[i], players[n - 1 - i]
+            if a is not None and b is not None:
+                # Alternate who comes first so colors even out over the event
+                pairs.append((a, b) if (r + i) % 2 == 0 else (b, a))
+        rounds.append(pairs)
+        # Keep the first player fixed and rotate the rest
+        players = [players[0], players[-1]] + players[1:-1]
+    return rounds
+
+
+def swiss_pairings(ranking, played, byes=()):
+    """Pair one Swiss round.
+
+    ranking lists names best first; played is a set of frozenset pairs that
+    have already met. Each player is paired with the highest-ranked player
+    below them they have not met yet (or the next one, if they have met
+    everyone). Returns (pairs, bye) where bye is the name sitting out, the
+    lowest-ranked player without a bye yet, or None.
+    """
+    pool = list(ranking)
+    bye = None
+    if len(pool) % 2:
+        candidates = [name for name in reversed(pool) if name not in byes] or [pool[-1]]
+        bye = candidates[0]
+        pool.remove(bye)
+    pairs = []
+    while pool:
+        a = pool.pop(0)
+        opponent = next((b for b in pool if frozenset((a, b)) not in played), pool[0])
+        pool.remove(opponent)
+        pairs.append((a, opponent))
+    return pairs, bye
+
+
+class Tournament:
+    """A pool of bots and the scheduler that plays them against each other.
+
+    Each pairing plays games_per_pairing games with colors swapped after
+    every game. All pairings of a round are played at the same time, one
+    worker thread per pairing, as matches on the GameServer; the server's
+    max_concurrent_games cap still applies. A bot plays one game at a time.
+    """
+
+    def __init__(self, game_server, tournament_id='tournament'):
+        self.game_server = game_server
+        self.tournament_id = tournament_id
+        self.lock = threading.Lock()
+        self.bots = {}  # name -> bot_info
+        self.format = 'round-robin'
+        self.status = 'registering'  # registering -> running -> finished/stopped
+        self.schedule = None  # Round-robin rounds, fixed at start
+        self.rounds = 0
+        self.current_round = 0
+        self.games_per_pairing = 2
+        self.time_control = TimeControl(move_delay=0)  # For every tournament game
+        self.games = []
+        self.standings = {}
+        self.byes = set()
+        self.thread = None
+        self.running = False
+
+    def register(self, name, bot_info):
+        """Add a bot to the pool (only before the tournament starts)"""
+        with self.lock:
+            if self.status != 'registering' or not name or not bot_info:
+                return False
+            self.bots[name] = bot_info
+        if not is_sandboxed(bot_info):
+            self.game_server.get_bot_connection(bot_info)
+        self.game_server.health.submit(bot_info)  # Pre-flight ping
+        print(f"🏆 Tournament bot registered: {name} {bot_info}")
+        return True
+
+    def unregister(self, name):
+        """Remove a bot from the pool before the tournament starts"""
+        with self.lock:
+            if self.status != 'registering':
+                return False
+            return self.bots.pop(name, None) is not None
+
+    def start(self, format='round-robin', rounds=None, games_per_pairing=2, time_control=None):
+        """Start playing in the background.
+
+        rounds only applies to Swiss (default: enough rounds to separate the
+        field, about log2 of the number of bots). time_control defaults to
+        the usual limits with no pause between moves. Returns False if the
+        tournament is already running or has fewer than two bots.
+        """
+        with self.lock:
+            if self.running or format not in FORMATS or len(self.bots) < 2:
+                return False
+            names = sorted(self.bots)
+            self.format = format
+            self.games_per_pairing = max(1, int(games_per_pairing))
+            self.time_control = time_control or TimeControl(move_delay=0)
+            if format == 'round-robin':
+                self.schedule = round_robin_pairings(names)
+                self.rounds = len(self.schedule)
+            else:
+                self.schedule = None
+                self.rounds = int(rounds) if rounds else max(1, (len(names) - 1).bit_length())
+            self.current_round = 0
+            self.games = []
+            self.byes = set()
+            self.standings = {name: {'name': name, 'points': 0.0, 'played': 0, 'wins': 0,
+                                     'draws': 0, 'losses': 0, 'byes': 0} for name in names}
+            self.status = 'running'
+            self.running = True
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        print(f"🏆 Tournament started: {format}, {len(names)} bots, {self.rounds} rounds")
+        return True
+
+    def stop(self):
+        """Stop after the games in progress"""
+        self.running = False
+        for game in list(self.games):
+            match = self.game_server.get_match(game['matchId'])
+            if match:
+                match.stop()
+        if self.status == 'running':
+            self.status = 'stopped'
+
+    def reset(self):
+        """Stop and go back to registering with an empty pool"""
+        self.stop()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1)
+        with self.lock:
+            self.bots = {}
+            self.games = []
+            self.standings = {}
+            self.rounds = self.current_round = 0
+            self.status = 'registering'
+
+    def run(self):
+        """Play every round, one after the other"""
+        with ThreadPoolExecutor(max_workers=max(1, len(self.bots) // 2)) as pool:
+            for round_number in range(1, self.rounds + 1):
+                if not self.running:
+                    break
+                self.current_round = round_number
+                # Ping every bot at once before pairing; dead bots forfeit
+                self.game_server.health.check(list(self.bots.values()))
+                pairs = self.pairings(round_number)
+                # Each worker plays all games of one pairing in turn
+                futures = [pool.submit(self.play_pairing, round_number, a, b) for a, b in pairs]
+                for future in futures:
+                    future.result()
+        if self.running:
+            self.status = 'finished'
+            self.running = False
+            leader = self.get_standings()[0]
+            print(f"🏆 Tournament finished! Winner: {leader['name']} ({leader['points']} points)")
+
+    def pairings(self, round_number):
+        """Pairs for a round (Swiss pairs depend on the standings so far)"""
+        if self.format == 'round-robin':
+            return self.schedule[round_number - 1]
+        ranking = [entry['name'] for entry in self.get_standings()]
+        played = {frozenset((game['X'], game['O'])) for game in self.games}
+        pairs, bye = swiss_pairings(ranking, played, self.byes)
+        # Whoever has had X less often gets X (first in the pair)
+        x_games = {}
+        for game in self.games:
+            x_games[game['X']] = x_games.get(game['X'], 0) + 1
+        pairs = [(a, b) if x_games.get(a, 0) <= x_games.get(b, 0) else (b, a) for a, b in pairs]
+        if bye is not None:
+            with self.lock:
+                self.byes.add(bye)
+                self.standings[bye]['points'] += WIN_POINTS
+                self.standings[bye]['byes'] += 1
+        return pairs
+
+    def play_pairing(self, round_number, a, b):
+        """Play one pairing's games, swapping colors after each"""
+        for game_number in range(self.games_per_pairing):
+            if not self.running:
+                return
+            x, o = (a, b) if game_number % 2 == 0 else (b, a)
+            self.play_game(round_number, x, o)
+
+    def play_game(self, round_number, x, o):
+        """Play one game as a server match and record the result.
+        
+        A bot that failed its last health check forfeits instead; if both
+        did, the game is not played and counts for neither.
+        """
+        with self.lock:
+            match_id = f"{self.tournament_id}-r{round_number}-g{len(self.games) + 1}"
+            game = {'matchId': match_id, 'round': round_number, 'X': x, 'O': o,
+                    'winner': None, 'status': 'playing'}
+            self.games.append(game)
+        health = self.game_server.health
+        x_dead, o_dead = health.is_dead(self.bots[x]), health.is_dead(self.bots[o])
+        if x_dead or o_dead:
+            game['status'] = 'forfeit'
+            if not (x_dead and o_dead):
+                self.record_result(game, 'O' if x_dead else 'X')
+            return
+        match = self.game_server.create_match(match_id)
+        if match is None:  # Left over from an earlier tournament
+            self.game_server.remove_match(match_id)
+            match = self.game_server.create_match(match_id)
+        try:
+            match.time_control = self.time_control
+            match.register_bot('X', self.bots[x])
+            match.register_bot('O', self.bots[o])
+            if match.start():
+                match.game_thread.join()
+            game['status'] = match.status
+            game['archiveId'] = match.archive_id
+            if match.game.game_over:
+                self.record_result(game, match.game.winner)
+        finally:
+            # The finished game lives on in the archive, not in the registry
+            self.game_server.remove_match(match_id)
+
+    def record_result(self, game, winner):
+        """Update the standings with a finished game"""
+        game['winner'] = winner
+        with self.lock:
+            x, o = self.standings[game['X']], self.standings[game['O']]
+            x['played'] += 1
+            o['played'] += 1
+            if winner == 'X':
+                self._score(x, o)
+            elif winner == 'O':
+                self._score(o, x)
+            else:
+                for entry in (x, o):
+                    entry['draws'] += 1
+                    entry['points'] += DRAW_POINTS
+
+    @staticmethod
+    def _score(winner, loser):
+        winner['wins'] += 1
+        winner['points'] += WIN_POINTS
+        loser['losses'] += 1
+        loser['points'] += LOSS_POINTS
+
+    def get_standings(self):
+        """Standings table, best first (points, then wins, then name)"""
+        with self.lock:
+            entries = [dict(entry) for entry in self.standings.values()]
+        entries.sort(key=lambda entry: (-entry['points'], -entry['wins'], entry['name']))
+        return entries
+
+    def get_status(self):
+        """Get the tournament status as a dictionary"""
+        return {
+            'tournamentId': self.tournament_id,
+            'status': self.status,
+            'format': self.format,
+            'bots': {name: self.game_server.get_bot_health(bot_info) for name, bot_info in self.bots.items()},
+            'round': self.current_round,
+            'rounds': self.rounds,
+            'gamesPerPairing': self.games_per_pairing,
+            'timeControl': self.time_control.to_dict(),
+            'standings': self.get_standings(),
+            'games': list(self.games),
+        }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Vectorized move scoring for the Python bot.
+Scores every empty cell for both players at once with NumPy array slices
+over all 5-cell windows in the four line directions, instead of trying
+each cell in Python loops. Requires NumPy (optional: the rest of the bot
+runs without it).
+"""
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+from bot_engine import EMPTY, X, O, PLAYER_CODES, POTENTIAL_WEIGHTS, DIRECTIONS
+
+HAVE_NUMPY = np is not None
+
+WALL = 3  # Padding value outside the board
+WINDOW = 5
+
+
+# Cell codes are weighted so the sum over a window, a + 6*b + 36*w for a X
+# stones, b O stones and w wall cells, identifies its contents
+CELL_WEIGHTS = [1 if code == X else 6 if code == O else 36 if code == WALL else 0
+                for code in range(4)]
+
+
+def _build_window_tables():
+    """Potential of a window to X and to O, indexed by its weighted sum"""
+    size = WINDOW * 36 + 1
+    tables = {X: [0] * size, O: [0] * size}
+    for walls in range(WINDOW + 1):
+        for o in range(WINDOW + 1 - walls):
+            for x in range(WINDOW + 1 - walls - o):
+                total = x + 6 * o + 36 * walls
+                if walls == 0 and o == 0 and x < WINDOW:
+                    tables[X][total] = POTENTIAL_WEIGHTS[x]
+                if walls == 0 and x == 0 and o < WINDOW:
+                    tables[O][total] = POTENTIAL_WEIGHTS[o]
+    return tables
+
+
+class VectorEvaluator:
+    """Scores all empty cells of a board in one pass of array operations.
+
+    The board is held as an int8 array padded with WALL cells. For each
+    direction, five shifted views of it give every 5-cell window's contents;
+    a window with k stones of one player, none of the other and no wall is
+    worth POTENTIAL_WEIGHTS[k] to each of its empty cells. This is the same
+    per-cell potential that bot_engine.ThreatIndex keeps.
+    """
+
+    def __init__(self, board_size=15):
+        if np is None:
+            raise ImportError("VectorEvaluator requires NumPy: pip install numpy")
+        self.board_size = board_size
+        self.cell_weights = np.array(CELL_WEIGHTS, dtype=np.int16)
+        tables = _build_window_tables()
+        self.tables = {player: np.array(table, dtype=np.int64) for player, table in tables.items()}
+        self.board = np.zeros((board_size, board_size), dtype=np.int8)
+        self._padded = np.full((board_size + 2 * WINDOW, board_size + 2 * WINDOW),
+                               WALL, dtype=np.int8)
+        self._values = np.zeros(self._padded.shape, dtype=np.int64)
+
+    def load(self, board):
+        """Copy a list-of-lists board of 'X' / 'O' / ' ' strings"""
+        n = len(board)
+        if n != self.board_size:
+            self.__init__(n)
+        codes = np.array(board)
+        self.board[:] = EMPTY
+        self.board[codes == 'X'] = X
+        self.board[codes == 'O'] = O
+
+    def _view(self, array, k, dr, dc):
+        """array shifted so cell (r, c) holds the value at (r + k*dr, c + k*dc)"""
+        n = self.board_size
+        r0, c0 = WINDOW + k * dr, WINDOW + k * dc
+        return array[r0:r0 + n, c0:c0 + n]
+
+    def potentials(self):
+        """Per-cell potential for X and for O, as two board-shaped arrays"""
+        n = self.board_size
+        padded = self._padded
+        padded[WINDOW:WINDOW + n, WINDOW:WINDOW + n] = self.board
+        weighted = self.cell_weights[padded]
+        values = self._values
+        result = {X: np.zeros((n, n), dtype=np.int64), O: np.zeros((n, n), dtype=np.int64)}
+        for dr, dc in DIRECTIONS:
+            # Contents of the window starting at each cell
+            sums = self._view(weighted, 0, dr, dc).copy()
+            for k in range(1, WINDOW):
+                sums += self._view(weighted, k, dr, dc)
+            for player in (X, O):
+                # Hand each window's value to the five cells it covers
+                values[WINDOW:WINDOW + n, WINDOW:WINDOW + n] = self.tables[player][sums]
+                total = result[player]
+                for k in range(WINDOW):
+                    total += self._view(values, -k, dr, dc)
+        empty = self.board == EMPTY
+        return result[X] * empty, result[O] * empty
+
+    def score_moves(self, board, player):
+        """Score every cell for player ('X' or 'O'): attack + 0.9 * defense.
+
+        Occupied cells score -1. A cell completing five scores above any
+        block, and a block of the opponent's five above anything else.
+        """
+        self.load(board)
+        potential_x, potential_o = self.potentials()
+        if PLAYER_CODES[player] == X:
+            attack, defense = potential_x, potential_o
+        else:
+            attack, defense = potential_o, potential_x
+        scores = attack + defense * 0.9
+        scores[self.board != EMPTY] = -1
+        return scores
+
+    def best_move(self, board, player):
+        """Highest-scoring empty cell as (row, col), or None on a full board"""
+        scores = self.score_moves(board, player)
+        if not (self.board == EMPTY).any():
+            return None
+        if not (self.board != EMPTY).any():
+            return (self.board_size // 2, self.board_size // 2)
+        row, col = np.unravel_index(np.argmax(scores), scores.shape)
+        return int(row), int(col)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Zobrist hashing for Gomoku positions.
+Shared by the server (GomokuGame) and the Python bot's search engine, so a
+position hashes to the same 64-bit key on both sides.
+"""
+
+import random
+
+# Fixed seed: keys must be identical across processes and runs so hashes
+# can be stored (opening books, archives) and compared between programs
+DEFAULT_SEED = 0x6F6D6F6B75
+
+# Accept both the server's 'X'/'O' and the engine's 1/2 player codes
+PLAYER_INDEX = {'X': 1, 'O': 2, 1: 1, 2: 2}
+
+
+class ZobristHasher:
+    """Random 64-bit keys for every (player, cell) pair.
+
+    A position's hash is the XOR of the keys of its stones, so placing or
+    removing a stone updates the hash with a single XOR.
+    """
+
+    def __init__(self, board_size=15, seed=DEFAULT_SEED):
+        rng = random.Random(seed)
+        cells = board_size * board_size
+        self.board_size = board_size
+        # keys[player_code][row * board_size + col]; index 0 is unused
+        self.keys = [None,
+                     [rng.getrandbits(64) for _ in range(cells)],
+                     [rng.getrandbits(64) for _ in range(cells)]]
+        # XOR'd in when O is to move, for search positions
+        self.side_key = rng.getrandbits(64)
+
+    def key(self, row, col, player):
+        """Key of one stone; player is 'X', 'O', 1 or 2"""
+        return self.keys[PLAYER_INDEX[player]][row * self.board_size + col]
+
+    def hash_board(self, board):
+        """Hash a list-of-lists board of 'X' / 'O' / ' ' strings from scratch"""
+        h = 0
+        for row, cells in enumerate(board):
+            for col, cell in enumerate(cells):
+                if cell in PLAYER_INDEX:
+                    h ^= self.key(row, col, cell)
+        return h
+
+    def hash_moves(self, moves):
+        """Hash the position reached by a list of (row, col, player) moves"""
+        h = 0
+        for row, col, player in moves:
+            h ^= self.key(row, col, player)
+        return h
+
+
+_hashers = {}
+
+
+def get_hasher(board_size=15, seed=DEFAULT_SEED):
+    """Shared ZobristHasher for a board size (tables are built once)"""
+    if (board_size, seed) not in _hashers:
+        _hashers[(board_size, seed)] = ZobristHasher(board_size, seed)
+    return _hashers[(board_size, seed)]